@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Measure the overhead of running subprocesses with CliProcess. Many short commands show
+the latency that is added to every command, and a single command with a large amount
+of output shows the throughput and memory usage of capturing the output streams.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from typing import Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from client_load import get_peak_rss  # noqa: E402
+from codemagic.cli import CliProcess  # noqa: E402
+from codemagic.utilities import log  # noqa: E402
+
+# Resembles build log lines that are printed by xcodebuild
+OUTPUT_LINE = 'CompileSwift normal arm64 /Users/builder/clone/Sources/App/ViewController.swift (in target App)'
+
+
+def run_short_commands(count: int) -> float:
+    started_at = time.perf_counter()
+    for _ in range(count):
+        CliProcess(['true'], print_streams=False).execute().raise_for_returncode()
+    return time.perf_counter() - started_at
+
+
+def run_large_output_command(output_size: int, max_output_size: Optional[int]) -> float:
+    command = ['sh', '-c', f"yes '{OUTPUT_LINE}' | head -c {output_size}"]
+    started_at = time.perf_counter()
+    process = CliProcess(command, print_streams=False, max_output_size=max_output_size).execute()
+    duration = time.perf_counter() - started_at
+    process.raise_for_returncode()
+    assert process.stdout_output.size == output_size
+    return duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--commands', type=int, default=200, help='Number of short commands to run')
+    parser.add_argument('--output-size', type=int, default=500, help='Output size of the large command in MiB')
+    parser.add_argument(
+        '--max-output-size', type=int, default=None,
+        help='Number of output characters kept in memory, the rest is spilled to disk. Unlimited by default')
+    args = parser.parse_args()
+    log.initialize_logging(stream=open(os.devnull, 'w'), enable_logging=False)
+
+    duration = run_short_commands(args.commands)
+    print(f'{args.commands} short commands: {duration:.3f}s total, {duration / args.commands * 1000:.1f}ms per command')
+
+    output_size = args.output_size * 2 ** 20
+    duration = run_large_output_command(output_size, args.max_output_size)
+    print(
+        f'{args.output_size} MiB of output: {duration:.3f}s, '
+        f'{args.output_size / duration:.1f} MiB/s, peak RSS {get_peak_rss() / 2 ** 20:.1f} MiB'
+    )
+
+
+if __name__ == '__main__':
+    main()
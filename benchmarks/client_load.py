@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Measure how AppStoreConnectApiClient scales with the size of the developer account.
+List, relationship lookup and create flows are run against a local mock API server
+that holds the given number of devices and profiles, and throttles some of the requests.
+Every flow runs in a separate process so that peak memory usage is measured per flow.
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import time
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from codemagic.apple.app_store_connect import AppStoreConnectApiClient  # noqa: E402
+from codemagic.apple.app_store_connect import IssuerId  # noqa: E402
+from codemagic.apple.app_store_connect import KeyIdentifier  # noqa: E402
+from codemagic.apple.resources import BundleIdPlatform  # noqa: E402
+from codemagic.apple.resources import ResourceId  # noqa: E402
+from codemagic.utilities import log  # noqa: E402
+from mock_api_server import MockApiServer  # noqa: E402
+from mock_api_server import mock_bundle_id  # noqa: E402
+from mock_api_server import mock_device  # noqa: E402
+from mock_api_server import mock_linkage  # noqa: E402
+from mock_api_server import mock_profile  # noqa: E402
+from paginate import generate_private_key  # noqa: E402
+
+# Number of Bundle IDs whose profiles are looked up and devices that are created in the flows
+LOOKUP_COUNT = 20
+CREATE_COUNT = 20
+
+
+def populate(server: MockApiServer, account_size: int) -> List[str]:
+    bundle_id_count = max(1, account_size // 10)
+    bundle_ids = [mock_bundle_id(i, server.url) for i in range(bundle_id_count)]
+    profiles = [mock_profile(i, server.url) for i in range(account_size)]
+    server.collections['devices'] = [mock_device(i) for i in range(account_size)]
+    server.collections['bundleIds'] = bundle_ids
+    server.collections['profiles'] = profiles
+    for i, bundle_id in enumerate(bundle_ids):
+        bundle_id_profiles = profiles[i::bundle_id_count]
+        server.collections[f'bundleIds/{bundle_id["id"]}/profiles'] = bundle_id_profiles
+        server.collections[f'bundleIds/{bundle_id["id"]}/relationships/profiles'] = [
+            mock_linkage('profiles', profile['id']) for profile in bundle_id_profiles]
+    return [bundle_id['id'] for bundle_id in bundle_ids[:LOOKUP_COUNT]]
+
+
+def list_flow(client: AppStoreConnectApiClient, _bundle_ids: List[str]):
+    client.devices.list()
+    client.profiles.list(fields=client.profiles.FIELDS_WITHOUT_CONTENT)
+
+
+def relationships_flow(client: AppStoreConnectApiClient, bundle_ids: List[str]):
+    for bundle_id in bundle_ids:
+        client.bundle_ids.list_profile_ids(ResourceId(bundle_id))
+        client.bundle_ids.list_profiles(ResourceId(bundle_id))
+
+
+def create_flow(client: AppStoreConnectApiClient, _bundle_ids: List[str]):
+    for i in range(CREATE_COUNT):
+        client.devices.create(f'Benchmark device {i}', BundleIdPlatform.IOS, f'{i:040x}')
+
+
+FLOWS: Dict[str, Callable[[AppStoreConnectApiClient, List[str]], None]] = {
+    'list': list_flow,
+    'relationships': relationships_flow,
+    'create': create_flow,
+}
+
+
+def get_peak_rss() -> int:
+    try:
+        # Unlike maximum RSS from resource usage, high water mark is not inherited from the parent process
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Peak resident set size is reported in kilobytes on Linux and in bytes on macOS
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def run_flow(flow_name: str, api_url: str, bundle_ids: List[str], workers: int) -> Tuple[float, int]:
+    log.initialize_logging(stream=open(os.devnull, 'w'), enable_logging=False)
+    private_key = generate_private_key()
+    client = AppStoreConnectApiClient(
+        KeyIdentifier('BENCHMARK'),
+        IssuerId('benchmark-issuer'),
+        private_key,
+        max_concurrent_requests=workers)
+    client.API_URL = api_url
+    started_at = time.perf_counter()
+    FLOWS[flow_name](client, bundle_ids)
+    return time.perf_counter() - started_at, get_peak_rss()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1_000, 10_000])
+    parser.add_argument('--flows', nargs='+', choices=list(FLOWS.keys()), default=list(FLOWS.keys()))
+    parser.add_argument('--latency', type=float, default=0.01, help='Simulated round-trip latency in seconds')
+    parser.add_argument('--throttle-every', type=int, default=50, help='Respond with 429 to every n-th request')
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    # Fresh interpreter for every flow keeps peak memory usage of the flows separate
+    context = multiprocessing.get_context('spawn')
+    print(
+        f'{"resources":>9} {"flow":>13} {"requests":>9} {"throttled":>9} '
+        f'{"sent KiB":>9} {"recv KiB":>9} {"seconds":>8} {"peak RSS MiB":>12}'
+    )
+    for account_size in args.sizes:
+        with MockApiServer({}, latency=args.latency, throttle_every=args.throttle_every) as server:
+            bundle_ids = populate(server, account_size)
+            for flow_name in args.flows:
+                server.reset_statistics()
+                with context.Pool(1) as pool:
+                    duration, peak_rss = pool.apply(run_flow, (flow_name, server.url, bundle_ids, args.workers))
+                print(
+                    f'{account_size:>9} {flow_name:>13} {server.request_count:>9} {server.throttled_count:>9} '
+                    f'{server.bytes_received / 1024:>9.1f} {server.bytes_sent / 1024:>9.1f} '
+                    f'{duration:>8.3f} {peak_rss / 2 ** 20:>12.1f}'
+                )
+
+
+if __name__ == '__main__':
+    main()
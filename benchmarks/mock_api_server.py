@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import base64
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from urllib import parse
+
+
+def encode_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(offset.to_bytes(2, 'big')).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> int:
+    return int.from_bytes(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)), 'big')
+
+
+def mock_device(index: int) -> Dict:
+    resource_id = f'DEVICE{index:06d}'
+    return {
+        'type': 'devices',
+        'id': resource_id,
+        'attributes': {
+            'addedDate': '2020-01-01T00:00:00.000+0000',
+            'name': f'Device {index}',
+            'deviceClass': 'IPHONE',
+            'model': 'iPhone X',
+            'udid': f'{index:040x}',
+            'platform': 'IOS',
+            'status': 'ENABLED',
+        },
+        'links': {'self': f'https://api.appstoreconnect.apple.com/v1/devices/{resource_id}'},
+    }
+
+
+def mock_bundle_id(index: int, base_url: str) -> Dict:
+    resource_id = f'BUNDLEID{index:06d}'
+    relationship_url = f'{base_url}/bundleIds/{resource_id}'
+    return {
+        'type': 'bundleIds',
+        'id': resource_id,
+        'attributes': {
+            'identifier': f'io.codemagic.benchmark{index}',
+            'name': f'Benchmark {index}',
+            'platform': 'IOS',
+            'seedId': 'X8NNQ9CYL2',
+        },
+        'relationships': {
+            name: {'links': {'self': f'{relationship_url}/relationships/{name}',
+                             'related': f'{relationship_url}/{name}'}}
+            for name in ('bundleIdCapabilities', 'profiles')
+        },
+        'links': {'self': relationship_url},
+    }
+
+
+def mock_profile(index: int, base_url: str) -> Dict:
+    resource_id = f'PROFILE{index:06d}'
+    relationship_url = f'{base_url}/profiles/{resource_id}'
+    return {
+        'type': 'profiles',
+        'id': resource_id,
+        'attributes': {
+            'name': f'Benchmark profile {index}',
+            'platform': 'IOS',
+            'uuid': f'00000000-0000-0000-0000-{index:012d}',
+            'createdDate': '2020-01-01T00:00:00.000+0000',
+            'profileState': 'ACTIVE',
+            'profileType': 'IOS_APP_DEVELOPMENT',
+            'expirationDate': '2021-01-01T00:00:00.000+0000',
+            'profileContent': '',
+        },
+        'relationships': {
+            name: {'links': {'self': f'{relationship_url}/relationships/{name}',
+                             'related': f'{relationship_url}/{name}'}}
+            for name in ('bundleId', 'certificates', 'devices')
+        },
+        'links': {'self': relationship_url},
+    }
+
+
+def mock_linkage(resource_type: str, resource_id: str) -> Dict:
+    return {'type': resource_type, 'id': resource_id}
+
+
+def mock_error(status: int, code: str, title: str) -> Dict:
+    return {'errors': [{'status': str(status), 'code': code, 'title': title, 'detail': title}]}
+
+
+class MockApiServer:
+    """
+    Minimal App Store Connect API stand-in that serves paginated resource
+    collections with Apple style cursors and simulated round-trip latency.
+    Collections are keyed by their path relative to the API root,
+    for example `devices` or `bundleIds/<id>/profiles`.
+
+    Top level collections support `filter[...]` and `fields[...]` query parameters,
+    reading single resources by ID, and creating, modifying and deleting resources.
+    Every n-th request can be throttled with 429 responses to exercise retries.
+    """
+
+    def __init__(self,
+                 collections: Dict[str, List[Dict]],
+                 latency: float = 0.05,
+                 throttle_every: int = 0,
+                 retry_after: float = 0.05):
+        """
+        :param collections: Resources of the collections keyed by their paths
+        :param latency: Simulated round-trip time in seconds for every request
+        :param throttle_every: Respond with status 429 to every n-th request, disabled if 0
+        :param retry_after: Value of Retry-After header for throttled requests in seconds
+        """
+        self.collections = collections
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.request_count = 0
+        self.throttled_count = 0
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self._created_count = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._create_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/v1'
+
+    def __enter__(self) -> MockApiServer:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_statistics(self):
+        with self._lock:
+            self.request_count = 0
+            self.throttled_count = 0
+            self.bytes_received = 0
+            self.bytes_sent = 0
+
+    def _record_request(self, bytes_received: int) -> bool:
+        """
+        Update statistics and tell whether the request should be throttled
+        """
+        with self._lock:
+            self.request_count += 1
+            self.bytes_received += bytes_received
+            if self.throttle_every and self.request_count % self.throttle_every == 0:
+                self.throttled_count += 1
+                return True
+            return False
+
+    @classmethod
+    def _matches(cls, resource: Dict, query: Dict[str, List[str]]) -> bool:
+        for name, values in query.items():
+            if not name.startswith('filter['):
+                continue
+            field = name[len('filter['):-1]
+            value = resource['id'] if field == 'id' else resource.get('attributes', {}).get(field)
+            if str(value) not in values[0].split(','):
+                return False
+        return True
+
+    @classmethod
+    def _select_fields(cls, resource: Dict, query: Dict[str, List[str]]) -> Dict:
+        fields = query.get(f'fields[{resource["type"]}]')
+        if not fields:
+            return resource
+        field_names = fields[0].split(',')
+        selected = {k: v for k, v in resource.items() if k not in ('attributes', 'relationships')}
+        for section in ('attributes', 'relationships'):
+            if section in resource:
+                selected[section] = {k: v for k, v in resource[section].items() if k in field_names}
+        return selected
+
+    def _get_page(self, path: str, query: Dict[str, List[str]]) -> Dict:
+        collection_name = path.strip('/').split('/', 1)[-1]
+        if collection_name not in self.collections:
+            return self._get_resource(collection_name, query)
+        items = self.collections[collection_name]
+        if any(name.startswith('filter[') for name in query):
+            items = [item for item in items if self._matches(item, query)]
+        limit = int(query.get('limit', ['100'])[0])
+        offset = decode_cursor(query['cursor'][0]) if 'cursor' in query else 0
+        page = {
+            'data': [self._select_fields(item, query) for item in items[offset:offset + limit]],
+            'links': {'self': f'{self.url}/{collection_name}'},
+            'meta': {'paging': {'total': len(items), 'limit': limit}},
+        }
+        if offset + limit < len(items):
+            next_query = {k: v[0] for k, v in query.items() if k != 'cursor'}
+            next_query.update({'cursor': encode_cursor(offset + limit), 'limit': str(limit)})
+            page['links']['next'] = f'{self.url}/{collection_name}?{parse.urlencode(next_query)}'
+        return page
+
+    def _find_resource(self, resource_path: str) -> Tuple[List[Dict], int]:
+        collection_name, _, resource_id = resource_path.rpartition('/')
+        collection = self.collections[collection_name]
+        for index, resource in enumerate(collection):
+            if resource['id'] == resource_id:
+                return collection, index
+        raise KeyError(resource_path)
+
+    def _get_resource(self, resource_path: str, query: Dict[str, List[str]]) -> Dict:
+        collection, index = self._find_resource(resource_path)
+        return {'data': self._select_fields(collection[index], query), 'links': {'self': resource_path}}
+
+    def _create_resource(self, collection_name: str, payload: Dict) -> Dict:
+        collection = self.collections[collection_name]
+        with self._lock:
+            self._created_count += 1
+            resource_id = f'CREATED{self._created_count:06d}'
+        # Attributes that are not given in the payload are copied from existing resources
+        template = collection[0] if collection else {}
+        resource = {
+            **template,
+            'type': payload['data']['type'],
+            'id': resource_id,
+            'attributes': {**template.get('attributes', {}), **payload['data'].get('attributes', {})},
+            'links': {'self': f'{self.url}/{collection_name}/{resource_id}'},
+        }
+        collection.append(resource)
+        return {'data': resource}
+
+    def _modify_resource(self, resource_path: str, payload: Dict) -> Dict:
+        collection, index = self._find_resource(resource_path)
+        resource = collection[index]
+        resource['attributes'] = {**resource.get('attributes', {}), **payload['data'].get('attributes', {})}
+        return {'data': resource}
+
+    def _delete_resource(self, resource_path: str):
+        collection, index = self._find_resource(resource_path)
+        collection.pop(index)
+
+    def _handle(self, method: str, path: str, query: Dict[str, List[str]], payload: Optional[Dict]):
+        resource_path = path.strip('/').split('/', 1)[-1]
+        if method == 'GET':
+            return 200, self._get_page(path, query)
+        elif method == 'POST':
+            return 201, self._create_resource(resource_path, payload or {})
+        elif method == 'PATCH':
+            return 200, self._modify_resource(resource_path, payload or {})
+        elif method == 'DELETE':
+            self._delete_resource(resource_path)
+            return 204, None
+        return 405, mock_error(405, 'METHOD_NOT_ALLOWED', 'Method not allowed')
+
+    def _create_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _send_json(self, status: int, body: Optional[Dict], headers: Optional[Dict[str, str]] = None):
+                payload = json.dumps(body).encode() if body is not None else b''
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                with server._lock:
+                    server.bytes_sent += len(payload)
+
+            def _serve(self, method: str):
+                content_length = int(self.headers.get('Content-Length') or 0)
+                request_body = self.rfile.read(content_length) if content_length else b''
+                throttle = server._record_request(len(self.requestline) + len(request_body))
+                time.sleep(server.latency)
+                if throttle:
+                    error = mock_error(429, 'RATE_LIMIT_EXCEEDED', 'Rate limit exceeded')
+                    return self._send_json(429, error, {'Retry-After': str(server.retry_after)})
+
+                parsed_url = parse.urlparse(self.path)
+                payload = json.loads(request_body) if request_body else None
+                try:
+                    status, body = server._handle(method, parsed_url.path, parse.parse_qs(parsed_url.query), payload)
+                except KeyError:
+                    status, body = 404, mock_error(404, 'NOT_FOUND', 'Not found')
+                self._send_json(status, body)
+
+            def do_GET(self):
+                self._serve('GET')
+
+            def do_POST(self):
+                self._serve('POST')
+
+            def do_PATCH(self):
+                self._serve('PATCH')
+
+            def do_DELETE(self):
+                self._serve('DELETE')
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
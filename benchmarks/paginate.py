@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Measure wall-clock time of listing paginated resources with
+AppStoreConnectApiClient against a local mock API server.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from codemagic.apple.app_store_connect import AppStoreConnectApiClient  # noqa: E402
+from codemagic.apple.app_store_connect import IssuerId  # noqa: E402
+from codemagic.apple.app_store_connect import KeyIdentifier  # noqa: E402
+from codemagic.utilities import log  # noqa: E402
+from mock_api_server import MockApiServer  # noqa: E402
+from mock_api_server import mock_device  # noqa: E402
+
+
+def generate_private_key() -> str:
+    key = ec.generate_private_key(ec.SECP256R1(), default_backend())
+    pem = key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+    return pem.decode()
+
+
+def run(page_count: int, page_size: int, latency: float, workers: int, private_key: str):
+    devices = [mock_device(i) for i in range(page_count * page_size)]
+    with MockApiServer({'devices': devices}, latency=latency) as server:
+        client = AppStoreConnectApiClient(
+            KeyIdentifier('BENCHMARK'),
+            IssuerId('benchmark-issuer'),
+            private_key,
+            max_concurrent_requests=workers)
+        started_at = time.perf_counter()
+        results = client.paginate(f'{server.url}/devices', page_size=page_size)
+        duration = time.perf_counter() - started_at
+    assert len(results) == len(devices)
+    return duration, server.request_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 10, 50])
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0.05, help='Simulated round-trip latency in seconds')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 8])
+    args = parser.parse_args()
+
+    log.initialize_logging(stream=open(os.devnull, 'w'), enable_logging=False)
+    private_key = generate_private_key()
+    print(f'{"pages":>6} {"workers":>8} {"requests":>9} {"seconds":>9}')
+    for page_count in args.pages:
+        for workers in args.workers:
+            duration, request_count = run(page_count, args.page_size, args.latency, workers, private_key)
+            print(f'{page_count:>6} {workers:>8} {request_count:>9} {duration:>9.3f}')
+
+
+if __name__ == '__main__':
+    main()
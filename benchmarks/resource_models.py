@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Measure time and memory that is spent on creating App Store Connect resource models
+from API payloads. Eager decoding of all the attributes and relationships corresponds
+to the work done for every resource before attributes were decoded on demand.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Type
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from codemagic.apple.resources import Device  # noqa: E402
+from codemagic.apple.resources import Profile  # noqa: E402
+from codemagic.apple.resources import Resource  # noqa: E402
+from mock_api_server import mock_device  # noqa: E402
+from mock_api_server import mock_profile  # noqa: E402
+
+
+def access_id(resource: Resource):
+    return resource.id
+
+
+def access_one_attribute(resource: Resource):
+    return resource.attributes.name
+
+
+def access_all_fields(resource: Resource):
+    return resource.attributes, getattr(resource, 'relationships', None), resource.links
+
+
+ACCESS_PATTERNS: Dict[str, Callable[[Resource], object]] = {
+    'id only': access_id,
+    'one attribute': access_one_attribute,
+    'eager (all fields)': access_all_fields,
+}
+
+
+def create_resources(resource_type: Type[Resource], payloads: List[Dict], access: Callable[[Resource], object]):
+    resources = [resource_type(payload) for payload in payloads]
+    for resource in resources:
+        access(resource)
+    return resources
+
+
+def measure(resource_type: Type[Resource], payloads: List[Dict], access: Callable[[Resource], object]):
+    gc.collect()
+    started_at = time.perf_counter()
+    create_resources(resource_type, payloads, access)
+    duration = time.perf_counter() - started_at
+
+    # Memory is measured separately as tracing allocations slows down the execution considerably
+    gc.collect()
+    tracemalloc.start()
+    resources = create_resources(resource_type, payloads, access)
+    retained, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del resources
+    return duration, retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=10_000)
+    args = parser.parse_args()
+
+    payloads = {
+        Device: [mock_device(i) for i in range(args.count)],
+        Profile: [mock_profile(i, 'https://api.appstoreconnect.apple.com/v1') for i in range(args.count)],
+    }
+    print(f'{"model":>8} {"access":>20} {"count":>7} {"seconds":>8} {"memory MiB":>11}')
+    for resource_type, resource_payloads in payloads.items():
+        for access_name, access in ACCESS_PATTERNS.items():
+            duration, retained = measure(resource_type, resource_payloads, access)
+            print(
+                f'{resource_type.__name__:>8} {access_name:>20} {args.count:>7} '
+                f'{duration:>8.3f} {retained / 2 ** 20:>11.1f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Measure number of requests and wall-clock time that App Store Connect tool
+spends on resolving provisioning profiles for Bundle IDs against a local mock API server.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from codemagic.apple.app_store_connect import IssuerId  # noqa: E402
+from codemagic.apple.app_store_connect import KeyIdentifier  # noqa: E402
+from codemagic.apple.resources import BundleId  # noqa: E402
+from codemagic.apple.resources import ProfileType  # noqa: E402
+from codemagic.apple.resources import SigningCertificate  # noqa: E402
+from codemagic.tools import AppStoreConnect  # noqa: E402
+from codemagic.utilities import log  # noqa: E402
+from mock_api_server import MockApiServer  # noqa: E402
+from mock_api_server import mock_bundle_id  # noqa: E402
+from mock_api_server import mock_linkage  # noqa: E402
+from mock_api_server import mock_profile  # noqa: E402
+from paginate import generate_private_key  # noqa: E402
+
+CERTIFICATE_ID = 'CERTIFICATE1'
+
+
+def mock_certificate() -> SigningCertificate:
+    return SigningCertificate({
+        'type': 'certificates',
+        'id': CERTIFICATE_ID,
+        'attributes': {
+            'serialNumber': '1234567890ABCDEF',
+            'certificateContent': '',
+            'displayName': 'Benchmark',
+            'name': 'iOS Development: Benchmark',
+            'csrContent': None,
+            'platform': 'IOS',
+            'expirationDate': '2021-01-01T00:00:00.000+0000',
+            'certificateType': 'IOS_DEVELOPMENT',
+        },
+        'links': {'self': f'https://api.appstoreconnect.apple.com/v1/certificates/{CERTIFICATE_ID}'},
+    })
+
+
+def run(bundle_id_count: int, profile_count: int, latency: float, workers: int, private_key: str):
+    with MockApiServer({}, latency=latency) as server:
+        bundle_ids = [mock_bundle_id(i, server.url) for i in range(bundle_id_count)]
+        profiles = [mock_profile(i, server.url) for i in range(profile_count)]
+        server.collections['profiles'] = profiles
+        for i, bundle_id in enumerate(bundle_ids):
+            bundle_id_profiles = profiles[i::bundle_id_count]
+            server.collections[f'bundleIds/{bundle_id["id"]}/profiles'] = bundle_id_profiles
+            server.collections[f'bundleIds/{bundle_id["id"]}/relationships/profiles'] = [
+                mock_linkage('profiles', profile['id']) for profile in bundle_id_profiles]
+        for profile in profiles:
+            server.collections[f'profiles/{profile["id"]}/relationships/certificates'] = [
+                mock_linkage('certificates', CERTIFICATE_ID)]
+
+        tool = AppStoreConnect(KeyIdentifier('BENCHMARK'), IssuerId('benchmark-issuer'), private_key)
+        tool.api_client.API_URL = server.url
+        tool.api_client.max_concurrent_requests = workers
+        started_at = time.perf_counter()
+        result = tool._get_or_create_profiles(
+            [BundleId(bundle_id) for bundle_id in bundle_ids],
+            [mock_certificate()],
+            ProfileType.IOS_APP_DEVELOPMENT,
+            create_resource=False)
+        duration = time.perf_counter() - started_at
+    assert len(result) == profile_count
+    return duration, server.request_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--bundle-ids', type=int, default=50)
+    parser.add_argument('--profiles', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.05, help='Simulated round-trip latency in seconds')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 8])
+    args = parser.parse_args()
+
+    log.initialize_logging(stream=open(os.devnull, 'w'), enable_logging=False)
+    private_key = generate_private_key()
+    print(f'{"bundle ids":>10} {"profiles":>9} {"workers":>8} {"requests":>9} {"seconds":>9}')
+    for workers in args.workers:
+        duration, request_count = run(args.bundle_ids, args.profiles, args.latency, workers, private_key)
+        print(f'{args.bundle_ids:>10} {args.profiles:>9} {workers:>8} {request_count:>9} {duration:>9.3f}')
+
+
+if __name__ == '__main__':
+    main()
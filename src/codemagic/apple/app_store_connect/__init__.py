@@ -1,5 +1,26 @@
+from .api_cassette import ApiCassette
+from .api_cassette import ApiCassetteError
+from .api_cassette import CassetteMode
 from .api_client import AppStoreConnectApiClient
 from .api_client import IssuerId
 from .api_client import KeyIdentifier
+from .api_client_pool import ApiKey
+from .api_client_pool import AppStoreConnectApiClientPool
+from .api_client_pool import TeamResult
 from .api_error import AppStoreConnectApiError
+from .api_jwt_cache import JwtCache
+from .api_rate_limiter import RateLimit
+from .api_rate_limiter import SharedTokenBucket
+from .api_rate_limiter import TokenBucket
+from .api_request_logger import ApiRequestLogger
+from .api_request_profiler import ProfilingHTTPAdapter
+from .api_request_profiler import RequestProfiler
+from .api_request_profiler import RequestTiming
+from .api_response_cache import ApiResponseCache
+from .api_retry_policy import RetryPolicy
+from .api_retry_policy import RetryStatistics
 from .api_session import AppStoreConnectApiSession
+from .async_api_client import AsyncAppStoreConnectApiClient
+from .async_api_client import AsyncResourceManager
+from .resource_mirror import ResourceMirror
+from .resource_mirror import SyncResult
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import enum
+import json
+import os
+import pathlib
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .api_rate_limiter import RateLimit
+from .api_response_cache import ApiResponseCache
+
+
+class CassetteMode(enum.Enum):
+    RECORD = 'record'
+    REPLAY = 'replay'
+
+
+class ApiCassetteError(Exception):
+    pass
+
+
+class ApiCassette:
+    """
+    Cassette file of App Store Connect API interactions. In record mode all the requests
+    and responses are appended to the file with secrets redacted. In replay mode responses
+    are served from the file without network access, optionally with the recorded latency.
+    Recorded interactions are matched by HTTP method, URL and query parameters, and
+    repeated requests are answered in the order they were recorded.
+    """
+
+    REDACTED = '<redacted>'
+    # Values of the keys that contain any of these words are not written to the cassette
+    SENSITIVE_KEYS = ('authorization', 'password', 'privatekey', 'secret', 'token')
+    RECORDED_HEADERS = ('Content-Type', 'Retry-After', RateLimit.HEADER)
+
+    def __init__(self, path: pathlib.Path, mode: CassetteMode, latency_factor: float = 0.0):
+        """
+        :param path: Cassette file where the interactions are recorded to or replayed from
+        :param mode: Whether to record new interactions or to replay recorded ones
+        :param latency_factor: Multiplier for recorded response times that are waited before
+                               responses are replayed. By default responses are replayed immediately.
+        """
+        self.path = path.expanduser()
+        self.mode = mode
+        self.latency_factor = latency_factor
+        self._lock = threading.Lock()
+        self._interactions: Dict[str, List[Dict]] = defaultdict(list)
+        if mode is CassetteMode.REPLAY:
+            self._load()
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Start a new recording, cassettes can contain details about the team that should stay private
+            os.close(os.open(str(self.path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600))
+
+    @property
+    def is_replaying(self) -> bool:
+        return self.mode is CassetteMode.REPLAY
+
+    @classmethod
+    def _get_key(cls, method: str, url: str, params: Optional[Dict]) -> str:
+        return f'{method} {ApiResponseCache._get_key(url, params)}'
+
+    @classmethod
+    def _is_sensitive(cls, key: str) -> bool:
+        normalized_key = key.lower().replace('_', '').replace('-', '')
+        return any(word in normalized_key for word in cls.SENSITIVE_KEYS)
+
+    @classmethod
+    def redact(cls, value: Any) -> Any:
+        if isinstance(value, dict):
+            return {
+                k: (cls.REDACTED if cls._is_sensitive(str(k)) else cls.redact(v))
+                for k, v in value.items()
+            }
+        elif isinstance(value, list):
+            return [cls.redact(v) for v in value]
+        return value
+
+    @classmethod
+    def _redact_content(cls, content: bytes) -> str:
+        try:
+            return json.dumps(cls.redact(json.loads(content)))
+        except ValueError:
+            return content.decode(errors='replace')
+
+    def _load(self):
+        try:
+            lines = self.path.read_text().splitlines()
+        except OSError as error:
+            raise ApiCassetteError(f'Cannot read App Store Connect API cassette {self.path}: {error}') from error
+        for line_number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                interaction = json.loads(line)
+                key = self._get_key(interaction['method'], interaction['url'], interaction['params'])
+            except (ValueError, KeyError) as error:
+                raise ApiCassetteError(f'Invalid interaction on line {line_number} of {self.path}') from error
+            self._interactions[key].append(interaction)
+
+    def record(self, method: str, url: str, params: Optional[Dict], body: Any, response: requests.Response):
+        interaction = {
+            'method': method,
+            'url': url,
+            'params': self.redact(params),
+            'body': self.redact(body),
+            'status_code': response.status_code,
+            'headers': {h: response.headers[h] for h in self.RECORDED_HEADERS if h in response.headers},
+            'content': self._redact_content(response.content),
+            'elapsed': response.elapsed.total_seconds(),
+        }
+        line = json.dumps(interaction)
+        with self._lock, self.path.open('a') as fd:
+            fd.write(f'{line}\n')
+
+    def replay(self, method: str, url: str, params: Optional[Dict]) -> requests.Response:
+        key = self._get_key(method, url, self.redact(params))
+        with self._lock:
+            recorded = self._interactions.get(key)
+            if not recorded:
+                raise ApiCassetteError(f'No recorded response for {method} {url} in {self.path}')
+            # The last response is reused once the recorded responses for the request run out
+            interaction = recorded.pop(0) if len(recorded) > 1 else recorded[0]
+
+        if self.latency_factor > 0:
+            time.sleep(interaction['elapsed'] * self.latency_factor)
+        response = requests.Response()
+        response.status_code = interaction['status_code']
+        response.headers = CaseInsensitiveDict(interaction['headers'])
+        response.url = interaction['url']
+        response.encoding = 'utf-8'
+        response.elapsed = timedelta(seconds=interaction['elapsed'])
+        response._content = interaction['content'].encode()
+        response.request = requests.Request(method, url, params=params).prepare()
+        return response
@@ -1,15 +1,34 @@
 from __future__ import annotations
 
+import base64
+import binascii
+import pathlib
+import threading
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from datetime import timedelta
+from itertools import islice
+from typing import Deque
 from typing import Dict
+from typing import Generator
+from typing import Iterator
 from typing import List
 from typing import Optional
 from urllib import parse
 
 import jwt
+from requests.adapters import DEFAULT_POOLSIZE
 
 from codemagic.utilities import log
+from .api_cassette import ApiCassette
+from .api_jwt_cache import JwtCache
+from .api_rate_limiter import SharedTokenBucket
+from .api_rate_limiter import TokenBucket
+from .api_request_logger import ApiRequestLogger
+from .api_request_profiler import RequestProfiler
+from .api_response_cache import ApiResponseCache
 from .api_session import AppStoreConnectApiSession
 from .provisioning import BundleIdCapabilities
 from .provisioning import BundleIds
@@ -33,33 +52,108 @@ class AppStoreConnectApiClient:
     API_KEYS_DOCS_URL = \
         'https://developer.apple.com/documentation/appstoreconnectapi/creating_api_keys_for_app_store_connect_api'
 
-    def __init__(self, key_identifier: KeyIdentifier, issuer_id: IssuerId, private_key: str, log_requests=False):
+    def __init__(self,
+                 key_identifier: KeyIdentifier,
+                 issuer_id: IssuerId,
+                 private_key: str,
+                 log_requests=False,
+                 max_concurrent_requests: int = 8,
+                 response_cache_directory: Optional[pathlib.Path] = None,
+                 response_cache_ttl: float = ApiResponseCache.DEFAULT_TTL,
+                 request_profiler: Optional[RequestProfiler] = None,
+                 jwt_cache: Optional[JwtCache] = None,
+                 cassette: Optional[ApiCassette] = None,
+                 shared_rate_limit_directory: Optional[pathlib.Path] = None,
+                 log_body_limit: int = ApiRequestLogger.DEFAULT_BODY_LIMIT,
+                 log_sample_rate: float = 1.0,
+                 connection_pool_size: Optional[int] = None,
+                 keep_alive_idle: Optional[int] = None):
         """
         :param key_identifier: Your private key ID from App Store Connect (Ex: 2X9R4HXF34)
         :param issuer_id: Your issuer ID from the API Keys page in
                           App Store Connect (Ex: 57246542-96fe-1a63-e053-0824d011072a)
         :param private_key: Private key associated with the key_identifier you specified.
+        :param max_concurrent_requests: Upper bound for simultaneous requests when pages are prefetched.
+        :param response_cache_directory: If given, responses to GET requests are cached in this directory.
+        :param response_cache_ttl: Number of seconds for which the cached responses are reused.
+        :param request_profiler: If given, timings of all HTTP requests are recorded to it.
+        :param jwt_cache: If given, signed tokens are shared with other processes using this cache.
+        :param cassette: If given, API interactions are either recorded to or replayed from it.
+        :param shared_rate_limit_directory: If given, request budget of the API key is shared with
+                                            other processes on the host using state files in this directory.
+        :param log_body_limit: Number of bytes after which logged request and response bodies are truncated.
+        :param log_sample_rate: Fraction of successful requests that are logged, from 0 to 1.
+        :param connection_pool_size: Number of connections that are kept alive for reuse. By default
+                                     there is one for every request that can be in flight at the same time.
+        :param keep_alive_idle: If given, enable TCP keep-alive probes on connections that
+                                have been idle for this many seconds.
         """
         self._key_identifier = key_identifier
         self._issuer_id = issuer_id
         self._private_key = private_key
+        self.max_concurrent_requests = max(1, max_concurrent_requests)
         self._jwt: Optional[str] = None
         self._jwt_expires: datetime = datetime.now()
-        self.session = AppStoreConnectApiSession(self.generate_auth_headers, log_requests=log_requests)
+        self._jwt_lock = threading.Lock()
+        self._jwt_cache = jwt_cache
+        response_cache = None
+        if response_cache_directory is not None:
+            response_cache = ApiResponseCache(
+                response_cache_directory, ttl=response_cache_ttl, namespace=f'{issuer_id}/{key_identifier}')
+        self.session = AppStoreConnectApiSession(
+            self.generate_auth_headers,
+            log_requests=log_requests,
+            response_cache=response_cache,
+            token_bucket=self._get_token_bucket(key_identifier, shared_rate_limit_directory),
+            pool_maxsize=connection_pool_size or max(DEFAULT_POOLSIZE, self.max_concurrent_requests),
+            keep_alive_idle=keep_alive_idle,
+            request_profiler=request_profiler,
+            cassette=cassette,
+            log_body_limit=log_body_limit,
+            log_sample_rate=log_sample_rate,
+        )
         self._logger = log.get_logger(self.__class__)
 
+    @classmethod
+    def _get_token_bucket(cls,
+                          key_identifier: KeyIdentifier,
+                          shared_rate_limit_directory: Optional[pathlib.Path]) -> TokenBucket:
+        if shared_rate_limit_directory is None:
+            return TokenBucket.for_key(key_identifier)
+        return SharedTokenBucket.for_host(key_identifier, shared_rate_limit_directory)
+
     @property
     def jwt(self) -> str:
-        if self._jwt and not self._is_token_expired():
-            return self._jwt
-        self._logger.debug('Generate new JWT for App Store Connect')
-        token = jwt.encode(
-            self._get_jwt_payload(),
-            self._private_key,
-            algorithm=AppStoreConnectApiClient.JWT_ALGORITHM,
-            headers={'kid': self._key_identifier})
-        self._jwt = token.decode()
-        return self._jwt
+        # Token is shared between threads that send requests concurrently
+        with self._jwt_lock:
+            if self._jwt and not self._is_token_expired():
+                return self._jwt
+            cached_token = self._load_cached_jwt()
+            if cached_token:
+                return cached_token
+            self._logger.debug('Generate new JWT for App Store Connect')
+            token = jwt.encode(
+                self._get_jwt_payload(),
+                self._private_key,
+                algorithm=AppStoreConnectApiClient.JWT_ALGORITHM,
+                headers={'kid': self._key_identifier})
+            self._jwt = signed_token = token.decode()
+            if self._jwt_cache is not None:
+                self._jwt_cache.store(
+                    self._key_identifier, self._issuer_id, signed_token, self._jwt_expires.timestamp())
+            return signed_token
+
+    def _load_cached_jwt(self) -> Optional[str]:
+        if self._jwt_cache is None:
+            return None
+        cached_jwt = self._jwt_cache.get(self._key_identifier, self._issuer_id)
+        if cached_jwt is None:
+            return None
+        self._logger.debug('Use cached JWT for App Store Connect')
+        token, expires_at = cached_jwt
+        self._jwt = token
+        self._jwt_expires = datetime.fromtimestamp(expires_at)
+        return token
 
     def _is_token_expired(self) -> bool:
         delta = timedelta(seconds=30)
@@ -82,25 +176,131 @@ class AppStoreConnectApiClient:
     def generate_auth_headers(self) -> Dict[str, str]:
         return {'Authorization': f'Bearer {self.jwt}'}
 
-    def paginate(self, url, params=None, page_size: Optional[int] = 100) -> List[Dict]:
-        params = {k: v for k, v in (params or {}).items() if v is not None}
+    @classmethod
+    def _get_step_params(cls, next_url: str, params: Dict) -> Dict:
+        # Query params from previous pagination call can be included in the next URL
+        # and duplicate parameters are not allowed, so we need to filter those out.
+        parsed_url = parse.urlparse(next_url)
+        included_params = parse.parse_qs(parsed_url.query)
+        return {k: v for k, v in params.items() if k not in included_params}
+
+    @classmethod
+    def _decode_cursor(cls, cursor: str) -> Optional[bytes]:
+        try:
+            return base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        except (binascii.Error, ValueError):
+            return None
+
+    @classmethod
+    def _encode_cursor(cls, offset: int, width: int, padded: bool) -> str:
+        width = max(width, (offset.bit_length() + 7) // 8)
+        cursor = base64.urlsafe_b64encode(offset.to_bytes(width, 'big')).decode()
+        return cursor if padded else cursor.rstrip('=')
+
+    @classmethod
+    def _get_page_urls(cls, first_page: Dict) -> Optional[List[str]]:
+        """
+        App Store Connect API pagination cursors are base64 encoded item offsets.
+        If the cursor of the next page link follows this format and points right
+        after the first page, then compose URLs for all the remaining pages so that
+        they could be fetched concurrently. Otherwise return None and let the caller
+        follow the next page links one by one.
+        """
+        try:
+            next_url = first_page['links']['next']
+            paging = first_page['meta']['paging']
+            total, limit = int(paging['total']), int(paging['limit'])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+        parsed_url = parse.urlparse(next_url)
+        query = parse.parse_qsl(parsed_url.query)
+        cursors = [value for key, value in query if key == 'cursor']
+        if len(cursors) != 1 or limit < 1:
+            return None
+        cursor = cursors[0]
+        decoded = cls._decode_cursor(cursor)
+        if not decoded:
+            return None
+        offset = int.from_bytes(decoded, 'big')
+        padded = cursor.endswith('=')
+        if offset != len(first_page['data']) or cls._encode_cursor(offset, len(decoded), padded) != cursor:
+            return None
+
+        def page_url(page_offset: int) -> str:
+            page_cursor = cls._encode_cursor(page_offset, len(decoded), padded)
+            page_query = [(k, page_cursor if k == 'cursor' else v) for k, v in query]
+            return parse.urlunparse(parsed_url._replace(query=parse.urlencode(page_query)))
+
+        return [page_url(page_offset) for page_offset in range(offset, total, limit)]
+
+    def _get_first_page(self, url, params: Dict, page_size: Optional[int]) -> Dict:
         if page_size is None:
-            response = self.session.get(url, params=params).json()
-        else:
-            response = self.session.get(url, params={'limit': page_size, **params}).json()
+            return self.session.get(url, params=params).json()
+        return self.session.get(url, params={'limit': page_size, **params}).json()
+
+    def _get_page(self, url: str, params: Dict) -> Dict:
+        return self.session.get(url, params=self._get_step_params(url, params)).json()
+
+    def _iter_prefetched_pages(self,
+                               first_page: Dict,
+                               page_urls: List[str],
+                               params: Dict) -> Generator[Dict, None, None]:
+        workers = min(self.max_concurrent_requests, len(page_urls))
+        executor = ThreadPoolExecutor(max_workers=workers)
+        pending: Deque[Future] = deque()
+        urls = iter(page_urls)
         try:
-            results = response['data']
-        except KeyError:
-            results = []
+            for page_url in islice(urls, 2 * workers):
+                pending.append(executor.submit(self._get_page, page_url, params))
+            yield first_page
+            while pending:
+                page = pending.popleft().result()
+                next_url = next(urls, None)
+                if next_url is not None:
+                    pending.append(executor.submit(self._get_page, next_url, params))
+                yield page
+        finally:
+            # Do not wait for the pages that are not needed in case iteration was stopped early
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def iter_paginate(self, url, params=None, page_size: Optional[int] = 100) -> Iterator[Dict]:
+        """
+        Yield resources from all the pages of the given URL. In case the total
+        count of resources is known from the first response, then remaining
+        pages are fetched concurrently in the background using at most
+        `max_concurrent_requests` simultaneous requests. Next page links
+        of the last page are followed in case resources were added meanwhile.
+        """
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        response = self._get_first_page(url, params, page_size)
+
+        page_urls = self._get_page_urls(response)
+        if not page_urls:
+            yield from response.get('data', [])
+        else:
+            total = int(response['meta']['paging']['total'])
+            received = 0
+            pages = self._iter_prefetched_pages(response, page_urls, params)
+            try:
+                for response in pages:
+                    received += len(response['data'])
+                    yield from response['data']
+            finally:
+                pages.close()
+            if received < total:
+                # Offset based cursors skip resources in case some were removed while listing
+                self._logger.warning(f'Received {received} out of {total} resources from {url}, list can be incomplete')
+
         while 'next' in response['links']:
-            # Query params from previous pagination call can be included in the next URL
-            # and duplicate parameters are not allowed, so we need to filter those out.
-            parsed_url = parse.urlparse(response['links']['next'])
-            included_params = parse.parse_qs(parsed_url.query)
-            step_params = {k: v for k, v in params.items() if k not in included_params}
-            response = self.session.get(response['links']['next'], params=step_params).json()
-            results.extend(response['data'])
-        return results
+            next_url = response['links']['next']
+            response = self._get_page(next_url, params)
+            yield from response['data']
+
+    def paginate(self, url, params=None, page_size: Optional[int] = 100) -> List[Dict]:
+        return list(self.iter_paginate(url, params=params, page_size=page_size))
 
     @property
     def bundle_ids(self) -> BundleIds:
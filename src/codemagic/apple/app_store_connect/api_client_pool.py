@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable
+from typing import Dict
+from typing import Generic
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import TypeVar
+
+from codemagic.utilities import log
+from .api_client import AppStoreConnectApiClient
+from .api_client import IssuerId
+from .api_client import KeyIdentifier
+
+T = TypeVar('T')
+
+
+@dataclass(frozen=True)
+class ApiKey:
+    key_identifier: KeyIdentifier
+    issuer_id: IssuerId
+    private_key: str
+
+
+@dataclass
+class TeamResult(Generic[T]):
+    team: str
+    duration: float
+    result: Optional[T] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class AppStoreConnectApiClientPool:
+    """
+    Manages App Store Connect API clients of many teams within one process. Every team
+    has its own client with separate token, request budget and connection pool, and clients
+    are created on first use. Operations can be run for all the teams concurrently.
+    """
+
+    def __init__(self, api_keys: Dict[str, ApiKey], max_concurrent_teams: int = 8, **client_kwargs):
+        """
+        :param api_keys: API keys of the teams keyed by team names
+        :param max_concurrent_teams: Upper bound for the teams whose operations are run simultaneously
+        :param client_kwargs: Keyword arguments that are passed to every AppStoreConnectApiClient
+        """
+        self.api_keys = dict(api_keys)
+        self.max_concurrent_teams = max(1, max_concurrent_teams)
+        self._client_kwargs = client_kwargs
+        self._clients: Dict[str, AppStoreConnectApiClient] = {}
+        self._lock = threading.Lock()
+        self._logger = log.get_logger(self.__class__)
+
+    def __enter__(self) -> AppStoreConnectApiClientPool:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def teams(self) -> List[str]:
+        return list(self.api_keys.keys())
+
+    def get_client(self, team: str) -> AppStoreConnectApiClient:
+        """
+        :raises: KeyError if there is no API key for given team
+        """
+        with self._lock:
+            if team not in self._clients:
+                api_key = self.api_keys[team]
+                self._clients[team] = AppStoreConnectApiClient(
+                    api_key.key_identifier, api_key.issuer_id, api_key.private_key, **self._client_kwargs)
+            return self._clients[team]
+
+    def _run(self, team: str, operation: Callable[[AppStoreConnectApiClient], T]) -> TeamResult[T]:
+        started_at = time.perf_counter()
+        try:
+            result = operation(self.get_client(team))
+        except Exception as error:
+            self._logger.debug(f'Operation failed for team {team}', exc_info=True)
+            return TeamResult(team, time.perf_counter() - started_at, error=error)
+        return TeamResult(team, time.perf_counter() - started_at, result=result)
+
+    def map(self,
+            operation: Callable[[AppStoreConnectApiClient], T],
+            teams: Optional[Sequence[str]] = None) -> List[TeamResult[T]]:
+        """
+        Run the operation with the client of every given team, or all the teams by default.
+        Failures do not affect other teams, errors are returned in the results instead.
+        Results are in the same order as the teams.
+        """
+        selected_teams = list(teams) if teams is not None else self.teams
+        if len(selected_teams) < 2:
+            return [self._run(team, operation) for team in selected_teams]
+        workers = min(self.max_concurrent_teams, len(selected_teams))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda team: self._run(team, operation), selected_teams))
+
+    def close(self):
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client.session.close()
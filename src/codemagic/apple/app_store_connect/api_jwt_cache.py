@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import pathlib
+import stat
+import tempfile
+import time
+from typing import Dict
+from typing import Iterator
+from typing import Optional
+from typing import Tuple
+
+from codemagic.utilities import log
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore
+
+
+class JwtCache:
+    """
+    File based cache for signed App Store Connect API tokens, so that consecutive
+    processes using the same API key can reuse the token instead of signing a new one.
+    Tokens are keyed by issuer ID and key identifier. The cache file is readable only
+    by its owner and access to it is serialized between processes with a lock file.
+    """
+
+    # Do not hand out tokens that are about to expire during the request
+    EXPIRATION_MARGIN = 60
+
+    def __init__(self, path: pathlib.Path):
+        """
+        :param path: File where the signed tokens are saved
+        """
+        self.path = path.expanduser()
+        self._lock_path = self.path.with_name(f'{self.path.name}.lock')
+        self._logger = log.get_file_logger(self.__class__)
+
+    @classmethod
+    def _get_key(cls, key_identifier: str, issuer_id: str) -> str:
+        return f'{issuer_id}/{key_identifier}'
+
+    @contextlib.contextmanager
+    def _lock(self, exclusive: bool) -> Iterator[None]:
+        self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        lock_fd = os.open(str(self._lock_path), os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock_fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+        finally:
+            # Closing the file descriptor also releases the lock
+            os.close(lock_fd)
+
+    def _read_entries(self) -> Dict[str, Dict]:
+        try:
+            file_stat = self.path.stat()
+            if file_stat.st_mode & (stat.S_IRWXG | stat.S_IRWXO):
+                self._logger.warning(f'Ignore JWT cache {self.path} as it is accessible by other users')
+                return {}
+            entries = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError):
+            self._logger.exception(f'Failed to read JWT cache {self.path}')
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def _write_entries(self, entries: Dict[str, Dict]):
+        # Temporary files are created with permissions that allow access only to the owner
+        fd, temp_path = tempfile.mkstemp(dir=str(self.path.parent), prefix=f'.{self.path.name}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as tf:
+                json.dump(entries, tf)
+            os.replace(temp_path, str(self.path))
+        except OSError:
+            with contextlib.suppress(OSError):
+                os.remove(temp_path)
+            raise
+
+    @classmethod
+    def _is_valid(cls, entry, now: float) -> bool:
+        if not isinstance(entry, dict):
+            return False
+        token, expires_at = entry.get('token'), entry.get('expires_at')
+        if not isinstance(token, str) or not isinstance(expires_at, (int, float)):
+            return False
+        return expires_at - cls.EXPIRATION_MARGIN > now
+
+    def get(self, key_identifier: str, issuer_id: str) -> Optional[Tuple[str, float]]:
+        """
+        Get cached token and its expiration timestamp if there is a valid token for given API key
+        """
+        try:
+            with self._lock(exclusive=False):
+                entry = self._read_entries().get(self._get_key(key_identifier, issuer_id))
+        except OSError:
+            self._logger.exception(f'Failed to read JWT cache {self.path}')
+            return None
+        if entry is None or not self._is_valid(entry, time.time()):
+            return None
+        return entry['token'], entry['expires_at']
+
+    def store(self, key_identifier: str, issuer_id: str, token: str, expires_at: float):
+        """
+        Save signed token for given API key. Expired tokens of other keys are removed.
+        """
+        try:
+            with self._lock(exclusive=True):
+                now = time.time()
+                entries = {key: entry for key, entry in self._read_entries().items() if self._is_valid(entry, now)}
+                entries[self._get_key(key_identifier, issuer_id)] = {'token': token, 'expires_at': expires_at}
+                self._write_entries(entries)
+        except OSError:
+            self._logger.exception(f'Failed to save JWT to cache {self.path}')
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import pathlib
+import re
+import tempfile
+import threading
+import time
+from typing import Dict
+from typing import Iterator
+from typing import Optional
+
+from codemagic.utilities import log
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore
+
+
+class RateLimit:
+    """
+    Rate limit information from App Store Connect API response headers.
+    https://developer.apple.com/documentation/appstoreconnectapi/identifying_rate_limits
+    """
+
+    HEADER = 'X-Rate-Limit'
+
+    def __init__(self, limit: int, remaining: int):
+        self.limit = limit
+        self.remaining = remaining
+
+    @classmethod
+    def from_headers(cls, headers) -> Optional[RateLimit]:
+        """
+        Parse header value in the form of `user-hour-lim:3600;user-hour-rem:3599;`
+        """
+        header_value = headers.get(cls.HEADER)
+        if not header_value:
+            return None
+        values: Dict[str, str] = {}
+        for part in header_value.split(';'):
+            name, _, value = part.partition(':')
+            values[name.strip()] = value.strip()
+        try:
+            return RateLimit(int(values['user-hour-lim']), int(values['user-hour-rem']))
+        except (KeyError, ValueError):
+            return None
+
+
+class TokenBucket:
+    """
+    Thread safe token bucket that lets all the requests made from
+    current process using the same API key to share one request budget.
+    """
+
+    DEFAULT_HOURLY_LIMIT = 3600
+
+    _shared_buckets: Dict[str, TokenBucket] = {}
+    _shared_buckets_lock = threading.Lock()
+
+    def __init__(self, capacity: float, refill_rate: float):
+        """
+        :param capacity: Maximum number of requests that can be sent in a burst
+        :param refill_rate: Number of requests that are added to the budget per second
+        """
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self._tokens = capacity
+        self._updated_at = self._now()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_key(cls, key: str) -> TokenBucket:
+        with cls._shared_buckets_lock:
+            if key not in cls._shared_buckets:
+                refill_rate = cls.DEFAULT_HOURLY_LIMIT / 3600
+                cls._shared_buckets[key] = TokenBucket(cls.DEFAULT_HOURLY_LIMIT, refill_rate)
+            return cls._shared_buckets[key]
+
+    @classmethod
+    def _now(cls) -> float:
+        return time.monotonic()
+
+    @contextlib.contextmanager
+    def _locked_state(self) -> Iterator[None]:
+        with self._lock:
+            yield
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated_at
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_rate)
+        self._updated_at = now
+
+    def _get_wait_time(self, now: float) -> float:
+        self._refill(now)
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0
+        return (1 - self._tokens) / self.refill_rate
+
+    def acquire(self) -> float:
+        """
+        Block until a request can be sent. Returns the number of seconds waited.
+        """
+        waited = 0.0
+        while True:
+            with self._locked_state():
+                wait_time = self._get_wait_time(self._now())
+            if wait_time <= 0:
+                return waited
+            time.sleep(wait_time)
+            waited += wait_time
+
+    def pause(self, seconds: float):
+        """
+        Do not let any requests to be sent during given amount of seconds
+        """
+        with self._locked_state():
+            self._paused_until = max(self._paused_until, self._now() + seconds)
+
+    def update(self, rate_limit: RateLimit):
+        """
+        Synchronize the budget with the limits reported by App Store Connect API
+        """
+        with self._locked_state():
+            self._refill(self._now())
+            self.capacity = rate_limit.limit
+            self.refill_rate = max(rate_limit.limit, 1) / 3600
+            self._tokens = min(self._tokens, rate_limit.remaining)
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    Token bucket whose state is kept in a file so that all the processes on the host
+    that use the same API key draw from one request budget. Access to the state is
+    serialized between the processes with an exclusive lock on a lock file.
+    """
+
+    _host_buckets: Dict[str, SharedTokenBucket] = {}
+
+    def __init__(self, path: pathlib.Path, capacity: float, refill_rate: float):
+        """
+        :param path: File where the state of the bucket is saved
+        :param capacity: Maximum number of requests that can be sent in a burst
+        :param refill_rate: Number of requests that are added to the budget per second
+        """
+        self.path = path.expanduser()
+        self._lock_path = self.path.with_name(f'{self.path.name}.lock')
+        self._logger = log.get_file_logger(self.__class__)
+        super().__init__(capacity, refill_rate)
+
+    @classmethod
+    def for_host(cls, key: str, directory: pathlib.Path) -> SharedTokenBucket:
+        file_name = re.sub(r'[^\w.-]', '_', key)
+        path = directory.expanduser() / f'{file_name}.json'
+        with cls._shared_buckets_lock:
+            if str(path) not in cls._host_buckets:
+                refill_rate = cls.DEFAULT_HOURLY_LIMIT / 3600
+                cls._host_buckets[str(path)] = SharedTokenBucket(path, cls.DEFAULT_HOURLY_LIMIT, refill_rate)
+            return cls._host_buckets[str(path)]
+
+    @classmethod
+    def _now(cls) -> float:
+        # Monotonic clocks are not comparable between processes
+        return time.time()
+
+    def _load_state(self):
+        try:
+            state = json.loads(self.path.read_text())
+            self.capacity = float(state['capacity'])
+            self.refill_rate = float(state['refill_rate'])
+            self._tokens = float(state['tokens'])
+            self._updated_at = float(state['updated_at'])
+            self._paused_until = float(state['paused_until'])
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError):
+            self._logger.exception(f'Ignore invalid shared rate limit state {self.path}')
+
+    def _save_state(self):
+        state = {
+            'capacity': self.capacity,
+            'refill_rate': self.refill_rate,
+            'tokens': self._tokens,
+            'updated_at': self._updated_at,
+            'paused_until': self._paused_until,
+        }
+        fd, temp_path = tempfile.mkstemp(dir=str(self.path.parent), prefix=f'.{self.path.name}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as tf:
+                json.dump(state, tf)
+            os.replace(temp_path, str(self.path))
+        except OSError:
+            with contextlib.suppress(OSError):
+                os.remove(temp_path)
+            raise
+
+    @contextlib.contextmanager
+    def _locked_state(self) -> Iterator[None]:
+        with self._lock:
+            try:
+                self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+                lock_fd = os.open(str(self._lock_path), os.O_RDWR | os.O_CREAT, 0o600)
+            except OSError:
+                # Keep limiting the requests of the current process even if the budget cannot be shared
+                self._logger.exception(f'Failed to lock shared rate limit state {self.path}')
+                yield
+                return
+            try:
+                if fcntl is not None:
+                    fcntl.flock(lock_fd, fcntl.LOCK_EX)
+                self._load_state()
+                yield
+                try:
+                    self._save_state()
+                except OSError:
+                    self._logger.exception(f'Failed to save shared rate limit state {self.path}')
+            finally:
+                # Closing the file descriptor also releases the lock
+                os.close(lock_fd)
+
+    def acquire(self) -> float:
+        waited = super().acquire()
+        if waited > 0:
+            self._logger.info(f'Waited {waited:.1f}s for shared request budget {self.path}')
+        else:
+            self._logger.debug(f'Granted request from shared budget {self.path}, {self._tokens:.0f} requests remain')
+        return waited
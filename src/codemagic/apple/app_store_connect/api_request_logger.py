@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import json
+import logging
+import random
+import re
+from typing import Any
+from typing import Optional
+
+import requests
+
+
+class _LazyMessage:
+    """
+    Log message that is formatted only once a handler emits the record, so that
+    large request and response bodies are not stringified for nothing.
+    """
+
+    def __init__(self, formatter, *args):
+        self._formatter = formatter
+        self._args = args
+        self._message: Optional[str] = None
+
+    def __str__(self) -> str:
+        # Every handler formats the record separately, build the message only once
+        if self._message is None:
+            self._message = self._formatter(*self._args)
+            self._args = ()
+        return self._message
+
+
+class ApiRequestLogger:
+    """
+    Logs App Store Connect API requests and responses. Bodies are written as they
+    were received without decoding them, truncated to given number of bytes, and
+    with passwords and contents of profiles and certificates redacted.
+    Optionally only a sample of successful requests is logged, failed responses
+    are always logged.
+    """
+
+    DEFAULT_BODY_LIMIT = 4096
+    REDACTED = '<redacted>'
+    SENSITIVE_KEYS = ('certificateContent', 'profileContent')
+    # Keys that contain this are also redacted, for example `newPassword`
+    SENSITIVE_KEY_PART = 'password'
+    # Matches also values that are cut off by truncation
+    _SENSITIVE_VALUE_PATTERN = re.compile(
+        r'("(?:%s|[^"\\]*%s[^"\\]*)"\s*:\s*)"(?:[^"\\]|\\.)*(?:"|$)' % ('|'.join(SENSITIVE_KEYS), SENSITIVE_KEY_PART),
+        flags=re.IGNORECASE,
+    )
+
+    def __init__(self,
+                 logger: logging.Logger,
+                 body_limit: int = DEFAULT_BODY_LIMIT,
+                 sample_rate: float = 1.0):
+        """
+        :param logger: Logger that receives the records
+        :param body_limit: Number of bytes after which request and response bodies are truncated
+        :param sample_rate: Fraction of the requests that are logged, from 0 to 1
+        """
+        self._logger = logger
+        self.body_limit = max(0, body_limit)
+        self.sample_rate = min(1.0, max(0.0, sample_rate))
+
+    def is_enabled(self) -> bool:
+        """
+        Check whether any handler would emit the records. Loggers for the files are
+        attached on DEBUG level, so checking the level of the logger is not enough.
+        """
+        if not self._logger.isEnabledFor(logging.INFO):
+            return False
+        logger: Optional[logging.Logger] = self._logger
+        while logger is not None:
+            for handler in logger.handlers:
+                if not isinstance(handler, logging.NullHandler) and handler.level <= logging.INFO:
+                    return True
+            logger = logger.parent if logger.propagate else None
+        return False
+
+    def should_sample(self) -> bool:
+        if self.sample_rate >= 1:
+            return True
+        return random.random() < self.sample_rate
+
+    @classmethod
+    def redact(cls, text: str) -> str:
+        return cls._SENSITIVE_VALUE_PATTERN.sub(rf'\1"{cls.REDACTED}"', text)
+
+    def _format_body(self, body: bytes) -> str:
+        text = body[:self.body_limit].decode(errors='replace')
+        text = self.redact(text)
+        if len(body) > self.body_limit:
+            return f'{text}... ({len(body) - self.body_limit} more bytes)'
+        return text
+
+    def _format_request_body(self, body: Any) -> str:
+        if isinstance(body, bytes):
+            return self._format_body(body)
+        elif isinstance(body, (dict, list)):
+            return self._format_body(json.dumps(body, default=str).encode())
+        return self._format_body(str(body).encode())
+
+    def _format_request(self, method: str, url: str, body: Any) -> str:
+        return f'>>> {method} {url} {self._format_request_body(body)}'
+
+    def _format_response(self, response: requests.Response) -> str:
+        return f'<<< {response.status_code} {self._format_body(response.content)}'
+
+    def log_request(self, method: str, url: str, body: Any):
+        if self.is_enabled():
+            self._logger.info(_LazyMessage(self._format_request, method, url, body))
+
+    def log_response(self, response: requests.Response):
+        if self.is_enabled():
+            self._logger.info(_LazyMessage(self._format_response, response))
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import contextlib
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from requests.adapters import DEFAULT_POOLSIZE
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connection import HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.connectionpool import HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+_active_request = threading.local()
+
+
+@dataclass
+class RequestTiming:
+    method: str
+    url: str
+    status_code: Optional[int] = None
+    total: float = 0.0
+    dns: Optional[float] = None
+    connect: Optional[float] = None
+    tls: Optional[float] = None
+
+    @property
+    def reused_connection(self) -> bool:
+        return self.connect is None
+
+    @property
+    def transfer(self) -> float:
+        setup = sum(duration or 0 for duration in (self.dns, self.connect, self.tls))
+        return max(0.0, self.total - setup)
+
+
+class RequestProfiler:
+    """
+    Collects timings of HTTP requests sent through ProfilingHTTPAdapter.
+    Connection phases are attributed to the request that is being sent
+    from the same thread.
+    """
+
+    HISTOGRAM_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+    def __init__(self):
+        self.timings: List[RequestTiming] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_active_timing(cls) -> Optional[RequestTiming]:
+        return getattr(_active_request, 'timing', None)
+
+    @contextlib.contextmanager
+    def profile(self, method: str, url: str) -> Iterator[RequestTiming]:
+        timing = RequestTiming(method, url)
+        _active_request.timing = timing
+        started_at = time.perf_counter()
+        try:
+            yield timing
+        finally:
+            timing.total = time.perf_counter() - started_at
+            _active_request.timing = None
+            with self._lock:
+                self.timings.append(timing)
+
+    @classmethod
+    def _format_seconds(cls, seconds: float) -> str:
+        return f'{seconds * 1000:.0f}ms'
+
+    @classmethod
+    def _get_percentile(cls, sorted_values: Sequence[float], percentile: float) -> float:
+        index = min(len(sorted_values) - 1, int(round(percentile / 100 * (len(sorted_values) - 1))))
+        return sorted_values[index]
+
+    def _get_histogram_lines(self, totals: Sequence[float]) -> List[str]:
+        lower_bounds = (0.0,) + self.HISTOGRAM_BUCKETS
+        upper_bounds = self.HISTOGRAM_BUCKETS + (float('inf'),)
+        counts = [
+            sum(1 for total in totals if lower <= total < upper)
+            for lower, upper in zip(lower_bounds, upper_bounds)
+        ]
+        max_count = max(counts)
+        lines = []
+        for lower, upper, count in zip(lower_bounds, upper_bounds, counts):
+            if upper == float('inf'):
+                label = f'>= {self._format_seconds(lower)}'
+            else:
+                label = f'< {self._format_seconds(upper)}'
+            bar = '#' * round(40 * count / max_count) if max_count else ''
+            lines.append(f'{label:>9} | {bar:<40} {count}')
+        return lines
+
+    def get_report(self) -> List[str]:
+        with self._lock:
+            timings = list(self.timings)
+        if not timings:
+            return ['No HTTP requests were made']
+
+        totals = sorted(timing.total for timing in timings)
+        new_connections = [timing for timing in timings if not timing.reused_connection]
+        lines = [
+            f'HTTP requests: {len(timings)}, '
+            f'reused connections: {len(timings) - len(new_connections)}, '
+            f'new connections: {len(new_connections)}',
+            'Latency: ' + ', '.join(
+                f'p{percentile} {self._format_seconds(self._get_percentile(totals, percentile))}'
+                for percentile in (50, 90, 99)
+            ) + f', max {self._format_seconds(totals[-1])}',
+        ]
+        if new_connections:
+            phases = []
+            for phase in ('dns', 'connect', 'tls'):
+                average = sum(getattr(timing, phase) or 0 for timing in new_connections) / len(new_connections)
+                phases.append(f'{phase} {self._format_seconds(average)}')
+            lines.append(f'Average connection setup: {", ".join(phases)}')
+        average_transfer = sum(timing.transfer for timing in timings) / len(timings)
+        lines.append(f'Average request and response transfer: {self._format_seconds(average_transfer)}')
+        lines.extend(self._get_histogram_lines(totals))
+        return lines
+
+
+class _InstrumentedConnectionMixin:
+    _dns_host: str
+    host: str
+    port: int
+    timeout: Any
+    source_address: Optional[Tuple[str, int]]
+    socket_options: Optional[Sequence[Tuple[int, int, int]]]
+
+    def _connect_socket(self, addresses: Sequence[Tuple]) -> socket.socket:
+        """
+        Connect to the first reachable address, same as urllib3 does after resolving the host
+        """
+        error: Optional[OSError] = None
+        for family, socket_type, protocol, _canonical_name, address in addresses:
+            sock = socket.socket(family, socket_type, protocol)
+            try:
+                for socket_option in self.socket_options or ():
+                    sock.setsockopt(*socket_option)
+                if self.timeout is not socket._GLOBAL_DEFAULT_TIMEOUT:  # type: ignore
+                    sock.settimeout(self.timeout)
+                if self.source_address:
+                    sock.bind(self.source_address)
+                sock.connect(address)
+                return sock
+            except OSError as socket_error:
+                error = socket_error
+                sock.close()
+        raise error or OSError('getaddrinfo returns an empty list')
+
+    def _new_conn(self):
+        timing = RequestProfiler.get_active_timing()
+        if timing is None:
+            return super()._new_conn()  # type: ignore
+        # Resolve the address here instead of urllib3 to tell name resolution apart from establishing the connection
+        host = self._dns_host.strip('[]')
+        started_at = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(host, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+            resolved_at = time.perf_counter()
+            timing.dns = resolved_at - started_at
+            connection = self._connect_socket(addresses)
+        except socket.timeout:
+            raise ConnectTimeoutError(self, f'Connection to {self.host} timed out. (connect timeout={self.timeout})')
+        except OSError as error:
+            raise NewConnectionError(self, f'Failed to establish a new connection: {error}')
+        timing.connect = time.perf_counter() - resolved_at
+        return connection
+
+
+class _InstrumentedHTTPConnection(_InstrumentedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _InstrumentedHTTPSConnection(_InstrumentedConnectionMixin, HTTPSConnection):
+
+    def connect(self):
+        started_at = time.perf_counter()
+        super().connect()
+        timing = RequestProfiler.get_active_timing()
+        if timing is not None and timing.connect is not None:
+            setup_duration = time.perf_counter() - started_at
+            timing.tls = max(0.0, setup_duration - timing.connect - (timing.dns or 0))
+
+
+class _InstrumentedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _InstrumentedHTTPConnection
+
+
+class _InstrumentedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _InstrumentedHTTPSConnection
+
+
+class ProfilingHTTPAdapter(HTTPAdapter):
+    """
+    HTTP adapter with configurable connection pool and TCP keep-alive settings
+    whose connections report connection setup timings to RequestProfiler.
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ['keep_alive_idle']
+
+    def __init__(self,
+                 pool_connections: int = DEFAULT_POOLSIZE,
+                 pool_maxsize: int = DEFAULT_POOLSIZE,
+                 keep_alive_idle: Optional[int] = None,
+                 **kwargs):
+        """
+        :param pool_connections: Number of connection pools (one per host) to cache
+        :param pool_maxsize: Maximum number of connections kept alive per host
+        :param keep_alive_idle: If given, enable TCP keep-alive probes on idle
+                                connections after this many seconds
+        """
+        self.keep_alive_idle = keep_alive_idle
+        super().__init__(pool_connections=pool_connections, pool_maxsize=pool_maxsize, **kwargs)
+
+    def _get_socket_options(self):
+        socket_options = list(HTTPConnection.default_socket_options)
+        if self.keep_alive_idle is not None:
+            socket_options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+            if hasattr(socket, 'TCP_KEEPIDLE'):
+                socket_options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, self.keep_alive_idle))
+            elif hasattr(socket, 'TCP_KEEPALIVE'):  # macOS
+                socket_options.append((socket.IPPROTO_TCP, socket.TCP_KEEPALIVE, self.keep_alive_idle))
+        return socket_options
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        pool_kwargs.setdefault('socket_options', self._get_socket_options())
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _InstrumentedHTTPConnectionPool,
+            'https': _InstrumentedHTTPSConnectionPool,
+        }
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pathlib
+import shutil
+import tempfile
+import time
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from urllib import parse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from codemagic.utilities import log
+
+
+class ApiResponseCache:
+    """
+    Persistent cache for successful App Store Connect API GET responses.
+    Entries are stored as separate files keyed by request URL together with
+    query parameters. Entries expire after given time to live and least recently
+    used entries are evicted once total size of the cache exceeds given limit.
+    """
+
+    DEFAULT_TTL = 300
+    DEFAULT_MAX_SIZE = 50 * 1024 * 1024
+
+    def __init__(self,
+                 directory: pathlib.Path,
+                 ttl: float = DEFAULT_TTL,
+                 max_size: int = DEFAULT_MAX_SIZE,
+                 namespace: str = ''):
+        """
+        :param directory: Directory where the cached responses are saved
+        :param ttl: Number of seconds after which cached response is considered stale
+        :param max_size: Maximum total size of cached responses in bytes
+        :param namespace: Identifier that separates responses of different API keys
+        """
+        namespace_hash = hashlib.sha256(namespace.encode()).hexdigest()[:16]
+        self.directory = directory.expanduser() / namespace_hash
+        self.ttl = ttl
+        self.max_size = max_size
+        self._logger = log.get_file_logger(self.__class__)
+
+    @classmethod
+    def _get_key(cls, url: str, params: Optional[Dict]) -> str:
+        parsed_url = parse.urlparse(url)
+        query: List[Tuple[str, str]] = parse.parse_qsl(parsed_url.query)
+        for name, value in (params or {}).items():
+            if value is None:
+                continue
+            values = value if isinstance(value, (list, tuple)) else [value]
+            query.extend((name, str(v)) for v in values)
+        base_url = parse.urlunparse(parsed_url._replace(query='', fragment=''))
+        cache_key = f'{base_url}?{parse.urlencode(sorted(query))}'
+        return hashlib.sha256(cache_key.encode()).hexdigest()
+
+    def _get_path(self, url: str, params: Optional[Dict]) -> pathlib.Path:
+        return self.directory / f'{self._get_key(url, params)}.json'
+
+    @classmethod
+    def _remove(cls, path: pathlib.Path):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def get(self, url: str, params: Optional[Dict] = None) -> Optional[requests.Response]:
+        path = self._get_path(url, params)
+        try:
+            entry = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - entry['created'] > self.ttl:
+            self._remove(path)
+            return None
+        try:
+            # Update modification time to keep track of recently used entries
+            os.utime(str(path))
+        except OSError:
+            pass
+
+        response = requests.Response()
+        response.status_code = entry['status_code']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.url = entry['url']
+        response.encoding = 'utf-8'
+        response._content = entry['content'].encode()
+        response.request = requests.Request('GET', url, params=params).prepare()
+        return response
+
+    def store(self, url: str, params: Optional[Dict], response: requests.Response):
+        try:
+            content = response.content.decode()
+        except UnicodeDecodeError:
+            return
+        entry = {
+            'created': time.time(),
+            'url': response.url,
+            'status_code': response.status_code,
+            'headers': dict(response.headers),
+            'content': content,
+        }
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile('w', dir=str(self.directory), suffix='.tmp', delete=False) as tf:
+                json.dump(entry, tf)
+            os.replace(tf.name, str(self._get_path(url, params)))
+        except OSError:
+            self._logger.exception('Failed to cache App Store Connect API response')
+            return
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for path in self.directory.glob('*.json'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _mtime, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total_size <= self.max_size:
+                break
+            self._logger.debug(f'Evict cached App Store Connect API response {path.name}')
+            self._remove(path)
+            total_size -= size
+
+    def invalidate(self):
+        self._logger.debug('Invalidate cached App Store Connect API responses')
+        shutil.rmtree(str(self.directory), ignore_errors=True)
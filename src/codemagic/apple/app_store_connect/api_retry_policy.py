@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from email.utils import parsedate_to_datetime
+from typing import FrozenSet
+from typing import Optional
+
+import requests
+
+
+@dataclass
+class RetryStatistics:
+    retries: int = 0
+    throttled_seconds: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record_retry(self, delay: float):
+        with self._lock:
+            self.retries += 1
+            self.throttled_seconds += delay
+
+    def record_throttling(self, seconds: float):
+        with self._lock:
+            self.throttled_seconds += seconds
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Decides whether failed App Store Connect API requests should be retried
+    and how long to wait before the next attempt. Delays from `Retry-After`
+    headers are respected, otherwise exponential backoff with full jitter is used.
+    """
+
+    max_retries: int = 5
+    backoff_base: float = 1.0
+    backoff_max: float = 60.0
+    # Requests that were rejected with these statuses were not processed by the server
+    retry_statuses: FrozenSet[int] = frozenset({429, 503})
+    # Requests with these statuses may have been processed, retry only idempotent requests
+    idempotent_retry_statuses: FrozenSet[int] = frozenset({500, 502, 504})
+    idempotent_methods: FrozenSet[str] = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+
+    def should_retry_response(self, method: str, response: requests.Response, attempt: int) -> bool:
+        if attempt >= self.max_retries:
+            return False
+        if response.status_code in self.retry_statuses:
+            return True
+        return response.status_code in self.idempotent_retry_statuses and method in self.idempotent_methods
+
+    def should_retry_error(self, method: str, attempt: int) -> bool:
+        return attempt < self.max_retries and method in self.idempotent_methods
+
+    @classmethod
+    def get_retry_after(cls, response: requests.Response) -> Optional[float]:
+        retry_after = response.headers.get('Retry-After')
+        if not retry_after:
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, retry_at.timestamp() - time.time())
+
+    def get_backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def get_delay(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        retry_after = self.get_retry_after(response) if response is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        return self.get_backoff(attempt)
@@ -1,42 +1,159 @@
 from __future__ import annotations
 
+import time
 from typing import Callable
 from typing import Dict
+from typing import Optional
 
 import requests
+from requests.adapters import DEFAULT_POOLSIZE
 
 from codemagic.utilities import log
+from .api_cassette import ApiCassette
 from .api_error import AppStoreConnectApiError
+from .api_rate_limiter import RateLimit
+from .api_rate_limiter import TokenBucket
+from .api_request_logger import ApiRequestLogger
+from .api_request_profiler import ProfilingHTTPAdapter
+from .api_request_profiler import RequestProfiler
+from .api_response_cache import ApiResponseCache
+from .api_retry_policy import RetryPolicy
+from .api_retry_policy import RetryStatistics
 
 
 class AppStoreConnectApiSession(requests.Session):
 
-    def __init__(self, auth_headers_factory: Callable[[], Dict[str, str]], log_requests: bool = False):
+    def __init__(self,
+                 auth_headers_factory: Callable[[], Dict[str, str]],
+                 log_requests: bool = False,
+                 response_cache: Optional[ApiResponseCache] = None,
+                 token_bucket: Optional[TokenBucket] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 pool_connections: int = DEFAULT_POOLSIZE,
+                 pool_maxsize: int = DEFAULT_POOLSIZE,
+                 keep_alive_idle: Optional[int] = None,
+                 request_profiler: Optional[RequestProfiler] = None,
+                 cassette: Optional[ApiCassette] = None,
+                 log_body_limit: int = ApiRequestLogger.DEFAULT_BODY_LIMIT,
+                 log_sample_rate: float = 1.0):
         super().__init__()
         self._auth_headers_factory = auth_headers_factory
         self._logger = log.get_logger(self.__class__, log_to_stream=log_requests)
+        self.request_logger = ApiRequestLogger(
+            log.get_logger(ApiRequestLogger, log_to_stream=log_requests),
+            body_limit=log_body_limit,
+            sample_rate=log_sample_rate,
+        )
+        self.response_cache = response_cache
+        self.token_bucket = token_bucket
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.retry_statistics = RetryStatistics()
+        self.request_profiler = request_profiler
+        self.cassette = cassette
+        adapter = ProfilingHTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize, keep_alive_idle=keep_alive_idle)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
 
-    def _log_response(self, response):
-        try:
-            self._logger.info(f'<<< {response.status_code} {response.json()}')
-        except ValueError:
-            self._logger.info(f'<<< {response.status_code} {response.content}')
+    def _get_cached_response(self, method: str, url: str, params: Optional[Dict]) -> Optional[requests.Response]:
+        if self.response_cache is None or method != 'GET':
+            return None
+        response = self.response_cache.get(url, params)
+        if response is not None:
+            self._logger.info(f'<<< Use cached response for {method} {url}')
+        return response
 
-    def _log_request(self, *args, **kwargs):
-        method = args[0].upper()
-        url = args[1]
-        body = kwargs.get('params') or kwargs.get('data') or kwargs.get('json')
-        if isinstance(body, dict):
-            body = {k: (v if 'password' not in k.lower() else '*******') for k, v in body.items()}
-        self._logger.info(f'>>> {method} {url} {body}')
+    def _update_response_cache(self, method: str, url: str, params: Optional[Dict], response: requests.Response):
+        if self.response_cache is None or not response.ok:
+            return
+        if method == 'GET':
+            self.response_cache.store(url, params, response)
+        else:
+            # Resources were created, modified or deleted, previous responses can be outdated
+            self.response_cache.invalidate()
 
-    def request(self, *args, **kwargs) -> requests.Response:
-        self._log_request(*args, **kwargs)
-        headers = kwargs.pop('headers', {})
-        headers.update(self._auth_headers_factory())
-        kwargs['headers'] = headers
+    def _wait_for_request_budget(self):
+        if self.token_bucket is None:
+            return
+        waited = self.token_bucket.acquire()
+        if waited > 0:
+            self._logger.info(f'Waited {waited:.1f}s for App Store Connect API request budget')
+            self.retry_statistics.record_throttling(waited)
+
+    def _update_request_budget(self, response: requests.Response, retry_delay: Optional[float] = None):
+        if self.token_bucket is None:
+            return
+        rate_limit = RateLimit.from_headers(response.headers)
+        if rate_limit is not None:
+            self.token_bucket.update(rate_limit)
+        if response.status_code == 429 and retry_delay:
+            # Hold back other requests sharing the same budget as well
+            self.token_bucket.pause(retry_delay)
+
+    def _perform_request(self, method: str, *args, **kwargs) -> requests.Response:
+        if self.cassette is None:
+            return super().request(*args, **kwargs)
+        if self.cassette.is_replaying:
+            return self.cassette.replay(method, args[1], kwargs.get('params'))
         response = super().request(*args, **kwargs)
-        self._log_response(response)
+        self.cassette.record(method, args[1], kwargs.get('params'), kwargs.get('json'), response)
+        return response
+
+    def _send_request(self, method: str, *args, **kwargs) -> requests.Response:
+        if self.request_profiler is None:
+            return self._perform_request(method, *args, **kwargs)
+        with self.request_profiler.profile(method, args[1]) as timing:
+            response = self._perform_request(method, *args, **kwargs)
+            timing.status_code = response.status_code
+        return response
+
+    def _get_auth_headers(self) -> Dict[str, str]:
+        if self.cassette is not None and self.cassette.is_replaying:
+            # Replayed requests are not sent anywhere, skip signing the token
+            return {}
+        return self._auth_headers_factory()
+
+    def _send(self, method: str, *args, log_response: bool = True, **kwargs) -> requests.Response:
+        headers = dict(kwargs.pop('headers', None) or {})
+        attempt = 0
+        while True:
+            self._wait_for_request_budget()
+            kwargs['headers'] = {**headers, **self._get_auth_headers()}
+            try:
+                response = self._send_request(method, *args, **kwargs)
+            except requests.ConnectionError as connection_error:
+                if not self.retry_policy.should_retry_error(method, attempt):
+                    raise
+                delay = self.retry_policy.get_delay(attempt)
+                reason = str(connection_error)
+            else:
+                if log_response or not response.ok:
+                    self.request_logger.log_response(response)
+                if response.ok or not self.retry_policy.should_retry_response(method, response, attempt):
+                    self._update_request_budget(response)
+                    return response
+                delay = self.retry_policy.get_delay(attempt, response)
+                self._update_request_budget(response, delay)
+                reason = f'status code {response.status_code}'
+
+            attempt += 1
+            self._logger.info(f'Retry {method} {args[1]} in {delay:.1f}s ({attempt}) due to {reason}')
+            self.retry_statistics.record_retry(delay)
+            time.sleep(delay)
+
+    def request(self, *args, **kwargs) -> requests.Response:
+        method, url = args[0].upper(), args[1]
+        # Failed responses are logged also when the request itself was not sampled
+        should_log = self.request_logger.should_sample()
+        if should_log:
+            body = kwargs.get('params') or kwargs.get('data') or kwargs.get('json')
+            self.request_logger.log_request(method, url, body)
+        cached_response = self._get_cached_response(method, url, kwargs.get('params'))
+        if cached_response is not None:
+            return cached_response
+
+        response = self._send(method, *args, log_response=should_log, **kwargs)
+        self._update_response_cache(method, url, kwargs.get('params'), response)
         if not response.ok:
             raise AppStoreConnectApiError(response)
         return response
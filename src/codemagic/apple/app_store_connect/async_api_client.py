@@ -0,0 +1,160 @@
+"""
+Asyncio wrapper for the blocking App Store Connect API client. This is not
+non-blocking I/O: every call runs the synchronous client in a thread pool
+using `loop.run_in_executor`, so concurrency is bounded by the pool size.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import AsyncIterator
+from typing import Dict
+from typing import Generic
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import TypeVar
+
+from .api_client import AppStoreConnectApiClient
+from .api_client import IssuerId
+from .api_client import KeyIdentifier
+from .provisioning import BundleIdCapabilities
+from .provisioning import BundleIds
+from .provisioning import Devices
+from .provisioning import Profiles
+from .provisioning import SigningCertificates
+from .resource_manager import ResourceManager
+
+M = TypeVar('M', bound=ResourceManager)
+T = TypeVar('T')
+
+_STOP_ITERATION = object()
+
+
+class AsyncResourceManager(Generic[M]):
+    """
+    Coroutine based counterpart of given resource manager. Public methods of the
+    wrapped manager are exposed with the same names and arguments, but they need
+    to be awaited. Generator methods, such as `iter_list`, become async generators.
+    """
+
+    def __init__(self, resource_manager: M, executor: ThreadPoolExecutor):
+        self._resource_manager = resource_manager
+        self._executor = executor
+
+    @property
+    def resource_manager(self) -> M:
+        return self._resource_manager
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def _iterate(self, iterator: Iterator[T]) -> AsyncIterator[T]:
+        while True:
+            item = await self._run(next, iterator, _STOP_ITERATION)
+            if item is _STOP_ITERATION:
+                break
+            yield item
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._resource_manager, name)
+        if name.startswith('_') or inspect.isclass(attribute) or not callable(attribute):
+            return attribute
+
+        if inspect.isgeneratorfunction(attribute):
+            @functools.wraps(attribute)
+            def async_generator_method(*args, **kwargs):
+                return self._iterate(attribute(*args, **kwargs))
+            return async_generator_method
+
+        @functools.wraps(attribute)
+        async def async_method(*args, **kwargs):
+            return await self._run(attribute, *args, **kwargs)
+        return async_method
+
+
+class AsyncAppStoreConnectApiClient:
+    """
+    Asyncio interface for App Store Connect API. It is a thread pool wrapper: calls of the
+    underlying blocking client are run in worker threads with `run_in_executor`, so that all
+    the coroutines share the same keep-alive connection pool, JWT and request budget.
+
+    Example:
+        async with AsyncAppStoreConnectApiClient.create(key_identifier, issuer_id, private_key) as client:
+            bundle_ids, devices = await asyncio.gather(
+                client.bundle_ids.list(),
+                client.devices.list(),
+            )
+    """
+
+    def __init__(self, client: AppStoreConnectApiClient):
+        """
+        :param client: Blocking client whose session, JWT and request budget are shared
+        """
+        self.client = client
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def create(cls,
+               key_identifier: KeyIdentifier,
+               issuer_id: IssuerId,
+               private_key: str,
+               **client_kwargs) -> AsyncAppStoreConnectApiClient:
+        """
+        :param key_identifier: Your private key ID from App Store Connect (Ex: 2X9R4HXF34)
+        :param issuer_id: Your issuer ID from the API Keys page in
+                          App Store Connect (Ex: 57246542-96fe-1a63-e053-0824d011072a)
+        :param private_key: Private key associated with the key_identifier you specified.
+        :param client_kwargs: Additional options for AppStoreConnectApiClient
+        """
+        return AsyncAppStoreConnectApiClient(
+            AppStoreConnectApiClient(key_identifier, issuer_id, private_key, **client_kwargs))
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.client.max_concurrent_requests,
+                thread_name_prefix=self.__class__.__name__)
+        return self._executor
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def __aenter__(self) -> AsyncAppStoreConnectApiClient:
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    async def paginate(self, url, params=None, page_size: Optional[int] = 100) -> List[Dict]:
+        loop = asyncio.get_running_loop()
+        paginate = functools.partial(self.client.paginate, url, params=params, page_size=page_size)
+        return await loop.run_in_executor(self.executor, paginate)
+
+    @property
+    def bundle_ids(self) -> AsyncResourceManager[BundleIds]:
+        return AsyncResourceManager(self.client.bundle_ids, self.executor)
+
+    @property
+    def bundle_id_capabilities(self) -> AsyncResourceManager[BundleIdCapabilities]:
+        return AsyncResourceManager(self.client.bundle_id_capabilities, self.executor)
+
+    @property
+    def devices(self) -> AsyncResourceManager[Devices]:
+        return AsyncResourceManager(self.client.devices, self.executor)
+
+    @property
+    def profiles(self) -> AsyncResourceManager[Profiles]:
+        return AsyncResourceManager(self.client.profiles, self.executor)
+
+    @property
+    def signing_certificates(self) -> AsyncResourceManager[SigningCertificates]:
+        return AsyncResourceManager(self.client.signing_certificates, self.executor)
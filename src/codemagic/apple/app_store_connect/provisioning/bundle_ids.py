@@ -1,9 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
 from typing import List
 from typing import Optional
 from typing import TYPE_CHECKING
+from typing import Sequence
+from typing import Set
 from typing import Type
 from typing import Union
 
@@ -26,6 +31,8 @@ class BundleIds(ResourceManager[BundleId]):
     https://developer.apple.com/documentation/appstoreconnectapi/bundle_ids
     """
 
+    RELATED_PROFILES_PAGE_SIZE = 100
+
     @property
     def resource_type(self) -> Type[BundleId]:
         return BundleId
@@ -82,25 +89,52 @@ class BundleIds(ResourceManager[BundleId]):
         bundle_id_resource_id = self._get_resource_id(bundle_id)
         self.client.session.delete(f'{self.client.API_URL}/bundleIds/{bundle_id_resource_id}')
 
+    def iter_list(self,
+                  resource_filter: Filter = Filter(),
+                  ordering=Ordering.NAME,
+                  reverse=False,
+                  fields: Optional[Sequence[str]] = None) -> Iterator[BundleId]:
+        """
+        https://developer.apple.com/documentation/appstoreconnectapi/list_bundle_ids
+        """
+        params = {
+            'sort': ordering.as_param(reverse),
+            **resource_filter.as_query_params(),
+            **self._get_fields_params(ResourceType.BUNDLE_ID, fields),
+        }
+        for bundle_id in self.client.iter_paginate(f'{self.client.API_URL}/bundleIds', params=params):
+            yield BundleId(bundle_id)
+
     def list(self,
              resource_filter: Filter = Filter(),
              ordering=Ordering.NAME,
-             reverse=False) -> List[BundleId]:
+             reverse=False,
+             fields: Optional[Sequence[str]] = None) -> List[BundleId]:
         """
         https://developer.apple.com/documentation/appstoreconnectapi/list_bundle_ids
         """
-        params = {'sort': ordering.as_param(reverse), **resource_filter.as_query_params()}
-        bundle_ids = self.client.paginate(f'{self.client.API_URL}/bundleIds', params=params)
-        return [BundleId(bundle_id) for bundle_id in bundle_ids]
+        return list(self.iter_list(resource_filter, ordering, reverse, fields))
 
-    def read(self, bundle_id: Union[LinkedResourceData, ResourceId]) -> BundleId:
+    def read(self,
+             bundle_id: Union[LinkedResourceData, ResourceId],
+             fields: Optional[Sequence[str]] = None) -> BundleId:
         """
         https://developer.apple.com/documentation/appstoreconnectapi/read_bundle_id_information
         """
         bundle_id_resource_id = self._get_resource_id(bundle_id)
-        response = self.client.session.get(f'{self.client.API_URL}/bundleIds/{bundle_id_resource_id}').json()
+        params = self._get_fields_params(ResourceType.BUNDLE_ID, fields)
+        response = self.client.session.get(f'{self.client.API_URL}/bundleIds/{bundle_id_resource_id}', params=params).json()
         return BundleId(response['data'])
 
+    def read_many(self,
+                  bundle_ids: Sequence[Union[LinkedResourceData, ResourceId]],
+                  fields: Optional[Sequence[str]] = None) -> List[BundleId]:
+        """
+        Read multiple Bundle IDs using as few list requests as possible
+        https://developer.apple.com/documentation/appstoreconnectapi/list_bundle_ids
+        """
+        return self._read_many(bundle_ids, lambda ids: self.iter_list(self.Filter(id=ids), fields=fields))
+
     def list_profile_ids(self, bundle_id: Union[BundleId, ResourceId]) -> List[LinkedResourceData]:
         """
         https://developer.apple.com/documentation/appstoreconnectapi/get_all_profile_ids_for_a_bundle_id
@@ -113,19 +147,64 @@ class BundleIds(ResourceManager[BundleId]):
 
     def list_profiles(self,
                       bundle_id: Union[BundleId, ResourceId],
-                      resource_filter: Optional[Profiles.Filter] = None) -> List[Profile]:
+                      resource_filter: Optional[Profiles.Filter] = None,
+                      fields: Optional[Sequence[str]] = None) -> List[Profile]:
         """
         https://developer.apple.com/documentation/appstoreconnectapi/list_all_profiles_for_a_bundle_id
-        """
+
+        Related profiles endpoint does not support filtering. In case the Bundle ID has more
+        profiles than fit on one page and the filter has restrictions that the list profiles
+        endpoint can evaluate, then profiles from the first page are matched locally and only
+        identifiers of the remaining profiles are listed for the Bundle ID. Remaining matching
+        profiles are listed by those identifiers. This avoids downloading the contents of the
+        profiles that would be discarded by the filter anyway.
+        """
+        # Profile identifiers are used to scope the listing to the Bundle ID and are matched locally
+        pushdown_fields = [field for field in self.client.profiles.LIST_FILTER_FIELDS if field != 'id']
+        filter_params, local_filter = self._plan_filter(
+            resource_filter, pushdown_fields, self.client.profiles.INEXACT_FILTER_FIELDS)
+        fields_params = self._get_fields_params(ResourceType.PROFILES, fields)
         if isinstance(bundle_id, BundleId):
             url = bundle_id.relationships.profiles.links.related
         else:
             url = f'{self.client.API_URL}/bundleIds/{bundle_id}/profiles'
-        profiles = [Profile(profile) for profile in self.client.paginate(url)]
+
+        if not filter_params:
+            return self._get_matching_profiles(self.client.paginate(url, params=fields_params), local_filter)
+
+        first_page = self.client.session.get(
+            url, params={'limit': self.RELATED_PROFILES_PAGE_SIZE, **fields_params}).json()
+        profiles = self._get_matching_profiles(first_page['data'], resource_filter)
+        if 'next' in first_page['links']:
+            listed_profile_ids = {api_profile['id'] for api_profile in first_page['data']}
+            api_profiles = self._list_profiles_by_ids(bundle_id, filter_params, fields_params, listed_profile_ids)
+            profiles.extend(self._get_matching_profiles(api_profiles, local_filter))
+        return profiles
+
+    def _get_matching_profiles(self,
+                               api_profiles: Iterable[Dict],
+                               resource_filter: Optional[Profiles.Filter]) -> List[Profile]:
+        profiles = [self.client.profiles.with_content_loader(Profile(profile)) for profile in api_profiles]
         if resource_filter:
             return [profile for profile in profiles if resource_filter.matches(profile)]
         return profiles
 
+    def _list_profiles_by_ids(self,
+                              bundle_id: Union[BundleId, ResourceId],
+                              filter_params: Dict[str, str],
+                              fields_params: Dict[str, str],
+                              excluded_profile_ids: Set[ResourceId]) -> List[Dict]:
+        profile_ids = [
+            profile.id for profile in self.list_profile_ids(bundle_id)
+            if profile.id not in excluded_profile_ids
+        ]
+        api_profiles: List[Dict] = []
+        for batch in self._get_id_batches(profile_ids):
+            params = {'filter[id]': ','.join(batch), **filter_params, **fields_params}
+            url = f'{self.client.API_URL}/profiles'
+            api_profiles.extend(self.client.paginate(url, params=params, page_size=len(batch)))
+        return api_profiles
+
     def list_capabilility_ids(self, bundle_id: Union[BundleId, ResourceId]) -> List[LinkedResourceData]:
         """
         https://developer.apple.com/documentation/appstoreconnectapi/get_all_capabilility_ids_for_a_bundle_id
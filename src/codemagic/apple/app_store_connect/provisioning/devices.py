@@ -1,6 +1,8 @@
 from dataclasses import dataclass
+from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import Sequence
 from typing import Type
 from typing import Union
 
@@ -53,25 +55,52 @@ class Devices(ResourceManager[Device]):
         ).json()
         return Device(response['data'], created=True)
 
+    def iter_list(self,
+                  resource_filter: Filter = Filter(),
+                  ordering=Ordering.NAME,
+                  reverse=False,
+                  fields: Optional[Sequence[str]] = None) -> Iterator[Device]:
+        """
+        https://developer.apple.com/documentation/appstoreconnectapi/list_devices
+        """
+        params = {
+            'sort': ordering.as_param(reverse),
+            **resource_filter.as_query_params(),
+            **self._get_fields_params(ResourceType.DEVICES, fields),
+        }
+        for device in self.client.iter_paginate(f'{self.client.API_URL}/devices', params=params):
+            yield Device(device)
+
     def list(self,
              resource_filter: Filter = Filter(),
              ordering=Ordering.NAME,
-             reverse=False) -> List[Device]:
+             reverse=False,
+             fields: Optional[Sequence[str]] = None) -> List[Device]:
         """
         https://developer.apple.com/documentation/appstoreconnectapi/list_devices
         """
-        params = {'sort': ordering.as_param(reverse), **resource_filter.as_query_params()}
-        devices = self.client.paginate(f'{self.client.API_URL}/devices', params=params)
-        return [Device(device) for device in devices]
+        return list(self.iter_list(resource_filter, ordering, reverse, fields))
 
-    def read(self, device: Union[LinkedResourceData, ResourceId]) -> Device:
+    def read(self,
+             device: Union[LinkedResourceData, ResourceId],
+             fields: Optional[Sequence[str]] = None) -> Device:
         """
         https://developer.apple.com/documentation/appstoreconnectapi/read_device_information
         """
         device_id = self._get_resource_id(device)
-        response = self.client.session.get(f'{self.client.API_URL}/devices/{device_id}').json()
+        params = self._get_fields_params(ResourceType.DEVICES, fields)
+        response = self.client.session.get(f'{self.client.API_URL}/devices/{device_id}', params=params).json()
         return Device(response['data'])
 
+    def read_many(self,
+                  devices: Sequence[Union[LinkedResourceData, ResourceId]],
+                  fields: Optional[Sequence[str]] = None) -> List[Device]:
+        """
+        Read multiple devices using as few list requests as possible
+        https://developer.apple.com/documentation/appstoreconnectapi/list_devices
+        """
+        return self._read_many(devices, lambda ids: self.iter_list(self.Filter(id=ids), fields=fields))
+
     def modify(self,
                device: Union[LinkedResourceData, ResourceId],
                name: Optional[str] = None,
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Iterator
 from typing import List
 from typing import Optional
 from typing import Sequence
@@ -23,6 +24,12 @@ class Profiles(ResourceManager[Profile]):
     https://developer.apple.com/documentation/appstoreconnectapi/profiles
     """
 
+    # Fields of profiles except for the base64 encoded profile content, which is by far the largest one
+    FIELDS_WITHOUT_CONTENT = (
+        'name', 'platform', 'uuid', 'createdDate', 'profileState', 'profileType', 'expirationDate',
+        'bundleId', 'certificates', 'devices',
+    )
+
     @property
     def resource_type(self) -> Type[Profile]:
         return Profile
@@ -40,6 +47,11 @@ class Profiles(ResourceManager[Profile]):
                    self._field_matches(self.profile_state, profile.attributes.profileState) and \
                    self._field_matches(self.profile_type, profile.attributes.profileType)
 
+    # Filter fields that can be evaluated by the list profiles endpoint
+    LIST_FILTER_FIELDS = ('id', 'name', 'profile_state', 'profile_type')
+    # Name filter of the list profiles endpoint is not an exact match
+    INEXACT_FILTER_FIELDS = ('name',)
+
     class Ordering(ResourceManager.Ordering):
         ID = 'id'
         NAME = 'name'
@@ -86,24 +98,69 @@ class Profiles(ResourceManager[Profile]):
         profile_id = self._get_resource_id(profile)
         self.client.session.delete(f'{self.client.API_URL}/profiles/{profile_id}')
 
+    def iter_list(self,
+                  resource_filter: Filter = Filter(),
+                  ordering=Ordering.NAME,
+                  reverse=False,
+                  fields: Optional[Sequence[str]] = None) -> Iterator[Profile]:
+        """
+        https://developer.apple.com/documentation/appstoreconnectapi/list_and_download_profiles
+        """
+        params = {
+            'sort': ordering.as_param(reverse),
+            **resource_filter.as_query_params(),
+            **self._get_fields_params(ResourceType.PROFILES, fields),
+        }
+        for profile in self.client.iter_paginate(f'{self.client.API_URL}/profiles', params=params):
+            yield self.with_content_loader(Profile(profile))
+
     def list(self,
              resource_filter: Filter = Filter(),
              ordering=Ordering.NAME,
-             reverse=False) -> List[Profile]:
+             reverse=False,
+             fields: Optional[Sequence[str]] = None) -> List[Profile]:
         """
         https://developer.apple.com/documentation/appstoreconnectapi/list_and_download_profiles
         """
-        params = {'sort': ordering.as_param(reverse), **resource_filter.as_query_params()}
-        profiles = self.client.paginate(f'{self.client.API_URL}/profiles', params=params)
-        return [Profile(profile) for profile in profiles]
+        return list(self.iter_list(resource_filter, ordering, reverse, fields))
 
-    def read(self, profile: Union[LinkedResourceData, ResourceId]) -> Profile:
+    def read(self,
+             profile: Union[LinkedResourceData, ResourceId],
+             fields: Optional[Sequence[str]] = None) -> Profile:
         """
         https://developer.apple.com/documentation/appstoreconnectapi/read_and_download_profile_information
         """
         profile_id = self._get_resource_id(profile)
-        response = self.client.session.get(f'{self.client.API_URL}/profiles/{profile_id}').json()
-        return Profile(response['data'])
+        params = self._get_fields_params(ResourceType.PROFILES, fields)
+        response = self.client.session.get(f'{self.client.API_URL}/profiles/{profile_id}', params=params).json()
+        return self.with_content_loader(Profile(response['data']))
+
+    def read_many(self,
+                  profiles: Sequence[Union[LinkedResourceData, ResourceId]],
+                  fields: Optional[Sequence[str]] = None) -> List[Profile]:
+        """
+        Read multiple profiles using as few list requests as possible
+        https://developer.apple.com/documentation/appstoreconnectapi/list_and_download_profiles
+        """
+        return self._read_many(profiles, lambda ids: self.iter_list(self.Filter(id=ids), fields=fields))
+
+    def read_content(self, profile: Union[LinkedResourceData, ResourceId]) -> str:
+        """
+        Read only base64 encoded content of the profile
+        https://developer.apple.com/documentation/appstoreconnectapi/read_and_download_profile_information
+        """
+        profile_content = self.read(profile, fields=('profileContent',)).attributes.profileContent
+        if profile_content is None:
+            raise ValueError(f'Content is missing from profile {self._get_resource_id(profile)}')
+        return profile_content
+
+    def with_content_loader(self, profile: Profile) -> Profile:
+        """
+        Let profiles that were fetched without content to download it on demand
+        """
+        if not profile.has_content:
+            profile.set_content_loader(self.read_content)
+        return profile
 
     def read_bundle_id(self, profile: Union[Profile, ResourceId]) -> BundleId:
         """
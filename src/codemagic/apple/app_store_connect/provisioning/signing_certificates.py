@@ -1,6 +1,8 @@
 from dataclasses import dataclass
+from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import Sequence
 from typing import Type
 from typing import Union
 
@@ -24,6 +26,7 @@ class SigningCertificates(ResourceManager[SigningCertificate]):
 
     @dataclass
     class Filter(ResourceManager.Filter):
+        id: Optional[Union[str, ResourceId]] = None
         serial_number: Optional[str] = None
         certificate_type: Optional[CertificateType] = None
         display_name: Optional[str] = None
@@ -48,25 +51,52 @@ class SigningCertificates(ResourceManager[SigningCertificate]):
         ).json()
         return SigningCertificate(response['data'], created=True)
 
+    def iter_list(self,
+                  resource_filter: Filter = Filter(),
+                  ordering=Ordering.DISPLAY_NAME,
+                  reverse=False,
+                  fields: Optional[Sequence[str]] = None) -> Iterator[SigningCertificate]:
+        """
+        https://developer.apple.com/documentation/appstoreconnectapi/list_and_download_certificates
+        """
+        params = {
+            'sort': ordering.as_param(reverse),
+            **resource_filter.as_query_params(),
+            **self._get_fields_params(ResourceType.CERTIFICATES, fields),
+        }
+        for certificate in self.client.iter_paginate(f'{self.client.API_URL}/certificates', params=params):
+            yield SigningCertificate(certificate)
+
     def list(self,
              resource_filter: Filter = Filter(),
              ordering=Ordering.DISPLAY_NAME,
-             reverse=False) -> List[SigningCertificate]:
+             reverse=False,
+             fields: Optional[Sequence[str]] = None) -> List[SigningCertificate]:
         """
         https://developer.apple.com/documentation/appstoreconnectapi/list_and_download_certificates
         """
-        params = {'sort': ordering.as_param(reverse), **resource_filter.as_query_params()}
-        certificates = self.client.paginate(f'{self.client.API_URL}/certificates', params=params)
-        return [SigningCertificate(certificate) for certificate in certificates]
+        return list(self.iter_list(resource_filter, ordering, reverse, fields))
 
-    def read(self, certificate: Union[LinkedResourceData, ResourceId]) -> SigningCertificate:
+    def read(self,
+             certificate: Union[LinkedResourceData, ResourceId],
+             fields: Optional[Sequence[str]] = None) -> SigningCertificate:
         """
         https://developer.apple.com/documentation/appstoreconnectapi/read_and_download_certificate_information
         """
         certificate_id = self._get_resource_id(certificate)
-        response = self.client.session.get(f'{self.client.API_URL}/certificates/{certificate_id}').json()
+        params = self._get_fields_params(ResourceType.CERTIFICATES, fields)
+        response = self.client.session.get(f'{self.client.API_URL}/certificates/{certificate_id}', params=params).json()
         return SigningCertificate(response['data'])
 
+    def read_many(self,
+                  certificates: Sequence[Union[LinkedResourceData, ResourceId]],
+                  fields: Optional[Sequence[str]] = None) -> List[SigningCertificate]:
+        """
+        Read multiple certificates using as few list requests as possible
+        https://developer.apple.com/documentation/appstoreconnectapi/list_and_download_certificates
+        """
+        return self._read_many(certificates, lambda ids: self.iter_list(self.Filter(id=ids), fields=fields))
+
     def delete(self, certificate: Union[LinkedResourceData, ResourceId]) -> None:
         """
         https://developer.apple.com/documentation/appstoreconnectapi/revoke_a_certificate
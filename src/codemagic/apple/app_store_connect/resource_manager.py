@@ -1,13 +1,19 @@
 from __future__ import annotations
 
 import abc
+import dataclasses
 import enum
 import re
 import shlex
+from typing import Callable
 from typing import Dict
 from typing import Generic
+from typing import Iterable
+from typing import List
 from typing import Optional
+from typing import Sequence
 from typing import TYPE_CHECKING
+from typing import Tuple
 from typing import Type
 from typing import TypeVar
 from typing import Union
@@ -21,9 +27,15 @@ if TYPE_CHECKING:
     from codemagic.apple import AppStoreConnectApiClient
 
 R = TypeVar('R', bound=Resource)
+F = TypeVar('F', bound='ResourceManager.Filter')
 
 
 class ResourceManager(Generic[R], metaclass=abc.ABCMeta):
+    # Limits for resource identifiers that are requested at once using `filter[id]` so that
+    # the results fit into one page and request URLs stay well within common length limits
+    READ_MANY_BATCH_SIZE = 100
+    READ_MANY_MAX_FILTER_LENGTH = 1800
+
     class Filter:
         @classmethod
         def _snake_to_camel(cls, field_name: str) -> str:
@@ -96,6 +108,44 @@ class ResourceManager(Generic[R], metaclass=abc.ABCMeta):
             data['relationships'] = relationships
         return {'data': data}
 
+    @classmethod
+    def _get_fields_params(cls,
+                           resource_type: ResourceType,
+                           fields: Optional[Sequence[str]]) -> Dict[str, str]:
+        """
+        Query parameters for sparse fieldsets that limit the attributes and
+        relationships included in the response to the given fields.
+        """
+        if fields is None:
+            return {}
+        return {f'fields[{resource_type.value}]': ','.join(fields)}
+
+    @classmethod
+    def _plan_filter(cls,
+                     resource_filter: Optional[F],
+                     supported_fields: Sequence[str],
+                     inexact_fields: Sequence[str] = ()) -> Tuple[Dict[str, str], Optional[F]]:
+        """
+        Split the filter between the API and the client. Restrictions on the fields
+        that the endpoint supports are returned as `filter[...]` query parameters and
+        the rest of the restrictions remain in a filter that has to be matched locally.
+        Restrictions on inexact fields are sent to the API, but are matched locally too.
+        """
+        if not resource_filter:
+            return {}, None
+        pushed_down = [
+            field_name for field_name, value in resource_filter.__dict__.items()
+            if value is not None and field_name in supported_fields
+        ]
+        query_params = {
+            f'filter[{resource_filter._snake_to_camel(field_name)}]': resource_filter._get_param_value(value)
+            for field_name, value in resource_filter.__dict__.items()
+            if field_name in pushed_down
+        }
+        exact_fields = {field_name: None for field_name in pushed_down if field_name not in inexact_fields}
+        local_filter = dataclasses.replace(resource_filter, **exact_fields)  # type: ignore
+        return query_params, (local_filter if local_filter else None)
+
     @classmethod
     def _get_resource_id(cls, resource: Union[ResourceId, LinkedResourceData]) -> ResourceId:
         if isinstance(resource, LinkedResourceData):
@@ -103,6 +153,35 @@ class ResourceManager(Generic[R], metaclass=abc.ABCMeta):
         else:
             return resource
 
+    @classmethod
+    def _get_id_batches(cls, resource_ids: Sequence[ResourceId]) -> List[List[ResourceId]]:
+        batches: List[List[ResourceId]] = []
+        batch_length = 0
+        for resource_id in resource_ids:
+            # Separating commas are percent encoded in the URL
+            id_length = len(resource_id) + 3
+            if not batches or len(batches[-1]) >= cls.READ_MANY_BATCH_SIZE \
+                    or batch_length + id_length > cls.READ_MANY_MAX_FILTER_LENGTH:
+                batches.append([])
+                batch_length = 0
+            batches[-1].append(resource_id)
+            batch_length += id_length
+        return batches
+
+    def _read_many(self,
+                   resources: Iterable[Union[LinkedResourceData, ResourceId]],
+                   list_resources: Callable[[str], Iterable[R]]) -> List[R]:
+        """
+        Read resources with given identifiers using list requests with `filter[id]`.
+        Resources are returned in the order of given identifiers, missing resources are omitted.
+        """
+        resource_ids = list(dict.fromkeys(self._get_resource_id(resource) for resource in resources))
+        found_resources: Dict[ResourceId, R] = {}
+        for batch in self._get_id_batches(resource_ids):
+            for resource in list_resources(','.join(batch)):
+                found_resources[resource.id] = resource
+        return [found_resources[resource_id] for resource_id in resource_ids if resource_id in found_resources]
+
     @classmethod
     def _get_attribute_data(cls,
                             resource: Union[ResourceId, LinkedResourceData],
@@ -0,0 +1,412 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import pathlib
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import TYPE_CHECKING
+from typing import Tuple
+from typing import Type
+from typing import TypeVar
+
+from codemagic.apple.resources import BundleId
+from codemagic.apple.resources import Device
+from codemagic.apple.resources import Profile
+from codemagic.apple.resources import Resource
+from codemagic.apple.resources import ResourceId
+from codemagic.apple.resources import ResourceType
+from codemagic.apple.resources import SigningCertificate
+from codemagic.utilities import log
+from .resource_manager import ResourceManager
+
+if TYPE_CHECKING:
+    from .api_client import AppStoreConnectApiClient
+
+R = TypeVar('R', bound=Resource)
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS resources (
+    type TEXT NOT NULL,
+    id TEXT NOT NULL,
+    identifier TEXT,
+    name TEXT,
+    state TEXT,
+    platform TEXT,
+    kind TEXT,
+    serial_number TEXT,
+    fingerprint TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (type, id)
+);
+CREATE INDEX IF NOT EXISTS resources_identifier ON resources (type, identifier);
+CREATE INDEX IF NOT EXISTS resources_name ON resources (type, name);
+CREATE INDEX IF NOT EXISTS resources_state ON resources (type, state);
+CREATE INDEX IF NOT EXISTS resources_platform ON resources (type, platform);
+CREATE INDEX IF NOT EXISTS resources_kind ON resources (type, kind);
+CREATE INDEX IF NOT EXISTS resources_serial_number ON resources (type, serial_number);
+CREATE TABLE IF NOT EXISTS relationships (
+    type TEXT NOT NULL,
+    id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    related_id TEXT NOT NULL,
+    PRIMARY KEY (type, id, name, related_id)
+);
+CREATE INDEX IF NOT EXISTS relationships_related ON relationships (type, name, related_id);
+CREATE TABLE IF NOT EXISTS sync_state (
+    type TEXT PRIMARY KEY,
+    synced_at REAL NOT NULL
+);
+'''
+
+
+@dataclass
+class SyncResult:
+    resource_type: Type[Resource]
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+    unchanged: int = 0
+
+    def __str__(self):
+        return (
+            f'{self.resource_type.s}: {self.added} added, {self.updated} updated, '
+            f'{self.removed} removed, {self.unchanged} unchanged'
+        )
+
+
+class ResourceMirror:
+    """
+    Local SQLite copy of Apple Developer Portal resources. Resources are stored
+    together with their relationships and indexed by the attributes that are used
+    for filtering, so that listings can be answered without calling App Store Connect API.
+    Synchronization downloads in full only the resources that were added or changed
+    since the previous sync.
+    """
+
+    DEFAULT_MAX_AGE = 3600
+    # Maximum number of related resource identifiers included in the response
+    RELATIONSHIP_LIMIT = 50
+    # Number of resources that are requested at once using `filter[id]`
+    FETCH_BATCH_SIZE = 50
+
+    RESOURCE_TYPES: Dict[Type[Resource], ResourceType] = {
+        BundleId: ResourceType.BUNDLE_ID,
+        Device: ResourceType.DEVICES,
+        SigningCertificate: ResourceType.CERTIFICATES,
+        Profile: ResourceType.PROFILES,
+    }
+
+    # Attributes that are stored in indexed columns
+    INDEXED_ATTRIBUTES = {
+        'identifier': 'identifier',
+        'name': 'name',
+        'status': 'state',
+        'profileState': 'state',
+        'platform': 'platform',
+        'certificateType': 'kind',
+        'profileType': 'kind',
+        'serialNumber': 'serial_number',
+    }
+    # List endpoints of the API match also resources whose identifier or name only contains the filter value
+    INEXACT_ATTRIBUTES = ('identifier', 'name')
+
+    # Attributes whose values change whenever the resource is modified. Resources that have
+    # large attributes are first listed using only these and downloaded in full only if they changed.
+    CHANGE_MARKER_FIELDS: Dict[ResourceType, Tuple[str, ...]] = {
+        ResourceType.CERTIFICATES: ('serialNumber', 'expirationDate'),
+        ResourceType.PROFILES: ('name', 'uuid', 'profileState', 'expirationDate'),
+    }
+
+    RELATIONSHIPS: Dict[ResourceType, Tuple[str, ...]] = {
+        ResourceType.PROFILES: ('bundleId', 'certificates', 'devices'),
+    }
+
+    # Include only the identifiers of related resources
+    RELATIONSHIP_PARAMS: Dict[ResourceType, Dict[str, str]] = {
+        ResourceType.PROFILES: {
+            'include': 'bundleId,certificates,devices',
+            'fields[bundleIds]': 'identifier',
+            'fields[certificates]': 'serialNumber',
+            'fields[devices]': 'udid',
+            'limit[certificates]': str(RELATIONSHIP_LIMIT),
+            'limit[devices]': str(RELATIONSHIP_LIMIT),
+        },
+    }
+
+    def __init__(self, path: pathlib.Path, max_age: int = DEFAULT_MAX_AGE):
+        """
+        :param path: SQLite database file where the resources are stored
+        :param max_age: Number of seconds after the last sync during which the mirror is used for listings
+        """
+        self.path = path.expanduser()
+        self.max_age = max_age
+        self._logger = log.get_file_logger(self.__class__)
+
+    @classmethod
+    def _get_resource_type(cls, resource_class: Type[Resource]) -> ResourceType:
+        try:
+            return cls.RESOURCE_TYPES[resource_class]
+        except KeyError:
+            raise ValueError(f'{resource_class.s} are not mirrored')
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(self.path), timeout=30)
+        try:
+            with connection:
+                connection.executescript(_SCHEMA)
+                yield connection
+        finally:
+            connection.close()
+
+    def get_synced_at(self, resource_class: Type[Resource]) -> Optional[float]:
+        resource_type = self._get_resource_type(resource_class)
+        with self._connect() as connection:
+            row = connection.execute(
+                'SELECT synced_at FROM sync_state WHERE type = ?', (resource_type.value,)).fetchone()
+        return row[0] if row else None
+
+    def is_fresh(self, resource_class: Type[Resource]) -> bool:
+        try:
+            synced_at = self.get_synced_at(resource_class)
+        except sqlite3.Error:
+            self._logger.exception(f'Failed to read resource mirror {self.path}')
+            return False
+        return synced_at is not None and time.time() - synced_at < self.max_age
+
+    def invalidate(self, resource_class: Type[Resource]):
+        """
+        Mark mirrored resources of given type outdated until the next sync
+        """
+        resource_type = self._get_resource_type(resource_class)
+        with self._connect() as connection:
+            connection.execute('DELETE FROM sync_state WHERE type = ?', (resource_type.value,))
+
+    @classmethod
+    def _matches(cls, resource: Dict, restrictions: Dict[str, str]) -> bool:
+        attributes = resource.get('attributes', {})
+        return all(attributes.get(name) == value for name, value in restrictions.items())
+
+    def _query(self,
+               resource_class: Type[R],
+               resource_filter: Optional[ResourceManager.Filter],
+               join: str = '',
+               join_params: Sequence[str] = tuple(),
+               inexact_attributes: Sequence[str] = tuple()) -> List[R]:
+        resource_type = self._get_resource_type(resource_class)
+        restrictions = resource_filter._get_restrictions() if resource_filter else {}
+        conditions = ['resources.type = ?']
+        params = [*join_params, resource_type.value]
+        for name in list(restrictions.keys()):
+            if name == 'id':
+                column = 'id'
+            elif name in self.INDEXED_ATTRIBUTES:
+                column = self.INDEXED_ATTRIBUTES[name]
+            else:
+                # Attributes without dedicated columns are compared after the rows are loaded
+                continue
+            if name in inexact_attributes:
+                conditions.append(f'instr(resources.{column}, ?) > 0')
+            else:
+                conditions.append(f'resources.{column} = ?')
+            params.append(restrictions.pop(name))
+
+        query = f'SELECT resources.data FROM resources {join} WHERE {" AND ".join(conditions)} ORDER BY resources.id'
+        with self._connect() as connection:
+            rows = connection.execute(query, params).fetchall()
+        resources = (json.loads(data) for data, in rows)
+        return [resource_class(resource) for resource in resources if self._matches(resource, restrictions)]
+
+    def list(self, resource_class: Type[R], resource_filter: Optional[ResourceManager.Filter] = None) -> List[R]:
+        """
+        List resources the same way as the list endpoints of the API do, identifiers
+        and names that contain the filter value are matched as well.
+        """
+        return self._query(resource_class, resource_filter, inexact_attributes=self.INEXACT_ATTRIBUTES)
+
+    def list_related(self,
+                     resource_class: Type[R],
+                     relationship: str,
+                     related_id: ResourceId,
+                     resource_filter: Optional[ResourceManager.Filter] = None) -> List[R]:
+        """
+        List resources of given type whose relationship refers to the given resource,
+        for example profiles that belong to a Bundle ID. Related resources are not filtered
+        by the API and filter values are matched exactly, as when listing them from the API.
+        """
+        join = (
+            'JOIN relationships ON relationships.type = resources.type AND relationships.id = resources.id '
+            'AND relationships.name = ? AND relationships.related_id = ?'
+        )
+        return self._query(resource_class, resource_filter, join, (relationship, related_id))
+
+    def get_related_ids(self,
+                        resource_class: Type[Resource],
+                        resource_id: ResourceId,
+                        relationship: str) -> List[ResourceId]:
+        resource_type = self._get_resource_type(resource_class)
+        with self._connect() as connection:
+            rows = connection.execute(
+                'SELECT related_id FROM relationships WHERE type = ? AND id = ? AND name = ? ORDER BY related_id',
+                (resource_type.value, resource_id, relationship),
+            ).fetchall()
+        return [ResourceId(related_id) for related_id, in rows]
+
+    @classmethod
+    def _get_fingerprint(cls, resource_type: ResourceType, resource: Dict) -> str:
+        attributes = resource.get('attributes', {})
+        fields = cls.CHANGE_MARKER_FIELDS.get(resource_type)
+        if fields is not None:
+            attributes = {name: attributes.get(name) for name in fields}
+        return json.dumps(attributes, sort_keys=True)
+
+    def _get_relationship_ids(self,
+                              api_client: AppStoreConnectApiClient,
+                              resource_type: ResourceType,
+                              resource: Dict,
+                              relationship: str) -> List[str]:
+        data = resource.get('relationships', {}).get(relationship, {}).get('data')
+        if isinstance(data, dict):
+            return [data['id']]
+        if data is None or len(data) >= self.RELATIONSHIP_LIMIT:
+            # Included relationship data is truncated, list all the related resource identifiers
+            url = f'{api_client.API_URL}/{resource_type.value}/{resource["id"]}/relationships/{relationship}'
+            data = api_client.paginate(url)
+        return [related['id'] for related in data]
+
+    def _with_relationships(self,
+                            api_client: AppStoreConnectApiClient,
+                            resource_type: ResourceType,
+                            resource: Dict) -> Tuple[Dict, Dict[str, List[str]]]:
+        relationships = {
+            relationship: self._get_relationship_ids(api_client, resource_type, resource, relationship)
+            for relationship in self.RELATIONSHIPS.get(resource_type, tuple())
+        }
+        return resource, relationships
+
+    def _fetch(self,
+               api_client: AppStoreConnectApiClient,
+               resource_type: ResourceType,
+               resource_ids: Optional[Sequence[str]] = None) -> List[Tuple[Dict, Dict[str, List[str]]]]:
+        """
+        Download resources in full together with their relationships. If resource
+        identifiers are not given, then all the resources of given type are downloaded.
+        """
+        url = f'{api_client.API_URL}/{resource_type.value}'
+        params = dict(self.RELATIONSHIP_PARAMS.get(resource_type, {}))
+        if resource_ids is None:
+            resources = api_client.paginate(url, params=params, page_size=200)
+        else:
+            batches = [
+                resource_ids[i:i + self.FETCH_BATCH_SIZE]
+                for i in range(0, len(resource_ids), self.FETCH_BATCH_SIZE)
+            ]
+            resources = [
+                resource
+                for batch_resources in self._map(
+                    lambda batch: api_client.paginate(
+                        url, params={**params, 'filter[id]': ','.join(batch)}, page_size=len(batch)),
+                    batches,
+                    api_client.max_concurrent_requests)
+                for resource in batch_resources
+            ]
+        return self._map(
+            lambda resource: self._with_relationships(api_client, resource_type, resource),
+            resources,
+            api_client.max_concurrent_requests)
+
+    @classmethod
+    def _map(cls, func, items: Sequence, max_workers: int) -> List:
+        if len(items) < 2:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+            return list(executor.map(func, items))
+
+    def _get_row(self, resource_type: ResourceType, resource: Dict) -> Tuple:
+        attributes = resource.get('attributes', {})
+        columns = {column: None for column in self.INDEXED_ATTRIBUTES.values()}
+        for name, column in self.INDEXED_ATTRIBUTES.items():
+            if attributes.get(name) is not None:
+                columns[column] = attributes[name]
+        return (
+            resource_type.value,
+            resource['id'],
+            columns['identifier'],
+            columns['name'],
+            columns['state'],
+            columns['platform'],
+            columns['kind'],
+            columns['serial_number'],
+            self._get_fingerprint(resource_type, resource),
+            json.dumps(resource),
+        )
+
+    def sync(self, api_client: AppStoreConnectApiClient, resource_class: Type[Resource]) -> SyncResult:
+        """
+        Update mirrored resources of given type to match the Developer Portal
+        """
+        resource_type = self._get_resource_type(resource_class)
+        result = SyncResult(resource_class)
+        started_at = time.time()
+
+        with self._connect() as connection:
+            stored_fingerprints = dict(connection.execute(
+                'SELECT id, fingerprint FROM resources WHERE type = ?', (resource_type.value,)).fetchall())
+
+        change_marker_fields = self.CHANGE_MARKER_FIELDS.get(resource_type)
+        if not stored_fingerprints or change_marker_fields is None:
+            fetched = self._fetch(api_client, resource_type)
+            current_ids = {resource['id'] for resource, _ in fetched}
+            fetched = [
+                (resource, relationships) for resource, relationships in fetched
+                if stored_fingerprints.get(resource['id']) != self._get_fingerprint(resource_type, resource)
+            ]
+        else:
+            url = f'{api_client.API_URL}/{resource_type.value}'
+            params = ResourceManager._get_fields_params(resource_type, change_marker_fields)
+            listed = api_client.paginate(url, params=params, page_size=200)
+            current_ids = {resource['id'] for resource in listed}
+            changed_ids = [
+                resource['id'] for resource in listed
+                if stored_fingerprints.get(resource['id']) != self._get_fingerprint(resource_type, resource)
+            ]
+            fetched = self._fetch(api_client, resource_type, changed_ids) if changed_ids else []
+
+        removed_ids = [resource_id for resource_id in stored_fingerprints if resource_id not in current_ids]
+        result.removed = len(removed_ids)
+        result.updated = sum(1 for resource, _ in fetched if resource['id'] in stored_fingerprints)
+        result.added = len(fetched) - result.updated
+        result.unchanged = len(current_ids) - len(fetched)
+
+        with self._connect() as connection:
+            for resource_id in removed_ids + [resource['id'] for resource, _ in fetched]:
+                connection.execute(
+                    'DELETE FROM relationships WHERE type = ? AND id = ?', (resource_type.value, resource_id))
+            connection.executemany(
+                'DELETE FROM resources WHERE type = ? AND id = ?',
+                [(resource_type.value, resource_id) for resource_id in removed_ids])
+            connection.executemany(
+                'INSERT OR REPLACE INTO resources VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [self._get_row(resource_type, resource) for resource, _ in fetched])
+            connection.executemany(
+                'INSERT OR IGNORE INTO relationships VALUES (?, ?, ?, ?)',
+                [
+                    (resource_type.value, resource['id'], relationship, related_id)
+                    for resource, relationships in fetched
+                    for relationship, related_ids in relationships.items()
+                    for related_id in related_ids
+                ])
+            connection.execute(
+                'INSERT OR REPLACE INTO sync_state VALUES (?, ?)', (resource_type.value, started_at))
+
+        self._logger.debug(f'Synced mirror {self.path}: {result}')
+        return result
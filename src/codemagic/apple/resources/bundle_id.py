@@ -12,6 +12,8 @@ class BundleId(Resource):
     https://developer.apple.com/documentation/appstoreconnectapi/bundleid
     """
 
+    __slots__ = ()
+
     @dataclass
     class Attributes(Resource.Attributes):
         identifier: str
@@ -49,6 +49,8 @@ class BundleIdCapability(Resource):
     https://developer.apple.com/documentation/appstoreconnectapi/bundleidcapability
     """
 
+    __slots__ = ()
+
     @dataclass
     class Attributes(Resource.Attributes):
         capabilityType: CapabilityType
@@ -4,6 +4,8 @@ from base64 import b64decode
 from dataclasses import dataclass
 from dataclasses import field
 from datetime import datetime
+from typing import Callable
+from typing import Dict
 from typing import Optional
 
 from .bundle_id import BundleIdPlatform
@@ -18,6 +20,8 @@ class Profile(Resource):
     https://developer.apple.com/documentation/appstoreconnectapi/profile
     """
 
+    __slots__ = ('_content_loader',)
+
     @dataclass
     class Attributes(Resource.Attributes):
         name: str
@@ -27,7 +31,7 @@ class Profile(Resource):
         profileState: ProfileState
         profileType: ProfileType
         expirationDate: datetime
-        profileContent: str = field(metadata={'hide': True})
+        profileContent: Optional[str] = field(metadata={'hide': True})
 
         def __post_init__(self):
             if isinstance(self.platform, str):
@@ -47,9 +51,34 @@ class Profile(Resource):
         devices: Relationship
         bundleId: Relationship
 
+    def __init__(self, api_response: Dict, created: bool = False):
+        super().__init__(api_response, created)
+        self._content_loader: Optional[Callable[[Profile], str]] = None
+
     def get_display_info(self) -> str:
         return f'{self.attributes.profileType} profile {self.attributes.uuid}'
 
+    def set_content_loader(self, content_loader: Callable[[Profile], str]):
+        """
+        Set function that is used to fetch profile content in case it was
+        not included in the API response due to sparse fieldsets
+        """
+        self._content_loader = content_loader
+
+    @property
+    def has_content(self) -> bool:
+        """
+        Check whether profile content was included in the API response
+        without decoding the attributes
+        """
+        if self._attributes is not None:
+            return self.attributes.profileContent is not None
+        return self._raw.get('attributes', {}).get('profileContent') is not None
+
     @property
     def profile_content(self) -> bytes:
+        if self.attributes.profileContent is None and self._content_loader is not None:
+            self.attributes.profileContent = self._content_loader(self)
+        if self.attributes.profileContent is None:
+            raise ValueError(f'Content of {self.get_display_info()} is not available')
         return b64decode(self.attributes.profileContent)
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import dataclasses
 import enum
 import re
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 from typing import Dict
+from typing import Iterator
 from typing import List
 from typing import Optional
 from typing import Tuple
@@ -22,6 +24,8 @@ class ResourceId(str):
 
 
 class DictSerializable:
+    __slots__: Tuple[str, ...] = ()
+
     _OMIT_KEYS: Tuple[str, ...] = ('_raw',)
     _OMIT_IF_NONE_KEYS: Tuple[str, ...] = tuple()
 
@@ -47,8 +51,11 @@ class DictSerializable:
             return True
         return False
 
+    def _get_fields(self) -> Iterator[Tuple[str, Any]]:
+        yield from self.__dict__.items()
+
     def dict(self) -> Dict:
-        return {k: self._serialize(v) for k, v in self.__dict__.items() if not self._should_omit(k, v)}
+        return {k: self._serialize(v) for k, v in self._get_fields() if not self._should_omit(k, v)}
 
 
 @dataclass
@@ -117,12 +124,17 @@ class Relationship(DictSerializable):
 
 
 class LinkedResourceData(DictSerializable, JsonSerializable):
+    __slots__ = ('_raw', 'type', 'id')
 
     def __init__(self, api_response: Dict):
         self._raw = api_response
         self.type = ResourceType(api_response['type'])
         self.id: ResourceId = ResourceId(api_response['id'])
 
+    def _get_fields(self) -> Iterator[Tuple[str, Any]]:
+        yield 'type', self.type
+        yield 'id', self.id
+
     def __str__(self):
         return '\n'.join([
             f'Id: {self.id}',
@@ -152,6 +164,13 @@ class PrettyNameMeta(JsonSerializableMeta):
 
 
 class Resource(LinkedResourceData, metaclass=PrettyNameMeta):
+    """
+    Model of App Store Connect API resource that keeps the raw API response and decodes
+    attributes and relationships from it only when they are accessed for the first time.
+    """
+
+    __slots__ = ('_created', '_links', '_attributes', '_relationships')
+
     @dataclass
     class Attributes(DictSerializable):
         def __init__(self, *args, **kwargs):
@@ -165,24 +184,67 @@ class Resource(LinkedResourceData, metaclass=PrettyNameMeta):
         def __post_init__(self):
             for field in self.__dict__:
                 value = getattr(self, field)
-                if not isinstance(value, Relationship):
+                if value is not None and not isinstance(value, Relationship):
                     setattr(self, field, Relationship(**value))
 
+    @classmethod
+    def _with_missing_fields(cls, dataclass_type, values: Dict) -> Dict:
+        """
+        Responses to requests with sparse fieldsets omit the fields that were not
+        asked for. Use None for such fields that do not have a default value.
+        """
+        missing_fields = {
+            field.name: None
+            for field in dataclasses.fields(dataclass_type)
+            if field.name not in values
+            and field.default is dataclasses.MISSING
+            and field.default_factory is dataclasses.MISSING  # type: ignore
+        }
+        return {**missing_fields, **values}
+
     @classmethod
     def _create_attributes(cls, api_response):
-        return cls.Attributes(**api_response['attributes'])
+        attributes = api_response.get('attributes', {})
+        return cls.Attributes(**cls._with_missing_fields(cls.Attributes, attributes))
 
     @classmethod
     def _create_relationships(cls, api_response):
-        return cls.Relationships(**api_response['relationships'])
+        relationships = api_response['relationships']
+        return cls.Relationships(**cls._with_missing_fields(cls.Relationships, relationships))
 
     def __init__(self, api_response: Dict, created: bool = False):
         super().__init__(api_response)
         self._created = created
-        self.links: ResourceLinks = ResourceLinks(**api_response['links'])
-        self.attributes = self._create_attributes(api_response)
-        if 'relationships' in api_response:
-            self.relationships = self._create_relationships(api_response)
+        self._links: Optional[ResourceLinks] = None
+        self._attributes: Optional[Resource.Attributes] = None
+        self._relationships: Optional[Resource.Relationships] = None
+
+    @property
+    def links(self) -> ResourceLinks:
+        if self._links is None:
+            self._links = ResourceLinks(**self._raw['links'])
+        return self._links
+
+    @property
+    def attributes(self):
+        if self._attributes is None:
+            self._attributes = self._create_attributes(self._raw)
+        return self._attributes
+
+    @property
+    def relationships(self):
+        if self._relationships is None:
+            if 'relationships' not in self._raw:
+                raise AttributeError(f'{self.__class__.__name__} {self.id} does not have relationships')
+            self._relationships = self._create_relationships(self._raw)
+        return self._relationships
+
+    def _get_fields(self) -> Iterator[Tuple[str, Any]]:
+        yield from super()._get_fields()
+        yield 'links', self.links
+        yield 'attributes', self.attributes
+        if 'relationships' in self._raw:
+            yield 'relationships', self.relationships
 
     @property
     def created(self) -> bool:
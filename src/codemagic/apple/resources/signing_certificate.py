@@ -16,6 +16,8 @@ class SigningCertificate(Resource):
     https://developer.apple.com/documentation/appstoreconnectapi/certificate
     """
 
+    __slots__ = ()
+
     @dataclass
     class Attributes(Resource.Attributes):
         displayName: str
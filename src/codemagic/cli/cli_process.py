@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import codecs
 import fcntl
 import os
+import selectors
 import shlex
 import subprocess
 import sys
@@ -14,6 +16,7 @@ from typing import Sequence
 from typing import Union
 
 from codemagic.utilities import log
+from .cli_process_output import CliProcessOutput
 from .cli_types import CommandArg
 from .cli_types import ObfuscatedCommand
 
@@ -23,20 +26,31 @@ class CliProcess:
     def __init__(self, command_args: Sequence[CommandArg],
                  safe_form: Optional[ObfuscatedCommand] = None,
                  print_streams: bool = True,
-                 dry: bool = False):
+                 dry: bool = False,
+                 max_output_size: Optional[int] = None):
+        """
+        :param max_output_size: Number of characters from the end of stdout and stderr that are kept
+                                in memory. Full output is spilled to temporary files and is available
+                                from stdout_output and stderr_output. By default all output is kept in memory.
+        """
         self.logger = log.get_logger(self.__class__)
         self.duration: float = 0
         self._process: Optional[subprocess.Popen] = None
         self._command_args = command_args
         self._dry_run = dry
         self._print_streams = print_streams
-        self._buffer_size = 8192
+        self._buffer_size = 65536
+        # Output that is redirected to files cannot be waited for and is checked periodically instead.
+        # Pipes are also read with a timeout to notice when the process exits.
+        self._poll_interval = 0.1
         self.safe_form = safe_form
         if safe_form is None:
             full_command = ' '.join(shlex.quote(str(arg)) for arg in command_args)
             self.safe_form = ObfuscatedCommand(full_command)
         self.stdout = ""
         self.stderr = ""
+        self.stdout_output = CliProcessOutput(max_output_size)
+        self.stderr_output = CliProcessOutput(max_output_size)
 
     @property
     def returncode(self) -> int:
@@ -63,24 +77,81 @@ class CliProcess:
             current_stream_flags = fcntl.fcntl(stream_descriptor, fcntl.F_GETFL)
             fcntl.fcntl(stream_descriptor, fcntl.F_SETFL, current_stream_flags | os.O_NONBLOCK)
 
-    def _handle_stream(self, input_stream: IO, output_stream: IO, buffer_size: Optional[int] = None) -> str:
-        if buffer_size:
-            bytes_chunk = input_stream.read(buffer_size)
-        else:
-            bytes_chunk = input_stream.read()
-
-        chunk = '' if bytes_chunk is None else bytes_chunk.decode()
+    def _handle_chunk(self, chunk: str, output: CliProcessOutput, output_stream: IO):
+        if not chunk:
+            return
+        output.write(chunk)
         if self._print_streams:
             output_stream.write(chunk)
-        return chunk
 
     def _handle_streams(self, buffer_size: Optional[int] = None):
-        if self._process is None:
-            return
-        if self._process.stdout:
-            self.stdout += self._handle_stream(self._process.stdout, sys.stdout, buffer_size)
-        if self._process.stderr:
-            self.stderr += self._handle_stream(self._process.stderr, sys.stderr, buffer_size)
+        """
+        Hook to follow the output that is not read from the pipes of the process, such as
+        output that is redirected to files. It is called periodically while the process is
+        running and once after it has completed. Does nothing by default, overridden by
+        XcodebuildCliProcess to follow xcodebuild log file.
+        """
+        pass
+
+    def _close_pipe(self, selector: selectors.BaseSelector, key: selectors.SelectorKey):
+        pipe, decoder, output, output_stream = key.data
+        selector.unregister(pipe)
+        pipe.close()
+        self._handle_chunk(decoder.decode(b'', final=True), output, output_stream)
+
+    def _read_pipe(self, selector: selectors.BaseSelector, key: selectors.SelectorKey) -> bool:
+        """
+        Read available output from the pipe. Return False if there was nothing to read.
+        """
+        _pipe, decoder, output, output_stream = key.data
+        try:
+            data = os.read(key.fd, self._buffer_size)
+        except BlockingIOError:
+            return False
+        if not data:
+            self._close_pipe(selector, key)
+            return False
+        self._handle_chunk(decoder.decode(data), output, output_stream)
+        return True
+
+    def _read_pipes(self):
+        assert self._process is not None
+        pipes = (
+            (self._process.stdout, self.stdout_output, sys.stdout),
+            (self._process.stderr, self.stderr_output, sys.stderr),
+        )
+        with selectors.DefaultSelector() as selector:
+            for pipe, output, output_stream in pipes:
+                if pipe is None:
+                    continue
+                # Multi-byte characters can be split between the chunks
+                decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+                selector.register(pipe, selectors.EVENT_READ, (pipe, decoder, output, output_stream))
+            while selector.get_map():
+                for key, _events in selector.select(timeout=self._poll_interval):
+                    self._read_pipe(selector, key)
+                if self._process.poll() is not None:
+                    break
+            # Background processes started by the process can hold the pipes open after
+            # it has exited. Read only what is already written instead of waiting for EOF.
+            for key in list(selector.get_map().values()):
+                while self._read_pipe(selector, key):
+                    pass
+                # Pipe is already closed if the output ended while draining it
+                if key.fd in selector.get_map():
+                    self._close_pipe(selector, key)
+
+    def _wait_for_process(self):
+        assert self._process is not None
+        if self._process.stdout or self._process.stderr:
+            self._ensure_process_streams_are_non_blocking()
+            self._read_pipes()
+            self._process.wait()
+        else:
+            while self._process.poll() is None:
+                self._handle_streams(self._buffer_size)
+                time.sleep(self._poll_interval)
+        self._handle_streams()
 
     def execute(self,
                 stdout: Union[int, IO] = subprocess.PIPE,
@@ -90,13 +161,11 @@ class CliProcess:
         try:
             if not self._dry_run:
                 self._process = subprocess.Popen(self._command_args, stdout=stdout, stderr=stderr)
-                self._ensure_process_streams_are_non_blocking()
-                while self._process.poll() is None:
-                    self._handle_streams(self._buffer_size)
-                    time.sleep(0.1)
-                self._handle_streams()
+                self._wait_for_process()
         finally:
             self.duration = time.time() - start
+            self.stdout = self.stdout_output.tail
+            self.stderr = self.stderr_output.tail
             self._log_exec_completed()
         return self
 
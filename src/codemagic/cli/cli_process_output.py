@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import io
+import pathlib
+import tempfile
+from collections import deque
+from typing import IO
+from typing import Deque
+from typing import Optional
+
+
+class CliProcessOutput:
+    """
+    Captured output stream of a process. By default all the output is kept in memory.
+    When maximum memory size is given, only the tail of the output is kept in memory
+    and the full output is spilled to a temporary file, unless the process already
+    writes it to a file. The full output can then be read lazily from the stream.
+    """
+
+    def __init__(self, max_memory_size: Optional[int] = None, output_path: Optional[pathlib.Path] = None):
+        """
+        :param max_memory_size: Number of characters from the end of the output that are kept in memory.
+                                By default the whole output is kept in memory.
+        :param output_path: File where the full output is written to by the process
+        """
+        self.max_memory_size = max_memory_size
+        self.output_path = output_path
+        self.size = 0
+        self._chunks: Deque[str] = deque()
+        self._memory_size = 0
+        self._spill_file: Optional[IO[str]] = None
+
+    @property
+    def is_truncated(self) -> bool:
+        return self._memory_size < self.size
+
+    @property
+    def tail(self) -> str:
+        return ''.join(self._chunks)
+
+    def _spill(self):
+        self._spill_file = tempfile.NamedTemporaryFile(
+            'w+', encoding='utf-8', prefix='cli_process_', suffix='.log')
+        self._spill_file.writelines(self._chunks)
+
+    def _trim(self, max_memory_size: int):
+        while self._memory_size > max_memory_size:
+            excess = self._memory_size - max_memory_size
+            first_chunk = self._chunks[0]
+            if len(first_chunk) <= excess:
+                self._chunks.popleft()
+                self._memory_size -= len(first_chunk)
+            else:
+                self._chunks[0] = first_chunk[excess:]
+                self._memory_size -= excess
+
+    def write(self, chunk: str):
+        if not chunk:
+            return
+        self.size += len(chunk)
+        if self._spill_file is not None:
+            self._spill_file.write(chunk)
+        self._chunks.append(chunk)
+        self._memory_size += len(chunk)
+        if self.max_memory_size is None or self._memory_size <= self.max_memory_size:
+            return
+        if self._spill_file is None and self.output_path is None:
+            self._spill()
+        self._trim(self.max_memory_size)
+
+    def open(self) -> IO[str]:
+        """
+        Open the full output for reading
+        """
+        if self._spill_file is not None:
+            self._spill_file.flush()
+            return open(self._spill_file.name, encoding='utf-8')
+        elif self.is_truncated and self.output_path is not None:
+            return self.output_path.open('r', errors='replace')
+        return io.StringIO(self.tail)
+
+    def getvalue(self) -> str:
+        with self.open() as stream:
+            return stream.read()
+
+    def close(self):
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+        self._chunks.clear()
+        self._memory_size = 0
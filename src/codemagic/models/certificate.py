@@ -137,9 +137,21 @@ class Certificate(JsonSerializable, RunningCliAppMixin, StringConverterMixin):
         exporter = P12Exporter(self, private_key, container_password)
         return exporter.export(export_path)
 
+    @property
+    def public_key_fingerprint(self) -> str:
+        return PrivateKey.get_public_key_fingerprint(self.x509.to_cryptography().public_key())
+
+    @classmethod
+    def get_public_key_fingerprint_from_asn1(cls, asn1: AnyStr) -> str:
+        """
+        Get public key fingerprint of the certificate without loading it
+        into OpenSSL X509 object, which is considerably slower
+        """
+        try:
+            certificate = x509.load_der_x509_certificate(cls._bytes(asn1), default_backend())
+        except ValueError as error:
+            raise ValueError('Not a valid ASN1 certificate content') from error
+        return PrivateKey.get_public_key_fingerprint(certificate.public_key())
+
     def is_signed_with(self, private_key: PrivateKey) -> bool:
-        certificate_public_key = self.x509.to_cryptography().public_key()
-        rsa_key_public_key = private_key.public_key
-        certificate_public_numbers = certificate_public_key.public_numbers()
-        rsa_key_public_numbers = rsa_key_public_key.public_numbers()
-        return certificate_public_numbers == rsa_key_public_numbers
+        return self.public_key_fingerprint == private_key.public_key_fingerprint
@@ -1,40 +1,32 @@
 from __future__ import annotations
 
-import os
 import pathlib
 import shutil
 import subprocess
 import tempfile
 from typing import Optional
-from typing import Sequence
 from typing import TYPE_CHECKING
-from typing import Union
 
-from codemagic.mixins import RunningCliAppMixin
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.serialization import pkcs12
+
 from codemagic.mixins import StringConverterMixin
+from codemagic.utilities import log
 
 if TYPE_CHECKING:
     from .certificate import Certificate
     from .private_key import PrivateKey
 
 
-class P12Exporter(RunningCliAppMixin, StringConverterMixin):
+class P12Exporter(StringConverterMixin):
+    # Same as used by openssl pkcs12 command for legacy 3DES encryption
+    KDF_ROUNDS = 2048
 
     def __init__(self, certificate: Certificate, private_key: PrivateKey, container_password: str):
+        self.certificate = certificate
+        self.private_key = private_key
         self.container_password = container_password
-        self._temp_pem_certificate_path = self._save_to_disk('cert', certificate.as_pem())
-        self._temp_private_key_path = self._save_to_disk('key', private_key.as_pem())
-
-    @classmethod
-    def _save_to_disk(cls, prefix: str, pem: str):
-        with tempfile.NamedTemporaryFile(mode='w', prefix=f'{prefix}_', suffix='.pem', delete=False) as tf:
-            tf.write(pem)
-            return pathlib.Path(tf.name)
-
-    def _cleanup(self):
-        for path in (self._temp_pem_certificate_path, self._temp_private_key_path):
-            if path and path.exists():
-                os.remove(str(path))
 
     @classmethod
     def _get_export_path(cls, export_path: Optional[pathlib.Path]) -> pathlib.Path:
@@ -43,62 +35,78 @@ class P12Exporter(RunningCliAppMixin, StringConverterMixin):
         with tempfile.NamedTemporaryFile(prefix='certificate', suffix='.p12', delete=False) as tf:
             return pathlib.Path(tf.name)
 
-    @classmethod
-    def _ensure_openssl(cls):
+    def _get_encryption_algorithm(self) -> serialization.KeySerializationEncryption:
+        password = self._bytes(self.container_password)
+        if not hasattr(serialization.PrivateFormat, 'PKCS12'):
+            # Before version 38 cryptography always encrypted PKCS#12 containers using 3DES
+            return serialization.BestAvailableEncryption(password)
+        # Best available encryption uses AES-256 which is not accepted by Keychain Access and `security import`
+        return (
+            serialization.PrivateFormat.PKCS12.encryption_builder()  # type: ignore
+            .kdf_rounds(self.KDF_ROUNDS)
+            .key_cert_algorithm(pkcs12.PBES.PBESv1SHA1And3KeyTripleDESCBC)  # type: ignore
+            .hmac_hash(hashes.SHA1())
+            .build(password)
+        )
+
+    def _create_pkcs12_container_without_password(self) -> bytes:
+        """
+        Cryptography cannot encrypt the container with an empty password and would leave out
+        the integrity MAC that Keychain requires. Use openssl for it instead, the private key
+        is passed to it through stdin so that it is not written to disk.
+        """
         if shutil.which('openssl') is None:
             raise IOError('OpenSSL executable not present on system')
-
-    def _run_openssl_command(self, command: Sequence[Union[str, pathlib.Path]]):
-        process = None
-        cli_app = self.get_current_cli_app()
+        with tempfile.NamedTemporaryFile(mode='w', prefix='cert_', suffix='.pem') as certificate_file:
+            certificate_file.write(self.certificate.as_pem())
+            certificate_file.flush()
+            export_args = (
+                'openssl', 'pkcs12', '-export',
+                '-in', certificate_file.name,
+                '-inkey', '/dev/stdin',
+                '-keypbe', 'PBE-SHA1-3DES',
+                '-certpbe', 'PBE-SHA1-3DES',
+                '-macalg', 'sha1',
+                '-passout', 'pass:',
+            )
+            try:
+                process = subprocess.run(
+                    export_args,
+                    input=self._bytes(self.private_key.as_pem()),
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    check=True,
+                )
+            except subprocess.CalledProcessError as cpe:
+                log.get_file_logger(self.__class__).error(
+                    'Failed to create PKCS12 container: %s', self._str(cpe.stderr))
+                raise IOError('Unable to export certificate: Failed to create PKCS12 container') from cpe
+        return process.stdout
+
+    def create_pkcs12_container(self) -> bytes:
+        """
+        Serialize the certificate and private key into PKCS#12 container in memory.
+        Container is encrypted with 3DES and protected with SHA-1 MAC. For empty container
+        password the container is created using openssl.
+        :raises: IOError
+        """
+        if self.certificate.public_key_fingerprint != self.private_key.public_key_fingerprint:
+            raise IOError('Unable to export certificate: Private key does not match the certificate')
+        if not self.container_password:
+            return self._create_pkcs12_container_without_password()
         try:
-            if cli_app:
-                process = cli_app.execute(command, [command[-1]])
-                process.raise_for_returncode()
-            else:
-                subprocess.check_output(command, stderr=subprocess.PIPE)
-        except subprocess.CalledProcessError as cpe:
-            if 'unable to load private key' in self._str(cpe.stderr):
-                error = 'Unable to export certificate: Invalid private key'
-            else:
-                error = 'Unable to export certificate: Failed to create PKCS12 container'
-            raise IOError(error, process)
-
-    def _create_pkcs12_container(self, pkcs12: pathlib.Path, password: str):
-        if not password:
-            raise ValueError('Cannot export PKCS12 container without password')
-
-        export_args = (
-            'openssl', 'pkcs12', '-export',
-            '-out', pkcs12.expanduser(),
-            '-in', self._temp_pem_certificate_path,
-            '-inkey', self._temp_private_key_path,
-            '-passout', f'pass:{password}'
-        )
-        self._run_openssl_command(export_args)
-
-    def _decrypt_pkcs12_container(self, pkcs12: pathlib.Path, password: str):
-        if not password:
-            raise ValueError('Cannot decrypt PKCS12 container without password')
-
-        decrypted_pkcs12 = pkcs12.parent / f'{pkcs12.stem}_decrypted{pkcs12.suffix}'
-        decrypt_args = (
-            'openssl', 'pkcs12', '-nodes',
-            '-passin', f'pass:{password}',
-            '-in', pkcs12,
-            '-out', decrypted_pkcs12,
-        )
-        self._run_openssl_command(decrypt_args)
-        decrypted_pkcs12.rename(pkcs12)
+            return pkcs12.serialize_key_and_certificates(
+                None,
+                self.private_key.rsa_key,
+                self.certificate.x509.to_cryptography(),
+                None,
+                self._get_encryption_algorithm(),
+            )
+        except (TypeError, ValueError) as error:
+            log.get_file_logger(self.__class__).exception('Failed to create PKCS12 container')
+            raise IOError('Unable to export certificate: Failed to create PKCS12 container') from error
 
     def export(self, export_path: Optional[pathlib.Path] = None) -> pathlib.Path:
-        self._ensure_openssl()
         p12_path = self._get_export_path(export_path)
-        password = self.container_password or 'temporary-password'
-        try:
-            self._create_pkcs12_container(p12_path, password)
-            if not self.container_password:
-                self._decrypt_pkcs12_container(p12_path, password)
-        finally:
-            self._cleanup()
+        p12_path.expanduser().write_bytes(self.create_pkcs12_container())
         return p12_path
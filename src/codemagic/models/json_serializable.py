@@ -1,6 +1,7 @@
 import json
 from abc import abstractmethod
 from typing import Dict
+from typing import Tuple
 
 _json_encoder_default = json.JSONEncoder.default
 
@@ -20,6 +21,7 @@ class JsonSerializableMeta(type):
 
 
 class JsonSerializable(metaclass=JsonSerializableMeta):
+    __slots__: Tuple[str, ...] = ()
 
     @abstractmethod
     def dict(self) -> Dict:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 from typing import AnyStr
 from typing import Optional
 
@@ -68,6 +69,21 @@ class PrivateKey(StringConverterMixin):
     def public_key(self) -> RSAPublicKey:
         return self.rsa_key.public_key()
 
+    @classmethod
+    def get_public_key_fingerprint(cls, public_key) -> str:
+        """
+        SHA-256 digest of DER encoded SubjectPublicKeyInfo of given public key
+        """
+        public_key_info = public_key.public_bytes(
+            serialization.Encoding.DER,
+            serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+        return hashlib.sha256(public_key_info).hexdigest()
+
+    @property
+    def public_key_fingerprint(self) -> str:
+        return self.get_public_key_fingerprint(self.public_key)
+
     def get_public_key(self) -> bytes:
         return self.public_key.public_bytes(
             serialization.Encoding.OpenSSH,
@@ -14,6 +14,7 @@ from typing import List
 from typing import Optional
 
 from codemagic.cli import CliProcess
+from codemagic.cli import CliProcessOutput
 from codemagic.mixins import RunningCliAppMixin
 from codemagic.utilities import log
 from codemagic.utilities.levenshtein_distance import levenshtein_distance
@@ -264,11 +265,15 @@ class Xcodebuild(RunningCliAppMixin):
 
 
 class XcodebuildCliProcess(CliProcess):
+    MAX_OUTPUT_SIZE = 2 ** 20
 
     def __init__(self, *args, xcpretty: Optional[Xcpretty] = None, **kwargs):
+        kwargs.setdefault('max_output_size', self.MAX_OUTPUT_SIZE)
         super().__init__(*args, **kwargs)
         with tempfile.NamedTemporaryFile(prefix='xcodebuild_', suffix='.log', delete=False) as tf:
             self.log_path = pathlib.Path(tf.name)
+        # Full output is available from the log file, keep only the tail of it in memory
+        self.stdout_output = CliProcessOutput(self.stdout_output.max_memory_size, output_path=self.log_path)
         self._buffer: Optional[IO] = None
         self.xcpretty = xcpretty
 
@@ -286,7 +291,7 @@ class XcodebuildCliProcess(CliProcess):
         lines = self._buffer.readlines(buffer_size or -1)
         chunk = ''.join(lines)
         self._print_stream(chunk)
-        self.stdout += chunk
+        self.stdout_output.write(chunk)
 
     def execute(self, *args, **kwargs) -> XcodebuildCliProcess:
         try:
@@ -1,9 +1,12 @@
 import pathlib
 
 from codemagic import cli
+from codemagic.apple.app_store_connect import ApiRequestLogger
+from codemagic.apple.app_store_connect import ApiResponseCache
 from codemagic.apple.app_store_connect import AppStoreConnectApiClient
 from codemagic.apple.app_store_connect import IssuerId
 from codemagic.apple.app_store_connect import KeyIdentifier
+from codemagic.apple.app_store_connect import ResourceMirror
 from codemagic.apple.resources import BundleIdPlatform
 from codemagic.apple.resources import CertificateType
 from codemagic.apple.resources import DeviceStatus
@@ -49,6 +52,55 @@ class AppStoreConnectArgument(cli.Argument):
         description='Turn on logging for App Store Connect API HTTP requests',
         argparse_kwargs={'required': False, 'action': 'store_true'},
     )
+    LOG_BODY_LIMIT = cli.ArgumentProperties(
+        key='log_body_limit',
+        flags=('--log-api-body-limit',),
+        type=int,
+        description=(
+            'Number of bytes after which logged App Store Connect API request and response bodies are truncated'
+        ),
+        argparse_kwargs={'required': False, 'default': ApiRequestLogger.DEFAULT_BODY_LIMIT},
+    )
+    LOG_SAMPLE_RATE = cli.ArgumentProperties(
+        key='log_sample_rate',
+        flags=('--log-api-sample-rate',),
+        type=float,
+        description=(
+            'Fraction of successful App Store Connect API HTTP requests that are logged, from 0 to 1. '
+            'Failed responses are always logged'
+        ),
+        argparse_kwargs={'required': False, 'default': 1.0},
+    )
+    PROFILE_REQUESTS = cli.ArgumentProperties(
+        key='profile_requests',
+        flags=('--profile-requests',),
+        type=bool,
+        description=(
+            'Record connection reuse and timings of App Store Connect API HTTP requests '
+            'and show latency histogram once the action completes'
+        ),
+        argparse_kwargs={'required': False, 'action': 'store_true'},
+    )
+    CONNECTION_POOL_SIZE = cli.ArgumentProperties(
+        key='connection_pool_size',
+        flags=('--api-connection-pool-size',),
+        type=int,
+        description=(
+            'Number of connections to App Store Connect API that are kept alive for reuse. '
+            'By default there is one for every request that can be in flight at the same time'
+        ),
+        argparse_kwargs={'required': False},
+    )
+    KEEP_ALIVE_IDLE = cli.ArgumentProperties(
+        key='keep_alive_idle',
+        flags=('--api-keep-alive-idle',),
+        type=int,
+        description=(
+            'Number of seconds after which TCP keep-alive probes are sent on idle connections '
+            'to App Store Connect API. By default keep-alive probes are not used'
+        ),
+        argparse_kwargs={'required': False},
+    )
     JSON_OUTPUT = cli.ArgumentProperties(
         key='json_output',
         flags=('--json',),
@@ -94,6 +146,103 @@ class AppStoreConnectArgument(cli.Argument):
         description='Directory where the provisioning profiles will be saved',
         argparse_kwargs={'required': False, 'default': ProvisioningProfile.DEFAULT_LOCATION},
     )
+    API_CACHE_DIRECTORY = cli.ArgumentProperties(
+        key='api_cache_directory',
+        flags=('--api-cache-dir',),
+        type=pathlib.Path,
+        description=(
+            'Directory where App Store Connect API responses are cached so that subsequent '
+            'invocations can reuse them. Responses are not cached unless the directory is specified.'
+        ),
+        argparse_kwargs={'required': False},
+    )
+    API_CACHE_TTL = cli.ArgumentProperties(
+        key='api_cache_ttl',
+        flags=('--api-cache-ttl',),
+        type=int,
+        description=(
+            'Number of seconds for which cached App Store Connect API responses are reused. '
+            f'Used together with {Colors.BRIGHT_BLUE("--api-cache-dir")} option.'
+        ),
+        argparse_kwargs={'required': False, 'default': ApiResponseCache.DEFAULT_TTL},
+    )
+
+    JWT_CACHE_PATH = cli.ArgumentProperties(
+        key='jwt_cache_path',
+        flags=('--jwt-cache',),
+        type=pathlib.Path,
+        description=(
+            'Path to the file where signed App Store Connect API tokens are cached. '
+            'If given, consecutive invocations using the same API key reuse the token '
+            'until it expires instead of signing a new one'
+        ),
+        argparse_kwargs={'required': False},
+    )
+    SHARED_RATE_LIMIT_DIRECTORY = cli.ArgumentProperties(
+        key='shared_rate_limit_directory',
+        flags=('--shared-rate-limit-dir',),
+        type=pathlib.Path,
+        description=(
+            'Directory where the state of App Store Connect API request budget is shared between '
+            'all the processes on the host that use the same API key, so that together they do not '
+            'exceed the hourly request limit. By default the budget is tracked only within the process'
+        ),
+        argparse_kwargs={'required': False},
+    )
+    RECORD_API_CALLS_PATH = cli.ArgumentProperties(
+        key='record_api_calls_path',
+        flags=('--record-api-calls',),
+        type=pathlib.Path,
+        description=(
+            'Path to the cassette file where App Store Connect API requests and responses are recorded '
+            'with secrets redacted. Recorded cassette can be replayed later using '
+            f'{Colors.BRIGHT_BLUE("--replay-api-calls")} option'
+        ),
+        argparse_kwargs={'required': False},
+    )
+    REPLAY_API_CALLS_PATH = cli.ArgumentProperties(
+        key='replay_api_calls_path',
+        flags=('--replay-api-calls',),
+        type=pathlib.Path,
+        description=(
+            'Path to the cassette file recorded with '
+            f'{Colors.BRIGHT_BLUE("--record-api-calls")} option. If given, App Store Connect API '
+            'responses are served from the cassette instead of sending the requests'
+        ),
+        argparse_kwargs={'required': False},
+    )
+    REPLAY_LATENCY = cli.ArgumentProperties(
+        key='replay_latency',
+        flags=('--replay-latency',),
+        type=float,
+        description=(
+            'Multiplier for the recorded response times that are waited before replaying the responses. '
+            f'Used together with {Colors.BRIGHT_BLUE("--replay-api-calls")} option. '
+            'By default responses are replayed immediately'
+        ),
+        argparse_kwargs={'required': False, 'default': 0.0},
+    )
+    MIRROR_PATH = cli.ArgumentProperties(
+        key='mirror_path',
+        flags=('--mirror',),
+        type=pathlib.Path,
+        description=(
+            'Path to the SQLite database that holds a local mirror of Apple Developer Portal resources. '
+            'If given, listings are answered from the mirror while it is fresh instead of calling '
+            f'App Store Connect API. Use action {Colors.BRIGHT_BLUE("sync")} to update the mirror'
+        ),
+        argparse_kwargs={'required': False},
+    )
+    MIRROR_MAX_AGE = cli.ArgumentProperties(
+        key='mirror_max_age',
+        flags=('--mirror-max-age',),
+        type=int,
+        description=(
+            'Number of seconds after the last sync during which the local mirror is used. '
+            f'Used together with {Colors.BRIGHT_BLUE("--mirror")} option.'
+        ),
+        argparse_kwargs={'required': False, 'default': ResourceMirror.DEFAULT_MAX_AGE},
+    )
 
 
 class BundleIdArgument(cli.Argument):
@@ -101,6 +250,14 @@ class BundleIdArgument(cli.Argument):
         key='bundle_id_identifier',
         description='Identifier of the Bundle ID',
     )
+    BUNDLE_ID_IDENTIFIERS = cli.ArgumentProperties(
+        key='bundle_id_identifiers',
+        description='Identifiers of the Bundle IDs',
+        argparse_kwargs={
+            'nargs': '+',
+            'metavar': 'bundle-id-identifier',
+        },
+    )
     BUNDLE_ID_IDENTIFIER_OPTIONAL = cli.ArgumentProperties(
         key='bundle_id_identifier',
         flags=('--bundle-id-identifier',),
@@ -184,6 +341,30 @@ class DeviceArgument(cli.Argument):
         }
     )
 
+    DEVICES_FILE = cli.ArgumentProperties(
+        key='devices_file',
+        flags=('--devices-file',),
+        type=pathlib.Path,
+        description=(
+            'Path to JSON or CSV file that lists the devices to be registered. JSON file must contain '
+            'a list of objects with keys "name", "udid" and optionally "platform". CSV file must have '
+            'a header row with the same columns. Device upload files from Apple Developer Portal '
+            'are accepted as well'
+        ),
+        argparse_kwargs={'required': True},
+    )
+    DEVICE_PLATFORM = cli.ArgumentProperties(
+        key='platform',
+        flags=('--platform',),
+        type=BundleIdPlatform,
+        description='Platform of the devices for which the platform is not specified in the devices file',
+        argparse_kwargs={
+            'required': False,
+            'choices': list(BundleIdPlatform),
+            'default': BundleIdPlatform.IOS,
+        },
+    )
+
 
 class CertificateArgument(cli.Argument):
     CERTIFICATE_RESOURCE_ID = cli.ArgumentProperties(
@@ -233,6 +414,13 @@ class CertificateArgument(cli.Argument):
             'choices': list(ProfileType),
         }
     )
+    PRUNE_UNUSED = cli.ArgumentProperties(
+        key='prune_unused_certificates',
+        flags=('--prune-unused-certificates',),
+        type=bool,
+        description='Also delete certificates that are not used by any of the remaining provisioning profiles',
+        argparse_kwargs={'required': False, 'action': 'store_true'},
+    )
     DISPLAY_NAME = cli.ArgumentProperties(
         key='display_name',
         flags=('--display-name',),
@@ -279,6 +467,17 @@ class ProfileArgument(cli.Argument):
         type=ResourceId,
         description='Alphanumeric ID value of the Profile',
     )
+    PROFILE_RESOURCE_IDS = cli.ArgumentProperties(
+        key='profile_resource_ids',
+        flags=('--profile-ids',),
+        type=ResourceId,
+        description='Alphanumeric ID value of the Profile',
+        argparse_kwargs={
+            'required': True,
+            'nargs': '+',
+            'metavar': 'profile-id'
+        }
+    )
     PROFILE_TYPE = cli.ArgumentProperties(
         key='profile_type',
         flags=('--type',),
@@ -333,6 +532,13 @@ class CommonArgument(cli.Argument):
         description='Do not raise exceptions if the specified resource does not exist.',
         argparse_kwargs={'required': False, 'action': 'store_true'},
     )
+    DRY_RUN = cli.ArgumentProperties(
+        key='dry_run',
+        flags=('--dry-run',),
+        type=bool,
+        description='Only show the resources that would be deleted without deleting them',
+        argparse_kwargs={'required': False, 'action': 'store_true'},
+    )
     SAVE = cli.ArgumentProperties(
         key='save',
         flags=('--save',),
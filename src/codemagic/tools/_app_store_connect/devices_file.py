@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import csv
+import json
+import pathlib
+from dataclasses import dataclass
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from codemagic.apple.resources import BundleIdPlatform
+
+
+@dataclass(frozen=True)
+class DeviceInfo:
+    name: str
+    udid: str
+    platform: BundleIdPlatform
+
+    # Headers of the device upload files that are exported from Apple Developer Portal are also accepted
+    FIELD_ALIASES = {
+        'name': 'name',
+        'device name': 'name',
+        'udid': 'udid',
+        'device id': 'udid',
+        'platform': 'platform',
+        'device platform': 'platform',
+    }
+    PLATFORM_ALIASES = {
+        'ios': BundleIdPlatform.IOS,
+        'mac': BundleIdPlatform.MAC_OS,
+        'mac_os': BundleIdPlatform.MAC_OS,
+        'macos': BundleIdPlatform.MAC_OS,
+    }
+
+    @classmethod
+    def _get_platform(cls, value: Optional[str], default_platform: BundleIdPlatform) -> BundleIdPlatform:
+        if not value:
+            return default_platform
+        try:
+            return cls.PLATFORM_ALIASES[value.strip().lower()]
+        except KeyError:
+            raise ValueError(f'Invalid device platform {value!r}')
+
+    @classmethod
+    def from_dict(cls, device_info: Dict[str, str], default_platform: BundleIdPlatform) -> DeviceInfo:
+        fields = {
+            cls.FIELD_ALIASES[key.strip().lower()]: (value or '').strip()
+            for key, value in device_info.items()
+            if key and key.strip().lower() in cls.FIELD_ALIASES
+        }
+        if not fields.get('udid'):
+            raise ValueError(f'Device UDID is missing from {device_info}')
+        return DeviceInfo(
+            name=fields.get('name') or fields['udid'],
+            udid=fields['udid'],
+            platform=cls._get_platform(fields.get('platform'), default_platform),
+        )
+
+
+def read_devices_file(
+        devices_file: pathlib.Path,
+        default_platform: BundleIdPlatform = BundleIdPlatform.IOS) -> List[DeviceInfo]:
+    """
+    Read devices from JSON file that contains a list of objects, or from a CSV
+    (or tab separated) file with a header row. Both formats have fields for
+    device name, UDID and optionally platform.
+    :raises: ValueError, IOError
+    """
+    content = devices_file.expanduser().read_text()
+    if devices_file.suffix.lower() == '.json':
+        entries = json.loads(content)
+        if not isinstance(entries, list) or not all(isinstance(entry, dict) for entry in entries):
+            raise ValueError('Devices JSON file must contain a list of objects')
+    else:
+        lines = content.splitlines()
+        try:
+            dialect = csv.Sniffer().sniff(lines[0], delimiters=',;\t')
+        except (csv.Error, IndexError):
+            dialect = csv.excel  # type: ignore
+        entries = list(csv.DictReader(lines, dialect=dialect))
+    return [DeviceInfo.from_dict(entry, default_platform) for entry in entries]
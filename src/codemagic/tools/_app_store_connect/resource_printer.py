@@ -4,8 +4,11 @@ import enum
 import json
 import pathlib
 import shlex
+import textwrap
 from typing import Any
 from typing import Callable
+from typing import Dict
+from typing import Iterable
 from typing import Optional
 from typing import Sequence
 from typing import TYPE_CHECKING
@@ -35,16 +38,36 @@ class ResourcePrinter:
         self.logger = log.get_logger(self.__class__)
         self.print = print_function
 
-    def print_resources(self, resources: Sequence[R], should_print: bool):
+    def print_resources(self, resources: Iterable[R], should_print: bool):
         if should_print is not True:
             return
         if self.print_json:
-            items = [resource.dict() for resource in resources]
-            self.print(json.dumps(items, indent=4))
+            self._print_json_items(resource.dict() for resource in resources)
         else:
             for resource in resources:
                 self.print_resource(resource, True)
 
+    def _print_json_items(self, items: Iterable[Dict]):
+        """
+        Print items as JSON array without having all of them in memory at once.
+        Output is identical to `json.dumps(list(items), indent=4)`.
+        """
+
+        def format_item(item: Dict) -> str:
+            return textwrap.indent(json.dumps(item, indent=4), 4 * ' ')
+
+        items_iterator = iter(items)
+        previous_item = next(items_iterator, None)
+        if previous_item is None:
+            self.print(json.dumps([]))
+            return
+        self.print('[')
+        for item in items_iterator:
+            self.print(f'{format_item(previous_item)},')
+            previous_item = item
+        self.print(format_item(previous_item))
+        self.print(']')
+
     def print_resource(self, resource: R, should_print: bool):
         if should_print is not True:
             return
@@ -74,9 +97,21 @@ class ResourcePrinter:
     def log_created(self, resource: Resource):
         self.logger.info(Colors.GREEN(f'Created {resource.__class__} {resource.id}'))
 
+    def log_not_created(self, resource_type: Type[R], identifier: str, reason: str):
+        self.logger.error(Colors.RED(f'Failed to create {resource_type} {identifier}: {reason}'))
+
+    def log_modified(self, resource: Resource):
+        self.logger.info(Colors.GREEN(f'Modified {resource.__class__} {resource.id}'))
+
+    def log_not_modified(self, resource_type: Type[R], resource_id: ResourceId, reason: str):
+        self.logger.error(Colors.RED(f'Failed to modify {resource_type} {resource_id}: {reason}'))
+
     def log_get(self, resource_type: Type[R], resource_id: ResourceId):
         self.logger.info(f'Get {resource_type} {resource_id}')
 
+    def log_get_many(self, resource_type: Type[R], resource_ids: Sequence[ResourceId]):
+        self.logger.info(f'Get {resource_type.plural(len(resource_ids))} {", ".join(resource_ids)}')
+
     def log_get_related(self, related_resource_type: Type[R], resource_type: Type[R2], resource_id: ResourceId):
         self.logger.info(f'Get {related_resource_type.s} for {resource_type} {resource_id}')
 
@@ -85,7 +120,13 @@ class ResourcePrinter:
                   resources: Sequence[R],
                   resource_filter: Optional[ResourceManager.Filter] = None,
                   related_resource_type: Optional[Type[R2]] = None):
-        count = len(resources)
+        self.log_found_count(resource_type, len(resources), resource_filter, related_resource_type)
+
+    def log_found_count(self,
+                        resource_type: Type[R],
+                        count: int,
+                        resource_filter: Optional[ResourceManager.Filter] = None,
+                        related_resource_type: Optional[Type[R2]] = None):
         name = resource_type.plural(count)
         suffix = f' matching specified filters: {resource_filter}.' if resource_filter is not None else ''
         related = f' for {related_resource_type}' if related_resource_type is not None else ''
@@ -111,6 +152,17 @@ class ResourcePrinter:
     def log_deleted(self, resource_type: Type[R], resource_id: ResourceId):
         self.logger.info(Colors.GREEN(f'Successfully deleted {resource_type} {resource_id}'))
 
+    def log_prune_plan(self, prune_plan: Sequence[Tuple[Union[Profile, SigningCertificate], str]]):
+        if not prune_plan:
+            self.logger.info(Colors.GREEN('Did not find any resources to delete'))
+            return
+        self.logger.info(Colors.BLUE(f'Found {len(prune_plan)} resources to delete:'))
+        for resource, reason in prune_plan:
+            self.logger.info(f'- {resource.__class__} {resource.id} ({resource.get_display_info()}): {reason}')
+
+    def log_not_deleted(self, resource_type: Type[R], resource_id: ResourceId, reason: str):
+        self.logger.error(Colors.RED(f'Failed to delete {resource_type} {resource_id}: {reason}'))
+
     def log_saved(self, resource: Union[SigningCertificate, Profile], path: pathlib.Path):
         destination = shlex.quote(str(path))
         self.logger.info(Colors.GREEN(f'Saved {resource.__class__} {resource.get_display_info()} to {destination}'))
@@ -3,21 +3,41 @@
 from __future__ import annotations
 
 import argparse
+import os
 import pathlib
 import re
 import tempfile
+import threading
 import time
-from typing import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from datetime import timezone
+from typing import Callable
+from typing import Dict
 from typing import List
 from typing import Optional
 from typing import Sequence
+from typing import Set
 from typing import Tuple
+from typing import Type
+from typing import TypeVar
+from typing import Union
 
 from codemagic import cli
 from codemagic.apple import AppStoreConnectApiError
+from codemagic.apple.app_store_connect import ApiCassette
+from codemagic.apple.app_store_connect import ApiCassetteError
+from codemagic.apple.app_store_connect import ApiRequestLogger
+from codemagic.apple.app_store_connect import ApiResponseCache
 from codemagic.apple.app_store_connect import AppStoreConnectApiClient
+from codemagic.apple.app_store_connect import CassetteMode
 from codemagic.apple.app_store_connect import IssuerId
+from codemagic.apple.app_store_connect import JwtCache
 from codemagic.apple.app_store_connect import KeyIdentifier
+from codemagic.apple.app_store_connect import RequestProfiler
+from codemagic.apple.app_store_connect import ResourceMirror
+from codemagic.apple.app_store_connect import SyncResult
 from codemagic.apple.resources import BundleId
 from codemagic.apple.resources import BundleIdPlatform
 from codemagic.apple.resources import CertificateType
@@ -26,6 +46,7 @@ from codemagic.apple.resources import DeviceStatus
 from codemagic.apple.resources import Profile
 from codemagic.apple.resources import ProfileState
 from codemagic.apple.resources import ProfileType
+from codemagic.apple.resources import Resource
 from codemagic.apple.resources import ResourceId
 from codemagic.apple.resources import SigningCertificate
 from codemagic.cli import Colors
@@ -39,9 +60,15 @@ from ._app_store_connect.arguments import CommonArgument
 from ._app_store_connect.arguments import DeviceArgument
 from ._app_store_connect.arguments import ProfileArgument
 from ._app_store_connect.arguments import Types
+from ._app_store_connect.devices_file import DeviceInfo
+from ._app_store_connect.devices_file import read_devices_file
 from ._app_store_connect.resource_printer import ResourcePrinter
 
 
+T = TypeVar('T')
+R = TypeVar('R')
+
+
 class AppStoreConnectError(cli.CliAppException):
     pass
 
@@ -65,6 +92,12 @@ class AppStoreConnect(cli.CliApp):
     from Apple Developer Portal using App Store Connect API to perform iOS code signing.
     """
 
+    # Parsing certificates in worker processes pays off only for large amounts of certificates
+    CERTIFICATE_PROCESS_POOL_THRESHOLD = 1000
+    # Public key fingerprints of certificates by serial number, shared between all instances
+    _certificate_fingerprints: Dict[str, str] = {}
+    _certificate_fingerprints_lock = threading.Lock()
+
     def __init__(self,
                  key_identifier: KeyIdentifier,
                  issuer_id: IssuerId,
@@ -73,12 +106,64 @@ class AppStoreConnect(cli.CliApp):
                  json_output: bool = False,
                  profiles_directory: pathlib.Path = ProvisioningProfile.DEFAULT_LOCATION,
                  certificates_directory: pathlib.Path = Certificate.DEFAULT_LOCATION,
+                 api_cache_directory: Optional[pathlib.Path] = None,
+                 api_cache_ttl: int = ApiResponseCache.DEFAULT_TTL,
+                 profile_requests: bool = False,
+                 jwt_cache_path: Optional[pathlib.Path] = None,
+                 mirror_path: Optional[pathlib.Path] = None,
+                 mirror_max_age: int = ResourceMirror.DEFAULT_MAX_AGE,
+                 record_api_calls_path: Optional[pathlib.Path] = None,
+                 replay_api_calls_path: Optional[pathlib.Path] = None,
+                 replay_latency: float = 0.0,
+                 shared_rate_limit_directory: Optional[pathlib.Path] = None,
+                 log_body_limit: int = ApiRequestLogger.DEFAULT_BODY_LIMIT,
+                 log_sample_rate: float = 1.0,
+                 connection_pool_size: Optional[int] = None,
+                 keep_alive_idle: Optional[int] = None,
                  **kwargs):
         super().__init__(**kwargs)
         self.profiles_directory = profiles_directory
         self.certificates_directory = certificates_directory
         self.printer = ResourcePrinter(bool(json_output), self.echo)
-        self.api_client = AppStoreConnectApiClient(key_identifier, issuer_id, private_key, log_requests=log_requests)
+        self.request_profiler = RequestProfiler() if profile_requests else None
+        self.resource_mirror = ResourceMirror(mirror_path, mirror_max_age) if mirror_path else None
+        self._outdated_mirror_types: Set[Type[Resource]] = set()
+        cassette = self._get_cassette(record_api_calls_path, replay_api_calls_path, replay_latency)
+        self.api_client = AppStoreConnectApiClient(
+            key_identifier,
+            issuer_id,
+            private_key,
+            log_requests=log_requests,
+            response_cache_directory=api_cache_directory,
+            response_cache_ttl=api_cache_ttl,
+            request_profiler=self.request_profiler,
+            jwt_cache=JwtCache(jwt_cache_path) if jwt_cache_path else None,
+            cassette=cassette,
+            shared_rate_limit_directory=shared_rate_limit_directory,
+            log_body_limit=log_body_limit,
+            log_sample_rate=log_sample_rate,
+            connection_pool_size=connection_pool_size,
+            keep_alive_idle=keep_alive_idle,
+        )
+
+    @classmethod
+    def _get_cassette(cls,
+                      record_api_calls_path: Optional[pathlib.Path],
+                      replay_api_calls_path: Optional[pathlib.Path],
+                      replay_latency: float) -> Optional[ApiCassette]:
+        if record_api_calls_path and replay_api_calls_path:
+            raise AppStoreConnectArgument.REPLAY_API_CALLS_PATH.raise_argument_error(
+                'Cannot record and replay App Store Connect API calls at the same time')
+        try:
+            if record_api_calls_path:
+                return ApiCassette(record_api_calls_path, CassetteMode.RECORD)
+            elif replay_api_calls_path:
+                return ApiCassette(replay_api_calls_path, CassetteMode.REPLAY, latency_factor=replay_latency)
+        except OSError as error:
+            raise AppStoreConnectArgument.RECORD_API_CALLS_PATH.raise_argument_error(str(error))
+        except ApiCassetteError as error:
+            raise AppStoreConnectArgument.REPLAY_API_CALLS_PATH.raise_argument_error(str(error))
+        return None
 
     @classmethod
     def from_cli_args(cls, cli_args: argparse.Namespace) -> AppStoreConnect:
@@ -100,9 +185,50 @@ class AppStoreConnect(cli.CliApp):
             json_output=cli_args.json_output,
             profiles_directory=cli_args.profiles_directory,
             certificates_directory=cli_args.certificates_directory,
+            api_cache_directory=cli_args.api_cache_directory,
+            api_cache_ttl=cli_args.api_cache_ttl,
+            profile_requests=cli_args.profile_requests,
+            jwt_cache_path=cli_args.jwt_cache_path,
+            mirror_path=cli_args.mirror_path,
+            mirror_max_age=cli_args.mirror_max_age,
+            record_api_calls_path=cli_args.record_api_calls_path,
+            replay_api_calls_path=cli_args.replay_api_calls_path,
+            replay_latency=cli_args.replay_latency,
+            shared_rate_limit_directory=cli_args.shared_rate_limit_directory,
+            log_body_limit=cli_args.log_body_limit,
+            log_sample_rate=cli_args.log_sample_rate,
+            connection_pool_size=cli_args.connection_pool_size,
+            keep_alive_idle=cli_args.keep_alive_idle,
             **cls._parent_class_kwargs(cli_args)
         )
 
+    def _invoke_action(self, args: argparse.Namespace):
+        try:
+            return super()._invoke_action(args)
+        finally:
+            self._log_request_profile()
+
+    def _log_request_profile(self):
+        if self.request_profiler is None:
+            return
+        self.logger.info(Colors.BLUE('App Store Connect API HTTP requests profile:'))
+        for line in self.request_profiler.get_report():
+            self.logger.info(line)
+
+    def _get_fresh_mirror(self, resource_type: Type[Resource]) -> Optional[ResourceMirror]:
+        if self.resource_mirror is None:
+            return None
+        if not self.resource_mirror.is_fresh(resource_type):
+            if resource_type not in self._outdated_mirror_types:
+                self._outdated_mirror_types.add(resource_type)
+                self.logger.info(f'Local mirror of {resource_type.s} is outdated, use App Store Connect API')
+            return None
+        return self.resource_mirror
+
+    def _invalidate_mirror(self, resource_type: Type[Resource]):
+        if self.resource_mirror is not None and resource_type in ResourceMirror.RESOURCE_TYPES:
+            self.resource_mirror.invalidate(resource_type)
+
     def _create_resource(self, resource_manager, should_print, **create_params):
         omit_keys = create_params.pop('omit_keys', tuple())
         self.printer.log_creating(
@@ -113,6 +239,8 @@ class AppStoreConnect(cli.CliApp):
             resource = resource_manager.create(**create_params)
         except AppStoreConnectApiError as api_error:
             raise AppStoreConnectError(str(api_error))
+        finally:
+            self._invalidate_mirror(resource_manager.resource_type)
 
         self.printer.print_resource(resource, should_print)
         self.printer.log_created(resource)
@@ -127,16 +255,70 @@ class AppStoreConnect(cli.CliApp):
         self.printer.print_resource(resource, should_print)
         return resource
 
-    def _list_resources(self, resource_filter, resource_manager, should_print):
+    def _get_resources(self, resource_ids: Sequence[ResourceId], resource_manager, should_print):
+        self.printer.log_get_many(resource_manager.resource_type, resource_ids)
         try:
-            resources = resource_manager.list(resource_filter=resource_filter)
+            resources = resource_manager.read_many(resource_ids)
         except AppStoreConnectApiError as api_error:
             raise AppStoreConnectError(str(api_error))
 
-        self.printer.log_found(resource_manager.resource_type, resources, resource_filter)
+        found_ids = {resource.id for resource in resources}
+        missing_ids = [resource_id for resource_id in resource_ids if resource_id not in found_ids]
+        if missing_ids:
+            resource_type = resource_manager.resource_type
+            raise AppStoreConnectError(
+                f'Did not find {resource_type.plural(len(missing_ids))} with IDs {", ".join(missing_ids)}')
         self.printer.print_resources(resources, should_print)
         return resources
 
+    def _list_resources(self, resource_filter, resource_manager, should_print, keep_resources=True, **list_params):
+        """
+        List resources matching the filter. In case the resources are printed and the caller
+        does not need them afterwards, they are printed as soon as they are received without
+        keeping them in memory and an empty list is returned.
+        """
+        mirror = self._get_fresh_mirror(resource_manager.resource_type)
+        if mirror is not None:
+            resources = mirror.list(resource_manager.resource_type, resource_filter)
+            self.printer.print_resources(resources, should_print)
+            self.printer.log_found(resource_manager.resource_type, resources, resource_filter)
+            return resources
+
+        resources = []
+        found_count = 0
+
+        def iter_resources():
+            nonlocal found_count
+            for resource in resource_manager.iter_list(resource_filter=resource_filter, **list_params):
+                found_count += 1
+                if keep_resources:
+                    resources.append(resource)
+                yield resource
+
+        try:
+            if should_print:
+                # Print resources as soon as they are received instead of waiting for all the pages
+                self.printer.print_resources(iter_resources(), should_print)
+            else:
+                resources.extend(resource_manager.iter_list(resource_filter=resource_filter, **list_params))
+                found_count = len(resources)
+        except AppStoreConnectApiError as api_error:
+            raise AppStoreConnectError(str(api_error))
+
+        self.printer.log_found_count(resource_manager.resource_type, found_count, resource_filter)
+        return resources
+
+    def _map_concurrently(self, func: Callable[[T], R], items: Sequence[T]) -> List[R]:
+        """
+        Apply func to every item using a bounded pool of worker threads.
+        Results are returned in the same order as the items.
+        """
+        if len(items) < 2:
+            return [func(item) for item in items]
+        workers = min(self.api_client.max_concurrent_requests, len(items))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(func, items))
+
     def _delete_resource(self, resource_manager, resource_id: ResourceId, ignore_not_found: bool):
         self.printer.log_delete(resource_manager.resource_type, resource_id)
         try:
@@ -147,6 +329,144 @@ class AppStoreConnect(cli.CliApp):
                 self.printer.log_ignore_not_deleted(resource_manager.resource_type, resource_id)
             else:
                 raise AppStoreConnectError(str(api_error))
+        finally:
+            self._invalidate_mirror(resource_manager.resource_type)
+
+    @cli.action('sync')
+    def sync(self) -> List[SyncResult]:
+        """
+        Update local mirror of Apple Developer Portal resources. Only the resources
+        that were added or changed since the previous sync are downloaded.
+        """
+
+        if self.resource_mirror is None:
+            raise AppStoreConnectArgument.MIRROR_PATH.raise_argument_error('Mirror path is required for sync')
+
+        results = []
+        for resource_type in ResourceMirror.RESOURCE_TYPES:
+            self.logger.info(f'Sync {resource_type.s} to {self.resource_mirror.path}')
+            try:
+                result = self.resource_mirror.sync(self.api_client, resource_type)
+            except AppStoreConnectApiError as api_error:
+                raise AppStoreConnectError(str(api_error))
+            self.logger.info(Colors.GREEN(f'Synced {result}'))
+            results.append(result)
+        return results
+
+    def _get_prune_plan(self,
+                        prune_unused_certificates: bool) -> List[Tuple[Union[Profile, SigningCertificate], str]]:
+        now = datetime.now(timezone.utc)
+        profiles = self._list_resources(
+            self.api_client.profiles.Filter(),
+            self.api_client.profiles,
+            False,
+            fields=self.api_client.profiles.FIELDS_WITHOUT_CONTENT)
+        certificates = self._list_resources(
+            self.api_client.signing_certificates.Filter(),
+            self.api_client.signing_certificates,
+            False)
+
+        prune_plan: List[Tuple[Union[Profile, SigningCertificate], str]] = []
+        remaining_profiles = []
+        for profile in profiles:
+            if profile.attributes.profileState is not ProfileState.ACTIVE:
+                prune_plan.append((profile, f'profile state is {profile.attributes.profileState}'))
+            elif profile.attributes.expirationDate <= now:
+                prune_plan.append((profile, f'expired on {profile.attributes.expirationDate}'))
+            else:
+                remaining_profiles.append(profile)
+
+        used_certificate_ids: Set[ResourceId] = set()
+        if prune_unused_certificates:
+            self.logger.info(f'Find {SigningCertificate.s} used by {len(remaining_profiles)} active {Profile.s}')
+            for certificate_ids in self._map_concurrently(self._get_profile_certificate_ids, remaining_profiles):
+                used_certificate_ids.update(certificate_ids)
+
+        for certificate in certificates:
+            if certificate.attributes.expirationDate <= now:
+                prune_plan.append((certificate, f'expired on {certificate.attributes.expirationDate}'))
+            elif prune_unused_certificates and certificate.id not in used_certificate_ids:
+                prune_plan.append((certificate, 'not used by any active profile'))
+        return prune_plan
+
+    def _get_profile_certificate_ids(self, profile: Profile) -> List[ResourceId]:
+        mirror = self._get_fresh_mirror(Profile)
+        if mirror is not None:
+            return mirror.get_related_ids(Profile, profile.id, 'certificates')
+        try:
+            linked_certificates = self.api_client.profiles.list_certificate_ids(profile.id)
+        except AppStoreConnectApiError as api_error:
+            raise AppStoreConnectError(str(api_error))
+        return [certificate.id for certificate in linked_certificates]
+
+    def _prune_resources(self, resources: Sequence[Resource], resource_manager) -> List[Tuple[Resource, str]]:
+        """
+        Delete given resources concurrently and return the resources that could not be deleted
+        together with the reasons. Once API rate limit is exhausted despite the retries, the
+        remaining resources are not attempted anymore.
+        """
+        resource_type = resource_manager.resource_type
+        rate_limit_exceeded = threading.Event()
+
+        def delete(resource: Resource) -> Optional[str]:
+            if rate_limit_exceeded.is_set():
+                return 'skipped as App Store Connect API rate limit was exceeded'
+            self.printer.log_delete(resource_type, resource.id)
+            try:
+                resource_manager.delete(resource.id)
+            except AppStoreConnectApiError as api_error:
+                if api_error.status_code == 404:
+                    self.printer.log_ignore_not_deleted(resource_type, resource.id)
+                    return None
+                if api_error.status_code == 429:
+                    rate_limit_exceeded.set()
+                return str(api_error)
+            self.printer.log_deleted(resource_type, resource.id)
+            return None
+
+        try:
+            errors = self._map_concurrently(delete, resources)
+        finally:
+            self._invalidate_mirror(resource_type)
+
+        failures = [(resource, error) for resource, error in zip(resources, errors) if error is not None]
+        for resource, error in failures:
+            self.printer.log_not_deleted(resource_type, resource.id, error)
+        return failures
+
+    @cli.action('prune',
+                CertificateArgument.PRUNE_UNUSED,
+                CommonArgument.DRY_RUN)
+    def prune(self,
+              prune_unused_certificates: bool = False,
+              dry_run: bool = False) -> List[Union[Profile, SigningCertificate]]:
+        """
+        Delete expired and invalid provisioning profiles and expired signing certificates
+        from Apple Developer Portal. Optionally delete also certificates that are not used
+        by any of the remaining profiles.
+        """
+
+        prune_plan = self._get_prune_plan(prune_unused_certificates)
+        self.printer.log_prune_plan(prune_plan)
+        resources = [resource for resource, _reason in prune_plan]
+        if dry_run or not resources:
+            return resources
+
+        # Profiles are deleted first as they can refer to the certificates that are deleted
+        profiles = [resource for resource in resources if isinstance(resource, Profile)]
+        certificates = [resource for resource in resources if isinstance(resource, SigningCertificate)]
+        failures = [
+            *self._prune_resources(profiles, self.api_client.profiles),
+            *self._prune_resources(certificates, self.api_client.signing_certificates),
+        ]
+
+        throttled_seconds = self.api_client.session.retry_statistics.throttled_seconds
+        if throttled_seconds:
+            self.logger.info(f'Waited {throttled_seconds:.1f} seconds because of App Store Connect API rate limits')
+        if failures:
+            raise AppStoreConnectError(f'Failed to delete {len(failures)} out of {len(resources)} resources')
+        self.logger.info(Colors.GREEN(f'Successfully deleted {len(resources)} resources'))
+        return resources
 
     @cli.action('list-devices',
                 BundleIdArgument.PLATFORM_OPTIONAL,
@@ -163,7 +483,94 @@ class AppStoreConnect(cli.CliApp):
 
         device_filter = self.api_client.devices.Filter(
             name=device_name, platform=platform, status=device_status)
-        return self._list_resources(device_filter, self.api_client.devices, should_print)
+        return self._list_resources(
+            device_filter, self.api_client.devices, should_print, keep_resources=not self.is_cli_invocation())
+
+    def _enable_device(self, device: Device) -> Optional[Device]:
+        try:
+            enabled_device = self.api_client.devices.modify(device.id, status=DeviceStatus.ENABLED)
+        except AppStoreConnectApiError as api_error:
+            self.printer.log_not_modified(Device, device.id, str(api_error))
+            return None
+        self.printer.log_modified(enabled_device)
+        return enabled_device
+
+    def _register_device(self, device_info: DeviceInfo) -> Optional[Device]:
+        self.printer.log_creating(Device, name=device_info.name, udid=device_info.udid, platform=device_info.platform)
+        try:
+            device = self.api_client.devices.create(device_info.name, device_info.platform, device_info.udid)
+        except AppStoreConnectApiError as api_error:
+            self.printer.log_not_created(Device, device_info.udid, str(api_error))
+            return None
+        self.printer.log_created(device)
+        return device
+
+    @cli.action('register-devices',
+                DeviceArgument.DEVICES_FILE,
+                DeviceArgument.DEVICE_PLATFORM)
+    def register_devices(self,
+                         devices_file: pathlib.Path,
+                         platform: BundleIdPlatform = BundleIdPlatform.IOS,
+                         should_print: bool = True) -> List[Device]:
+        """
+        Register devices listed in a file to Apple Developer Portal. Devices that are
+        already registered are skipped and disabled devices are enabled again.
+        """
+
+        try:
+            device_infos = read_devices_file(devices_file, platform)
+        except (ValueError, OSError) as error:
+            raise DeviceArgument.DEVICES_FILE.raise_argument_error(f'Cannot read devices: {error}')
+
+        # UDIDs are compared case insensitively as older devices can have them in either case
+        unique_device_infos: Dict[str, DeviceInfo] = {}
+        for device_info in device_infos:
+            unique_device_infos.setdefault(device_info.udid.lower(), device_info)
+
+        registered_devices = self._list_resources(self.api_client.devices.Filter(), self.api_client.devices, False)
+        udid_index = {device.attributes.udid.lower(): device for device in registered_devices}
+
+        devices: Dict[str, Optional[Device]] = {}
+        disabled_devices: List[Device] = []
+        new_device_infos: List[DeviceInfo] = []
+        for udid, device_info in unique_device_infos.items():
+            device = udid_index.get(udid)
+            if device is None:
+                new_device_infos.append(device_info)
+            elif device.attributes.status is DeviceStatus.DISABLED:
+                disabled_devices.append(device)
+            else:
+                devices[udid] = device
+        self.logger.info(
+            f'{len(devices)} out of {len(unique_device_infos)} {Device.s} are already registered, '
+            f'enable {len(disabled_devices)} and register {len(new_device_infos)} {Device.s}')
+
+        try:
+            enabled_devices = self._map_concurrently(self._enable_device, disabled_devices)
+            created_devices = self._map_concurrently(self._register_device, new_device_infos)
+        finally:
+            if disabled_devices or new_device_infos:
+                self._invalidate_mirror(Device)
+        devices.update((d.attributes.udid.lower(), enabled) for d, enabled in zip(disabled_devices, enabled_devices))
+        devices.update((i.udid.lower(), created) for i, created in zip(new_device_infos, created_devices))
+
+        failed_count = sum(device is None for device in devices.values())
+        registered = [device for device in (devices[udid] for udid in unique_device_infos) if device is not None]
+        self.printer.print_resources(registered, should_print)
+        if failed_count:
+            total_count = len(unique_device_infos)
+            raise AppStoreConnectError(f'Failed to register {failed_count} out of {total_count} {Device.s}')
+        return registered
+
+    @cli.action('get-devices', DeviceArgument.DEVICE_RESOURCE_IDS)
+    def get_devices(self,
+                    device_resource_ids: Sequence[ResourceId],
+                    should_print: bool = True) -> List[Device]:
+        """
+        Get specified Devices from Apple Developer portal.
+        """
+
+        return self._get_resources(device_resource_ids, self.api_client.devices, should_print)
 
     @cli.action('create-bundle-id',
                 BundleIdArgument.BUNDLE_ID_IDENTIFIER,
@@ -199,9 +606,8 @@ class AppStoreConnect(cli.CliApp):
 
         bundle_id_filter = self.api_client.bundle_ids.Filter(
             identifier=bundle_id_identifier, name=bundle_id_name, platform=platform)
-        bundle_ids = self._list_resources(bundle_id_filter, self.api_client.bundle_ids, should_print)
-
-        return bundle_ids
+        return self._list_resources(
+            bundle_id_filter, self.api_client.bundle_ids, should_print, keep_resources=not self.is_cli_invocation())
 
     @cli.action('get-bundle-id', BundleIdArgument.BUNDLE_ID_RESOURCE_ID)
     def get_bundle_id(self,
@@ -213,6 +619,16 @@ class AppStoreConnect(cli.CliApp):
 
         return self._get_resource(bundle_id_resource_id, self.api_client.bundle_ids, should_print)
 
+    @cli.action('get-bundle-ids', BundleIdArgument.BUNDLE_ID_RESOURCE_IDS)
+    def get_bundle_ids(self,
+                       bundle_id_resource_ids: Sequence[ResourceId],
+                       should_print: bool = True) -> List[BundleId]:
+        """
+        Get specified Bundle IDs from Apple Developer portal.
+        """
+
+        return self._get_resources(bundle_id_resource_ids, self.api_client.bundle_ids, should_print)
+
     @cli.action('delete-bundle-id',
                 BundleIdArgument.BUNDLE_ID_RESOURCE_ID,
                 CommonArgument.IGNORE_NOT_FOUND)
@@ -285,6 +701,35 @@ class AppStoreConnect(cli.CliApp):
             self._save_certificate(certificate, private_key, p12_container_password)
         return certificate
 
+    @cli.action('get-certificates',
+                CertificateArgument.CERTIFICATE_RESOURCE_IDS,
+                CertificateArgument.PRIVATE_KEY,
+                CertificateArgument.PRIVATE_KEY_PASSWORD,
+                CertificateArgument.P12_CONTAINER_PASSWORD,
+                CommonArgument.SAVE)
+    def get_certificates(self,
+                         certificate_resource_ids: Sequence[ResourceId],
+                         certificate_key: Optional[Types.CertificateKeyArgument] = None,
+                         certificate_key_password: Optional[Types.CertificateKeyPasswordArgument] = None,
+                         p12_container_password: str = '',
+                         save: bool = False,
+                         should_print: bool = True) -> List[SigningCertificate]:
+        """
+        Get specified Signing Certificates from Apple Developer portal.
+        """
+
+        private_key = _get_certificate_key(certificate_key, certificate_key_password)
+        if save and private_key is None:
+            raise AppStoreConnectError('Cannot save resource without private key')
+
+        certificates = self._get_resources(
+            certificate_resource_ids, self.api_client.signing_certificates, should_print)
+
+        if save:
+            assert private_key is not None  # Make mypy happy
+            self._save_certificates(certificates, private_key, p12_container_password)
+        return certificates
+
     @cli.action('delete-certificate',
                 CertificateArgument.CERTIFICATE_RESOURCE_ID,
                 CommonArgument.IGNORE_NOT_FOUND)
@@ -328,13 +773,15 @@ class AppStoreConnect(cli.CliApp):
         certificate_filter = self.api_client.signing_certificates.Filter(
             certificate_type=certificate_type,
             display_name=display_name)
-        certificates = self._list_resources(certificate_filter, self.api_client.signing_certificates, should_print)
+        certificates = self._list_resources(
+            certificate_filter,
+            self.api_client.signing_certificates,
+            should_print,
+            keep_resources=private_key is not None or not self.is_cli_invocation(),
+        )
 
         if private_key:
-            certificates = [
-                certificate for certificate in certificates
-                if Certificate.from_ans1(certificate.asn1_content).is_signed_with(private_key)
-            ]
+            certificates = self._filter_certificates_signed_with(certificates, private_key)
             self.printer.log_filtered(SigningCertificate, certificates, 'for given private key')
 
         if save:
@@ -343,6 +790,47 @@ class AppStoreConnect(cli.CliApp):
 
         return certificates
 
+    @classmethod
+    def _get_certificate_fingerprints(cls, certificates: Sequence[SigningCertificate]) -> List[str]:
+        with cls._certificate_fingerprints_lock:
+            unknown_certificates = {
+                certificate.attributes.serialNumber: certificate.asn1_content
+                for certificate in certificates
+                if certificate.attributes.serialNumber not in cls._certificate_fingerprints
+            }
+
+        serial_numbers = list(unknown_certificates.keys())
+        contents = list(unknown_certificates.values())
+        get_fingerprint = Certificate.get_public_key_fingerprint_from_asn1
+        if len(contents) >= cls.CERTIFICATE_PROCESS_POOL_THRESHOLD:
+            workers = os.cpu_count() or 1
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                chunk_size = max(1, len(contents) // (4 * workers))
+                fingerprints = list(executor.map(get_fingerprint, contents, chunksize=chunk_size))
+        else:
+            fingerprints = [get_fingerprint(content) for content in contents]
+
+        with cls._certificate_fingerprints_lock:
+            cls._certificate_fingerprints.update(zip(serial_numbers, fingerprints))
+            return [cls._certificate_fingerprints[c.attributes.serialNumber] for c in certificates]
+
+    def _filter_certificates_signed_with(self,
+                                         certificates: Sequence[SigningCertificate],
+                                         private_key: PrivateKey) -> List[SigningCertificate]:
+        """
+        Compare public key fingerprint of the private key to the fingerprints of certificates'
+        public keys. Fingerprints are memoized by certificate serial numbers.
+        """
+        try:
+            certificate_fingerprints = self._get_certificate_fingerprints(certificates)
+        except ValueError as error:
+            raise AppStoreConnectError(*error.args)
+        key_fingerprint = private_key.public_key_fingerprint
+        return [
+            certificate for certificate, fingerprint in zip(certificates, certificate_fingerprints)
+            if fingerprint == key_fingerprint
+        ]
+
     @cli.action('create-profile',
                 BundleIdArgument.BUNDLE_ID_RESOURCE_ID,
                 CertificateArgument.CERTIFICATE_RESOURCE_IDS,
@@ -394,6 +882,16 @@ class AppStoreConnect(cli.CliApp):
 
         return self._get_resource(profile_resource_id, self.api_client.profiles, should_print)
 
+    @cli.action('get-profiles', ProfileArgument.PROFILE_RESOURCE_IDS)
+    def get_profiles(self,
+                     profile_resource_ids: Sequence[ResourceId],
+                     should_print: bool = True) -> List[Profile]:
+        """
+        Get specified Profiles from Apple Developer portal.
+        """
+
+        return self._get_resources(profile_resource_ids, self.api_client.profiles, should_print)
+
     @cli.action('delete-profile',
                 ProfileArgument.PROFILE_RESOURCE_ID,
                 CommonArgument.IGNORE_NOT_FOUND)
@@ -424,18 +922,42 @@ class AppStoreConnect(cli.CliApp):
             profile_type=profile_type,
             profile_state=profile_state,
             name=profile_name)
-        profiles = self._list_resources(profile_filter, self.api_client.profiles, should_print)
+        profiles = self._list_resources(
+            profile_filter,
+            self.api_client.profiles,
+            should_print,
+            keep_resources=save or not self.is_cli_invocation(),
+            fields=self._get_profile_fields(save),
+        )
 
         if save:
             self._save_profiles(profiles)
         return profiles
 
-    def _find_bundle_id_profiles(self, resource_id: ResourceId, profiles_filter) -> List[Profile]:
+    def _get_profile_fields(self, save: bool) -> Optional[Sequence[str]]:
+        """
+        Profile content is only needed when profiles are saved or printed as JSON.
+        Otherwise it can be left out from the responses as it is downloaded on demand.
+        """
+        if save or self.printer.print_json:
+            return None
+        return self.api_client.profiles.FIELDS_WITHOUT_CONTENT
+
+    def _find_bundle_id_profiles(self,
+                                 resource_id: ResourceId,
+                                 profiles_filter,
+                                 fields: Optional[Sequence[str]] = None) -> List[Profile]:
         self.printer.log_get_related(Profile, BundleId, resource_id)
+        mirror = self._get_fresh_mirror(Profile)
+        if mirror is not None:
+            profiles = mirror.list_related(Profile, 'bundleId', resource_id, profiles_filter)
+            self.printer.log_found(Profile, profiles, profiles_filter, BundleId)
+            return profiles
         try:
             profiles = self.api_client.bundle_ids.list_profiles(
                 bundle_id=resource_id,
-                resource_filter=profiles_filter)
+                resource_filter=profiles_filter,
+                fields=fields)
         except AppStoreConnectApiError as api_error:
             raise AppStoreConnectError(str(api_error))
         self.printer.log_found(Profile, profiles, profiles_filter, BundleId)
@@ -463,9 +985,11 @@ class AppStoreConnect(cli.CliApp):
             profile_state=profile_state,
             name=profile_name)
 
-        profiles = []
-        for resource_id in set(bundle_id_resource_ids):
-            profiles.extend(self._find_bundle_id_profiles(resource_id, profiles_filter))
+        fields = self._get_profile_fields(save)
+        bundle_ids_profiles = self._map_concurrently(
+            lambda resource_id: self._find_bundle_id_profiles(resource_id, profiles_filter, fields),
+            list(dict.fromkeys(bundle_id_resource_ids)))
+        profiles = [profile for bundle_id_profiles in bundle_ids_profiles for profile in bundle_id_profiles]
 
         self.printer.print_resources(profiles, should_print)
         if save:
@@ -473,31 +997,40 @@ class AppStoreConnect(cli.CliApp):
         return profiles
 
     @cli.action('fetch-signing-files',
-                BundleIdArgument.BUNDLE_ID_IDENTIFIER,
+                BundleIdArgument.BUNDLE_ID_IDENTIFIERS,
                 BundleIdArgument.PLATFORM,
                 CertificateArgument.PRIVATE_KEY,
                 CertificateArgument.PRIVATE_KEY_PASSWORD,
                 CertificateArgument.P12_CONTAINER_PASSWORD,
                 ProfileArgument.PROFILE_TYPE,
                 CommonArgument.CREATE_RESOURCE)
-    def fetch_signing_files(self,
-                            bundle_id_identifier: str,
-                            certificate_key: Optional[Types.CertificateKeyArgument] = None,
-                            certificate_key_password: Optional[Types.CertificateKeyPasswordArgument] = None,
-                            p12_container_password: str = '',
-                            platform: BundleIdPlatform = BundleIdPlatform.IOS,
-                            profile_type: ProfileType = ProfileType.IOS_APP_DEVELOPMENT,
-                            create_resource: bool = False) -> Tuple[List[Profile], List[SigningCertificate]]:
+    def fetch_signing_files(
+            self,
+            bundle_id_identifiers: Union[None, str, Sequence[str]] = None,
+            certificate_key: Optional[Types.CertificateKeyArgument] = None,
+            certificate_key_password: Optional[Types.CertificateKeyPasswordArgument] = None,
+            p12_container_password: str = '',
+            platform: BundleIdPlatform = BundleIdPlatform.IOS,
+            profile_type: ProfileType = ProfileType.IOS_APP_DEVELOPMENT,
+            create_resource: bool = False,
+            bundle_id_identifier: Optional[str] = None) -> Tuple[List[Profile], List[SigningCertificate]]:
         """
         Fetch provisioning profiles and code signing certificates
-        for Bundle ID with given identifier.
+        for Bundle IDs with given identifiers.
         """
+        if bundle_id_identifiers is None:
+            # Keep accepting the keyword argument from before multiple identifiers were supported
+            if bundle_id_identifier is None:
+                raise TypeError('Bundle ID identifiers are required')
+            bundle_id_identifiers = bundle_id_identifier
 
         private_key = _get_certificate_key(certificate_key, certificate_key_password)
         if private_key is None:
             raise AppStoreConnectError(f'Cannot save {SigningCertificate.s} without private key')
 
-        bundle_ids = self._get_or_create_bundle_ids(bundle_id_identifier, platform, create_resource)
+        if isinstance(bundle_id_identifiers, str):
+            bundle_id_identifiers = [bundle_id_identifiers]
+        bundle_ids = self._get_or_create_bundle_ids(bundle_id_identifiers, platform, create_resource)
         certificates = self._get_or_create_certificates(
             profile_type, certificate_key, certificate_key_password, create_resource)
         profiles = self._get_or_create_profiles(bundle_ids, certificates, profile_type, create_resource, platform)
@@ -506,14 +1039,36 @@ class AppStoreConnect(cli.CliApp):
         self._save_profiles(profiles)
         return profiles, certificates
 
-    def _get_or_create_bundle_ids(
-            self, bundle_id_identifier: str, platform: BundleIdPlatform, create_resource: bool) -> List[BundleId]:
-        bundle_ids = self.list_bundle_ids(bundle_id_identifier, platform=platform, should_print=False)
-        if not bundle_ids:
-            if not create_resource:
-                raise AppStoreConnectError(f'Did not find {BundleId.s} with identifier {bundle_id_identifier}')
-            bundle_ids.append(self.create_bundle_id(bundle_id_identifier, platform=platform, should_print=False))
-        return bundle_ids
+    def _get_or_create_bundle_ids(self,
+                                  bundle_id_identifiers: Sequence[str],
+                                  platform: BundleIdPlatform,
+                                  create_resource: bool) -> List[BundleId]:
+        identifiers = list(dict.fromkeys(bundle_id_identifiers))
+        identifiers_bundle_ids = self._map_concurrently(
+            lambda identifier: self._list_exact_bundle_ids(identifier, platform),
+            identifiers)
+
+        missing_identifiers = [
+            identifier for identifier, bundle_ids in zip(identifiers, identifiers_bundle_ids) if not bundle_ids]
+        if missing_identifiers and not create_resource:
+            missing = ', '.join(f'"{identifier}"' for identifier in missing_identifiers)
+            raise AppStoreConnectError(f'Did not find {BundleId.s} with identifiers {missing}')
+
+        created_bundle_ids = self._map_concurrently(
+            lambda identifier: self.create_bundle_id(identifier, platform=platform, should_print=False),
+            missing_identifiers)
+        # The same Bundle ID must not be handled twice even if it was requested multiple times
+        unique_bundle_ids = {
+            bundle_id.id: bundle_id
+            for bundle_ids in identifiers_bundle_ids
+            for bundle_id in bundle_ids
+        }
+        return list(unique_bundle_ids.values()) + created_bundle_ids
+
+    def _list_exact_bundle_ids(self, identifier: str, platform: BundleIdPlatform) -> List[BundleId]:
+        bundle_ids = self.list_bundle_ids(identifier, platform=platform, should_print=False)
+        # Identifier filter of the API also matches Bundle IDs whose identifiers only contain the given value
+        return [bundle_id for bundle_id in bundle_ids if bundle_id.attributes.identifier == identifier]
 
     def _get_or_create_certificates(self,
                                     profile_type: ProfileType,
@@ -541,21 +1096,26 @@ class AppStoreConnect(cli.CliApp):
                                  bundle_ids_without_profiles: Sequence[BundleId],
                                  certificates: Sequence[SigningCertificate],
                                  profile_type: ProfileType,
-                                 platform: Optional[BundleIdPlatform] = None) -> Iterator[Profile]:
+                                 platform: Optional[BundleIdPlatform] = None) -> List[Profile]:
         if not bundle_ids_without_profiles:
             return []
         if platform is None:
             platform = bundle_ids_without_profiles[0].attributes.platform
 
+        # Devices and certificates are shared between all the created profiles
         devices = self.list_devices(platform=platform, device_status=DeviceStatus.ENABLED, should_print=False)
-        for bundle_id in bundle_ids_without_profiles:
-            yield self.create_profile(
+        certificate_ids = [certificate.id for certificate in certificates]
+        device_ids = [device.id for device in devices]
+        return self._map_concurrently(
+            lambda bundle_id: self.create_profile(
                 bundle_id.id,
-                [certificate.id for certificate in certificates],
-                [device.id for device in devices],
+                certificate_ids,
+                device_ids,
                 profile_type=profile_type,
-                should_print=False
-            )
+                should_print=False,
+            ),
+            bundle_ids_without_profiles,
+        )
 
     def _get_or_create_profiles(self,
                                 bundle_ids: Sequence[BundleId],
@@ -564,6 +1124,8 @@ class AppStoreConnect(cli.CliApp):
                                 create_resource: bool,
                                 platform: Optional[BundleIdPlatform] = None):
         def has_certificate(profile) -> bool:
+            if mirror is not None:
+                return certificate_ids.issubset(mirror.get_related_ids(Profile, profile.id, 'certificates'))
             try:
                 profile_certificates = self.api_client.profiles.list_certificate_ids(profile)
                 return bool(certificate_ids.issubset({c.id for c in profile_certificates}))
@@ -572,29 +1134,31 @@ class AppStoreConnect(cli.CliApp):
                 self.logger.warning(Colors.YELLOW(f'{error}: {err.error_response}'))
                 return False
 
-        def missing_profile(bundle_id) -> bool:
-            try:
-                bundle_ids_profiles = self.api_client.bundle_ids.list_profile_ids(bundle_id)
-                return not (profile_ids & {p.id for p in bundle_ids_profiles})
-            except AppStoreConnectApiError as err:
-                error = f'Listing {Profile.s} for {BundleId} {bundle_id.id} failed unexpectedly'
-                self.logger.warning(Colors.YELLOW(f'{error}: {err.error_response}'))
-                return True
-
+        mirror = self._get_fresh_mirror(Profile)
         certificate_ids = {c.id for c in certificates}
-        profiles = self.list_bundle_id_profiles(
-            [bundle_id.id for bundle_id in bundle_ids],
+        profiles_filter = self.api_client.profiles.Filter(
             profile_type=profile_type,
-            profile_state=ProfileState.ACTIVE,
-            should_print=False)
-        profiles = list(filter(has_certificate, profiles))
+            profile_state=ProfileState.ACTIVE)
+        # Download content only for the profiles that are going to be saved
+        fields = self.api_client.profiles.FIELDS_WITHOUT_CONTENT
+        bundle_ids_profiles = self._map_concurrently(
+            lambda bundle_id: self._find_bundle_id_profiles(bundle_id.id, profiles_filter, fields), bundle_ids)
+        profiles = [profile for bundle_id_profiles in bundle_ids_profiles for profile in bundle_id_profiles]
+        profiles = [
+            profile for profile, matches in zip(profiles, self._map_concurrently(has_certificate, profiles))
+            if matches
+        ]
 
         certificate_names = (f'{c.attributes.displayName} [{c.attributes.serialNumber}]' for c in certificates)
         message = f'that contain certificate(s) {", ".join(certificate_names)}'
         self.printer.log_filtered(Profile, profiles, message)
 
+        # Bundle ID profiles are already known, so there is no need to look up their relationships again
         profile_ids = {p.id for p in profiles}
-        bundle_ids_without_profiles = list(filter(missing_profile, bundle_ids))
+        bundle_ids_without_profiles = [
+            bundle_id for bundle_id, bundle_id_profiles in zip(bundle_ids, bundle_ids_profiles)
+            if not profile_ids & {p.id for p in bundle_id_profiles}
+        ]
         if bundle_ids_without_profiles and not create_resource:
             missing = ", ".join(f'"{bid.attributes.identifier}" [{bid.id}]' for bid in bundle_ids_without_profiles)
             raise AppStoreConnectError(f'Did not find {profile_type} {Profile.s} for {BundleId.s}: {missing}')
@@ -615,9 +1179,16 @@ class AppStoreConnect(cli.CliApp):
         tf.close()
         return pathlib.Path(tf.name)
 
+    def _get_profile_content(self, profile: Profile) -> bytes:
+        try:
+            return profile.profile_content
+        except AppStoreConnectApiError as api_error:
+            raise AppStoreConnectError(str(api_error))
+
     def _save_profile(self, profile: Profile) -> pathlib.Path:
+        profile_content = self._get_profile_content(profile)
         profile_path = self._get_unique_path(f'{profile.get_display_info()}.mobileprovision', self.profiles_directory)
-        profile_path.write_bytes(profile.profile_content)
+        profile_path.write_bytes(profile_content)
         self.printer.log_saved(profile, profile_path)
         return profile_path
 
@@ -637,13 +1208,18 @@ class AppStoreConnect(cli.CliApp):
         return p12_path
 
     def _save_profiles(self, profiles: Sequence[Profile]) -> List[pathlib.Path]:
+        # Download contents of the profiles that were listed without it in parallel
+        self._map_concurrently(self._get_profile_content, profiles)
         return [self._save_profile(profile) for profile in profiles]
 
     def _save_certificates(self,
                            certificates: Sequence[SigningCertificate],
                            private_key: PrivateKey,
                            p12_container_password: str) -> List[pathlib.Path]:
-        return [self._save_certificate(c, private_key, p12_container_password) for c in certificates]
+        # PKCS#12 containers are created in memory, so certificates can be exported in parallel
+        return self._map_concurrently(
+            lambda certificate: self._save_certificate(certificate, private_key, p12_container_password),
+            certificates)
 
 
 if __name__ == '__main__':
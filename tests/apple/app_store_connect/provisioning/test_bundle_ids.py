@@ -7,6 +7,7 @@ from codemagic.apple.resources import BundleIdCapability
 from codemagic.apple.resources import BundleIdPlatform
 from codemagic.apple.resources import LinkedResourceData
 from codemagic.apple.resources import Profile
+from codemagic.apple.resources import ProfileState
 from codemagic.apple.resources import ResourceId
 from codemagic.apple.resources import ResourceType
 from tests.apple.app_store_connect.resource_manager_test_base import ResourceManagerTestsBase
@@ -60,6 +61,13 @@ class BundleIdsTest(ResourceManagerTestsBase):
             assert isinstance(profile, Profile)
             assert profile.type is ResourceType.PROFILES
 
+    def test_list_profiles_with_filter(self):
+        profiles_filter = self.api_client.profiles.Filter(profile_state=ProfileState.ACTIVE)
+        profiles = self.api_client.bundle_ids.list_profiles(CAPYBARA_ID, resource_filter=profiles_filter)
+        for profile in profiles:
+            assert isinstance(profile, Profile)
+            assert profile.attributes.profileState is ProfileState.ACTIVE
+
     def test_list_capabilility_ids(self):
         linked_capabilities = self.api_client.bundle_ids.list_capabilility_ids(CAPYBARA_ID)
         assert len(linked_capabilities) > 0
@@ -38,6 +38,21 @@ def test_create_profile_success_with_devices(profile_type, profile_response, api
     api_client.session.post.assert_called_once()
 
 
+def test_list_profiles_does_not_decode_attributes(profile_response, api_client):
+    api_profile = profile_response.data['data']
+    attributes_without_content = {k: v for k, v in api_profile['attributes'].items() if k != 'profileContent'}
+    api_profiles = [api_profile, {**api_profile, 'attributes': attributes_without_content}]
+
+    with mock.patch.object(api_client, 'iter_paginate', return_value=iter(api_profiles)), \
+            mock.patch.object(Profile, '_create_attributes', wraps=Profile._create_attributes) as mock_create:
+        profiles = api_client.profiles.list()
+        mock_create.assert_not_called()
+
+    assert [profile.has_content for profile in profiles] == [True, False]
+    assert profiles[0]._content_loader is None
+    assert profiles[1]._content_loader is not None
+
+
 @pytest.mark.skip(reason='Live App Store Connect API access')
 class ProfilesTest(ResourceManagerTestsBase):
 
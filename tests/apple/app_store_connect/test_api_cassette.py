@@ -0,0 +1,99 @@
+import json
+import stat
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+import requests
+
+from codemagic.apple.app_store_connect import ApiCassette
+from codemagic.apple.app_store_connect import ApiCassetteError
+from codemagic.apple.app_store_connect import AppStoreConnectApiError
+from codemagic.apple.app_store_connect import AppStoreConnectApiSession
+from codemagic.apple.app_store_connect import CassetteMode
+
+URL = 'https://api.appstoreconnect.apple.com/v1/profiles'
+
+
+def _response(data, status_code=200, method='GET', url=URL):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(data).encode()
+    response.url = url
+    response.elapsed = timedelta(seconds=0.5)
+    response.headers['Content-Type'] = 'application/json'
+    response.headers['Set-Cookie'] = 'session=secret'
+    response.request = requests.Request(method, url).prepare()
+    return response
+
+
+def _auth_headers():
+    return {'Authorization': 'Bearer signed-token'}
+
+
+@pytest.fixture
+def cassette_path(temp_dir):
+    return temp_dir / 'cassette.jsonl'
+
+
+def _record(cassette_path, responses):
+    session = AppStoreConnectApiSession(_auth_headers, cassette=ApiCassette(cassette_path, CassetteMode.RECORD))
+    with mock.patch.object(requests.Session, 'request', side_effect=responses):
+        session.get(URL, params={'limit': 100})
+        session.post(URL, json={'data': {'attributes': {'name': 'profile', 'password': 'hunter2'}}})
+        session.get(URL, params={'limit': 100})
+
+
+def test_record_redacts_secrets(cassette_path):
+    _record(cassette_path, [
+        _response({'data': [1]}),
+        _response({'data': {'id': '1', 'attributes': {'privateKey': 'key'}}}, status_code=201, method='POST'),
+        _response({'data': [1, 2]}),
+    ])
+
+    content = cassette_path.read_text()
+    assert stat.S_IMODE(cassette_path.stat().st_mode) == 0o600
+    assert len(content.splitlines()) == 3
+    for secret in ('signed-token', 'hunter2', 'session=secret', '"key"'):
+        assert secret not in content
+
+
+def test_replay(cassette_path):
+    _record(cassette_path, [
+        _response({'data': [1]}),
+        _response({'data': {'id': '1'}}, status_code=201, method='POST'),
+        _response({'data': [1, 2]}),
+    ])
+    auth_headers_factory = mock.Mock()
+    cassette = ApiCassette(cassette_path, CassetteMode.REPLAY)
+    session = AppStoreConnectApiSession(auth_headers_factory, cassette=cassette)
+
+    with mock.patch.object(requests.Session, 'request') as mock_request:
+        assert session.get(URL, params={'limit': 100}).json() == {'data': [1]}
+        assert session.post(URL, json={'data': {}}).status_code == 201
+        assert session.get(URL, params={'limit': 100}).json() == {'data': [1, 2]}
+        # Last recorded response is reused once the recording is exhausted
+        assert session.get(URL, params={'limit': 100}).json() == {'data': [1, 2]}
+        with pytest.raises(ApiCassetteError):
+            session.get(URL, params={'limit': 200})
+
+    mock_request.assert_not_called()
+    auth_headers_factory.assert_not_called()
+
+
+def test_replay_errors_and_latency(cassette_path):
+    recorder = ApiCassette(cassette_path, CassetteMode.RECORD)
+    recorder.record('GET', URL, {'limit': 100}, None, _response({'errors': []}, status_code=404))
+    cassette = ApiCassette(cassette_path, CassetteMode.REPLAY, latency_factor=2)
+    session = AppStoreConnectApiSession(_auth_headers, cassette=cassette)
+
+    with mock.patch('codemagic.apple.app_store_connect.api_cassette.time') as mock_time:
+        with pytest.raises(AppStoreConnectApiError) as error_info:
+            session.get(URL, params={'limit': 100})
+    assert error_info.value.status_code == 404
+    mock_time.sleep.assert_called_once_with(1.0)
+
+
+def test_replay_missing_cassette(cassette_path):
+    with pytest.raises(ApiCassetteError):
+        ApiCassette(cassette_path, CassetteMode.REPLAY)
@@ -1,10 +1,18 @@
+import threading
+import time
 from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
 from unittest import mock
+from urllib.parse import parse_qs
+from urllib.parse import urlparse
 
 import pytest
 
+from codemagic.apple.app_store_connect import AppStoreConnectApiClient
+from codemagic.apple.app_store_connect import IssuerId
+from codemagic.apple.app_store_connect import KeyIdentifier
+
 NOW = datetime(year=2019, month=8, day=20)
 UTC_NOW = datetime(year=2019, month=8, day=20, tzinfo=timezone.utc)
 
@@ -38,3 +46,134 @@ def test_is_token_expired(jwt_expires, is_expired, api_client, freeze_now):
 
 def test_auth_headers(api_client):
     assert api_client.jwt in api_client.generate_auth_headers()['Authorization']
+
+
+@pytest.mark.parametrize('client_kwargs, expected_pool_size, expected_keep_alive_idle', [
+    ({'max_concurrent_requests': 16}, 16, None),
+    ({'max_concurrent_requests': 16, 'connection_pool_size': 4, 'keep_alive_idle': 30}, 4, 30),
+])
+def test_connection_pool_settings(client_kwargs, expected_pool_size, expected_keep_alive_idle):
+    api_client = AppStoreConnectApiClient(
+        KeyIdentifier('key-identifier'), IssuerId('issuer-id'), 'private-key', **client_kwargs)
+
+    adapter = api_client.session.get_adapter(api_client.API_URL)
+    assert adapter.poolmanager.connection_pool_kw['maxsize'] == expected_pool_size
+    assert adapter.keep_alive_idle == expected_keep_alive_idle
+
+
+def _mock_page(items, next_url=None, total=None, limit=2):
+    page = {'data': items, 'links': {'self': 'https://example.com/v1/devices'}}
+    if next_url:
+        page['links']['next'] = next_url
+    if total is not None:
+        page['meta'] = {'paging': {'total': total, 'limit': limit}}
+    return mock.Mock(json=mock.Mock(return_value=page))
+
+
+@pytest.mark.parametrize('next_url, expected_cursors', [
+    ('https://example.com/v1/devices?cursor=AAI&limit=2', ['AAI', 'AAQ', 'AAY']),
+    ('https://example.com/v1/devices?limit=2&cursor=Ag', ['Ag', 'BA', 'Bg']),
+])
+def test_get_page_urls(next_url, expected_cursors, api_client):
+    first_page = _mock_page([{'id': 1}, {'id': 2}], next_url, total=7).json()
+    page_urls = api_client._get_page_urls(first_page)
+    assert [parse_qs(urlparse(url).query)['cursor'][0] for url in page_urls] == expected_cursors
+    assert all(parse_qs(urlparse(url).query)['limit'] == ['2'] for url in page_urls)
+
+
+@pytest.mark.parametrize('next_url, total', [
+    ('https://example.com/v1/devices?cursor=AAI&limit=2', None),
+    ('https://example.com/v1/devices?cursor=AAM&limit=2', 7),
+    ('https://example.com/v1/devices?cursor=opaque-cursor&limit=2', 7),
+    ('https://example.com/v1/devices?limit=2', 7),
+])
+def test_get_page_urls_unknown_cursor(next_url, total, api_client):
+    first_page = _mock_page([{'id': 1}, {'id': 2}], next_url, total=total).json()
+    assert api_client._get_page_urls(first_page) is None
+
+
+def _mock_offset_pages(api_client, resource_count, total=None, on_get=None):
+    def get_page(url, params=None):
+        if on_get:
+            on_get()
+        cursor = parse_qs(urlparse(url).query).get('cursor', ['AAA'])[0]
+        offset = int.from_bytes(api_client._decode_cursor(cursor), 'big')
+        items = [{'id': i} for i in range(offset, min(offset + 2, resource_count))]
+        next_url = None
+        if offset + 2 < resource_count:
+            next_cursor = api_client._encode_cursor(offset + 2, 2, False)
+            next_url = f'https://example.com/v1/devices?cursor={next_cursor}&limit=2'
+        return _mock_page(items, next_url, total=total or resource_count)
+    return get_page
+
+
+def test_iter_paginate_concurrent_pages(api_client):
+    get_page = _mock_offset_pages(api_client, 7)
+    with mock.patch.object(api_client.session, 'get', side_effect=get_page) as mock_get:
+        results = list(api_client.iter_paginate('https://example.com/v1/devices', page_size=2))
+
+    assert [item['id'] for item in results] == list(range(7))
+    assert mock_get.call_count == 4
+
+
+def test_iter_paginate_resources_added_while_listing(api_client):
+    # Total count in the first page is 7, but there are 10 resources by the time the other pages are fetched
+    first_page = _mock_offset_pages(api_client, 7)('https://example.com/v1/devices')
+    get_page = _mock_offset_pages(api_client, 10)
+    responses = iter([first_page])
+
+    def get_response(url, params=None):
+        return next(responses, None) or get_page(url, params)
+
+    with mock.patch.object(api_client.session, 'get', side_effect=get_response) as mock_get:
+        results = list(api_client.iter_paginate('https://example.com/v1/devices', page_size=2))
+
+    assert [item['id'] for item in results] == list(range(10))
+    # First page, three prefetched pages and one page from following the next link of the last page
+    assert mock_get.call_count == 5
+
+
+def test_iter_paginate_stop_early(api_client, monkeypatch):
+    release = threading.Event()
+    get_page = _mock_offset_pages(api_client, 20)
+    # Client is shared between the tests, restore concurrency afterwards
+    monkeypatch.setattr(api_client, 'max_concurrent_requests', 1)
+
+    def get_blocked_page(url, params=None):
+        if 'cursor' in url:
+            release.wait(5)
+        return get_page(url, params)
+
+    with mock.patch.object(api_client.session, 'get', side_effect=get_blocked_page) as mock_get:
+        resources = api_client.iter_paginate('https://example.com/v1/devices', page_size=2)
+        assert next(resources) == {'id': 0}
+        resources.close()
+        release.set()
+        time.sleep(0.1)
+
+    # First page and the page request that was already in flight, queued requests were cancelled
+    assert mock_get.call_count == 2
+
+
+def test_iter_paginate_follows_next_links(api_client):
+    pages = [
+        _mock_page([{'id': 0}, {'id': 1}], 'https://example.com/v1/devices?cursor=opaque1&limit=2'),
+        _mock_page([{'id': 2}, {'id': 3}], 'https://example.com/v1/devices?cursor=opaque2&limit=2'),
+        _mock_page([{'id': 4}]),
+    ]
+    with mock.patch.object(api_client.session, 'get', side_effect=pages) as mock_get:
+        results = api_client.paginate('https://example.com/v1/devices', params={'limit': 2, 'sort': 'name'})
+
+    assert [item['id'] for item in results] == list(range(5))
+    assert mock_get.call_count == 3
+    assert mock_get.call_args[1]['params'] == {'sort': 'name'}
+
+
+def test_iter_paginate_resources_removed_while_listing(api_client):
+    get_page = _mock_offset_pages(api_client, 7, total=9)
+    with mock.patch.object(api_client.session, 'get', side_effect=get_page), \
+            mock.patch.object(api_client, '_logger') as mock_logger:
+        results = api_client.paginate('https://example.com/v1/devices', page_size=2)
+
+    assert len(results) == 7
+    mock_logger.warning.assert_called_once()
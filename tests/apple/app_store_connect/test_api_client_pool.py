@@ -0,0 +1,67 @@
+import threading
+from unittest import mock
+
+import pytest
+
+from codemagic.apple.app_store_connect import ApiKey
+from codemagic.apple.app_store_connect import AppStoreConnectApiClientPool
+from codemagic.apple.app_store_connect import IssuerId
+from codemagic.apple.app_store_connect import KeyIdentifier
+
+
+@pytest.fixture
+def client_pool():
+    api_keys = {
+        f'team-{i}': ApiKey(KeyIdentifier(f'KEY{i}'), IssuerId(f'issuer-{i}'), f'private-key-{i}')
+        for i in range(4)
+    }
+    with AppStoreConnectApiClientPool(api_keys, max_concurrent_teams=4) as pool:
+        yield pool
+
+
+def test_clients_are_separate_per_team(client_pool):
+    client = client_pool.get_client('team-0')
+    other_client = client_pool.get_client('team-1')
+
+    assert client is client_pool.get_client('team-0')
+    assert client.session is not other_client.session
+    assert client._key_identifier == KeyIdentifier('KEY0')
+    assert other_client._key_identifier == KeyIdentifier('KEY1')
+
+
+def test_unknown_team(client_pool):
+    with pytest.raises(KeyError):
+        client_pool.get_client('unknown-team')
+
+
+def test_map_aggregates_results_and_errors(client_pool):
+    barrier = threading.Barrier(len(client_pool.teams), timeout=5)
+
+    def operation(client):
+        # All teams need to be in progress simultaneously to pass the barrier
+        barrier.wait()
+        if client._key_identifier == 'KEY2':
+            raise ValueError('Operation failed')
+        return client._key_identifier
+
+    results = client_pool.map(operation)
+
+    assert [result.team for result in results] == client_pool.teams
+    assert [result.ok for result in results] == [True, True, False, True]
+    assert [result.result for result in results] == ['KEY0', 'KEY1', None, 'KEY3']
+    assert isinstance(results[2].error, ValueError)
+
+
+def test_map_selected_teams(client_pool):
+    results = client_pool.map(lambda client: client._key_identifier, teams=['team-3', 'unknown-team'])
+
+    assert results[0].result == 'KEY3'
+    assert isinstance(results[1].error, KeyError)
+
+
+def test_close(client_pool):
+    client = client_pool.get_client('team-0')
+    with mock.patch.object(client.session, 'close') as mock_close:
+        client_pool.close()
+    mock_close.assert_called_once_with()
+    assert client_pool.get_client('team-0') is not client
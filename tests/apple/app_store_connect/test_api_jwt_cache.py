@@ -0,0 +1,74 @@
+import os
+import stat
+import time
+from unittest import mock
+
+import pytest
+
+from codemagic.apple.app_store_connect import AppStoreConnectApiClient
+from codemagic.apple.app_store_connect import IssuerId
+from codemagic.apple.app_store_connect import JwtCache
+from codemagic.apple.app_store_connect import KeyIdentifier
+
+
+@pytest.fixture
+def jwt_cache(tmp_path):
+    return JwtCache(tmp_path / 'cache' / 'jwt.json')
+
+
+def test_store_and_get(jwt_cache):
+    expires_at = time.time() + 600
+    jwt_cache.store('KEY', 'issuer', 'token', expires_at)
+    assert jwt_cache.get('KEY', 'issuer') == ('token', expires_at)
+    assert jwt_cache.get('OTHER_KEY', 'issuer') is None
+    assert jwt_cache.get('KEY', 'other-issuer') is None
+
+
+def test_cache_file_permissions(jwt_cache):
+    jwt_cache.store('KEY', 'issuer', 'token', time.time() + 600)
+    assert stat.S_IMODE(jwt_cache.path.stat().st_mode) == 0o600
+    assert stat.S_IMODE(jwt_cache.path.parent.stat().st_mode) & 0o077 == 0
+
+
+@pytest.mark.parametrize('expires_in', [-10, 0, JwtCache.EXPIRATION_MARGIN - 1])
+def test_expired_token_not_used(jwt_cache, expires_in):
+    jwt_cache.store('KEY', 'issuer', 'token', time.time() + expires_in)
+    assert jwt_cache.get('KEY', 'issuer') is None
+
+
+def test_expired_tokens_removed_on_store(jwt_cache):
+    jwt_cache.store('EXPIRED', 'issuer', 'old-token', time.time() - 10)
+    jwt_cache.store('KEY', 'issuer', 'token', time.time() + 600)
+    assert 'old-token' not in jwt_cache.path.read_text()
+
+
+def test_insecure_cache_file_ignored(jwt_cache):
+    jwt_cache.store('KEY', 'issuer', 'token', time.time() + 600)
+    os.chmod(str(jwt_cache.path), 0o644)
+    assert jwt_cache.get('KEY', 'issuer') is None
+
+
+def test_corrupted_cache_file_ignored(jwt_cache):
+    jwt_cache.path.parent.mkdir(parents=True)
+    jwt_cache.path.write_text('not json')
+    os.chmod(str(jwt_cache.path), 0o600)
+    assert jwt_cache.get('KEY', 'issuer') is None
+    jwt_cache.store('KEY', 'issuer', 'token', time.time() + 600)
+    assert jwt_cache.get('KEY', 'issuer')[0] == 'token'
+
+
+def test_client_reuses_cached_jwt(jwt_cache):
+    jwt_cache.store('KEY', 'issuer', 'cached-token', time.time() + 600)
+    client = AppStoreConnectApiClient(KeyIdentifier('KEY'), IssuerId('issuer'), 'private-key', jwt_cache=jwt_cache)
+    with mock.patch('codemagic.apple.app_store_connect.api_client.jwt.encode') as mock_encode:
+        assert client.jwt == 'cached-token'
+    mock_encode.assert_not_called()
+
+
+def test_client_stores_generated_jwt(jwt_cache):
+    client = AppStoreConnectApiClient(KeyIdentifier('KEY'), IssuerId('issuer'), 'private-key', jwt_cache=jwt_cache)
+    with mock.patch('codemagic.apple.app_store_connect.api_client.jwt.encode', return_value=b'new-token'):
+        assert client.jwt == 'new-token'
+    token, expires_at = jwt_cache.get('KEY', 'issuer')
+    assert token == 'new-token'
+    assert expires_at == pytest.approx(client._jwt_expires.timestamp())
@@ -0,0 +1,115 @@
+import json
+import logging
+from unittest import mock
+
+import pytest
+import requests
+
+from codemagic.apple.app_store_connect import ApiRequestLogger
+from codemagic.apple.app_store_connect import AppStoreConnectApiError
+from codemagic.apple.app_store_connect import AppStoreConnectApiSession
+from codemagic.apple.app_store_connect import RetryPolicy
+from codemagic.utilities import log
+
+
+class _RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture
+def handler():
+    return _RecordingHandler()
+
+
+@pytest.fixture
+def request_logger(handler):
+    logger = logging.getLogger('test_api_request_logger')
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    return ApiRequestLogger(logger, body_limit=100)
+
+
+def _response(content: bytes, status_code=200):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    return response
+
+
+def test_body_is_formatted_only_when_emitted(request_logger, handler):
+    handler.setLevel(logging.WARNING)
+
+    with mock.patch.object(request_logger, '_format_response') as mock_format:
+        request_logger.log_response(_response(b'{}'))
+
+    mock_format.assert_not_called()
+    assert handler.messages == []
+
+
+def test_body_is_formatted_once_for_all_handlers(request_logger, handler):
+    other_handler = _RecordingHandler()
+    request_logger._logger.addHandler(other_handler)
+
+    with mock.patch.object(request_logger, '_format_response', return_value='<<< 200 {}') as mock_format:
+        request_logger.log_response(_response(b'{}'))
+
+    mock_format.assert_called_once()
+    assert handler.messages == other_handler.messages == ['<<< 200 {}']
+
+
+@pytest.mark.parametrize('log_requests', [False, True])
+def test_session_logs_to_file_by_default(log_requests):
+    session = AppStoreConnectApiSession(dict, log_requests=log_requests)
+    request_logger = session.request_logger
+    handlers = request_logger._logger.handlers
+
+    assert log.LogHandlers.get_file_handler() in handlers
+    assert (log.LogHandlers.get_stream_handler() in handlers) is log_requests
+    with mock.patch.object(request_logger._logger, 'propagate', False):
+        assert request_logger.is_enabled() is True
+
+
+def test_response_is_redacted_and_truncated(request_logger, handler):
+    attributes = {'name': 'profile', 'profileContent': 'A' * 50, 'certificateContent': 'B' * 500}
+    content = json.dumps({'data': {'attributes': attributes}}).encode()
+
+    request_logger.log_response(_response(content))
+
+    message, = handler.messages
+    assert message.startswith('<<< 200 {"data": {"attributes": {"name": "profile"')
+    assert message.endswith(f'... ({len(content) - 100} more bytes)')
+    assert 'A' * 10 not in message
+    assert 'B' * 10 not in message
+
+
+@pytest.mark.parametrize('password_key', ['password', 'newPassword', 'CONTAINER_PASSWORD'])
+def test_request_body_is_redacted(request_logger, handler, password_key):
+    body = {'data': {'attributes': {'name': 'certificate', password_key: 'hunter2'}}}
+
+    request_logger.log_request('POST', 'https://example.com', body)
+
+    message, = handler.messages
+    assert message.startswith('>>> POST https://example.com {"data"')
+    assert 'hunter2' not in message
+    assert '"name": "certificate"' in message
+
+
+def test_failed_responses_are_logged_when_not_sampled():
+    session = AppStoreConnectApiSession(dict, log_sample_rate=0, retry_policy=RetryPolicy(max_retries=0))
+    responses = [_response(b'{"data": []}'), _response(b'{"errors": []}', status_code=404)]
+
+    with mock.patch.object(session.request_logger, 'log_request') as mock_log_request, \
+            mock.patch.object(session.request_logger, 'log_response') as mock_log_response, \
+            mock.patch.object(requests.Session, 'request', side_effect=responses):
+        session.get('https://example.com')
+        with pytest.raises(AppStoreConnectApiError):
+            session.get('https://example.com')
+
+    mock_log_request.assert_not_called()
+    mock_log_response.assert_called_once_with(responses[1])
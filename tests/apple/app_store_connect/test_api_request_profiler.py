@@ -0,0 +1,108 @@
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+
+from unittest import mock
+
+import pytest
+import requests
+
+from codemagic.apple.app_store_connect import ProfilingHTTPAdapter
+from codemagic.apple.app_store_connect import RequestProfiler
+from codemagic.apple.app_store_connect import RequestTiming
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = b'{"data": []}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = HTTPServer(('127.0.0.1', 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+def test_profile_connection_reuse(server_url):
+    profiler = RequestProfiler()
+    session = requests.Session()
+    session.mount('http://', ProfilingHTTPAdapter(pool_maxsize=1, keep_alive_idle=30))
+
+    for _ in range(3):
+        with profiler.profile('GET', server_url) as timing:
+            timing.status_code = session.get(server_url).status_code
+
+    assert [timing.reused_connection for timing in profiler.timings] == [False, True, True]
+    assert all(timing.status_code == 200 for timing in profiler.timings)
+    new_connection_timing = profiler.timings[0]
+    assert new_connection_timing.dns is not None
+    assert new_connection_timing.connect is not None
+    assert new_connection_timing.tls is None
+    assert new_connection_timing.total >= new_connection_timing.dns + new_connection_timing.connect
+
+
+def test_profile_resolves_host_once(server_url):
+    profiler = RequestProfiler()
+    url = server_url.replace('127.0.0.1', 'localhost')
+
+    with requests.Session() as session, \
+            mock.patch('socket.getaddrinfo', wraps=socket.getaddrinfo) as mock_getaddrinfo:
+        session.mount('http://', ProfilingHTTPAdapter())
+        with profiler.profile('GET', url) as timing:
+            timing.status_code = session.get(url).status_code
+
+    assert timing.status_code == 200
+    assert timing.dns is not None and timing.connect is not None
+    mock_getaddrinfo.assert_called_once()
+
+
+def test_profile_connection_failure():
+    profiler = RequestProfiler()
+    session = requests.Session()
+    session.mount('http://', ProfilingHTTPAdapter(max_retries=0))
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        url = f'http://127.0.0.1:{sock.getsockname()[1]}'
+
+    with pytest.raises(requests.ConnectionError) as error_info:
+        with profiler.profile('GET', url):
+            session.get(url)
+
+    assert 'Failed to establish a new connection' in str(error_info.value)
+
+
+def test_request_profile_report():
+    profiler = RequestProfiler()
+    profiler.timings = [
+        RequestTiming('GET', 'https://example.com', 200, total=0.3, dns=0.01, connect=0.02, tls=0.05),
+        RequestTiming('GET', 'https://example.com', 200, total=0.08),
+        RequestTiming('GET', 'https://example.com', 200, total=0.09),
+        RequestTiming('GET', 'https://example.com', 200, total=6.0),
+    ]
+    report = profiler.get_report()
+    assert report[0] == 'HTTP requests: 4, reused connections: 3, new connections: 1'
+    assert report[1] == 'Latency: p50 300ms, p90 6000ms, p99 6000ms, max 6000ms'
+    assert report[2] == 'Average connection setup: dns 10ms, connect 20ms, tls 50ms'
+    histogram = report[4:]
+    assert len(histogram) == len(RequestProfiler.HISTOGRAM_BUCKETS) + 1
+    assert histogram[1].endswith(' 2')
+    assert histogram[-1].startswith('>= 5000ms')
+
+
+def test_empty_request_profile_report():
+    assert RequestProfiler().get_report() == ['No HTTP requests were made']
@@ -0,0 +1,72 @@
+import json
+import time
+from unittest import mock
+
+import pytest
+import requests
+
+from codemagic.apple.app_store_connect import ApiResponseCache
+from codemagic.apple.app_store_connect import AppStoreConnectApiSession
+
+URL = 'https://api.appstoreconnect.apple.com/v1/profiles'
+
+
+def _response(data, status_code=200, method='GET', url=URL):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(data).encode()
+    response.url = url
+    response.request = requests.Request(method, url).prepare()
+    return response
+
+
+@pytest.fixture
+def response_cache(temp_dir) -> ApiResponseCache:
+    return ApiResponseCache(temp_dir, ttl=60, namespace='issuer/key')
+
+
+def test_cache_store_and_get(response_cache):
+    response_cache.store(URL, {'limit': 100, 'sort': 'name'}, _response({'data': [1, 2]}))
+
+    cached_response = response_cache.get(f'{URL}?sort=name', {'limit': 100})
+    assert cached_response is not None
+    assert cached_response.ok
+    assert cached_response.json() == {'data': [1, 2]}
+    assert response_cache.get(URL, {'limit': 200, 'sort': 'name'}) is None
+
+
+def test_cache_expired_entry(response_cache):
+    response_cache.store(URL, None, _response({'data': []}))
+    with mock.patch('codemagic.apple.app_store_connect.api_response_cache.time') as mock_time:
+        mock_time.time.return_value = time.time() + 61
+        assert response_cache.get(URL) is None
+    assert not list(response_cache.directory.glob('*.json'))
+
+
+def test_cache_evicts_least_recently_used(response_cache):
+    response_cache.store(f'{URL}/0', None, _response({'data': 'x' * 100}))
+    entry_size = next(response_cache.directory.glob('*.json')).stat().st_size
+    response_cache.max_size = 2 * entry_size + entry_size // 2
+    for index in range(1, 3):
+        response_cache.store(f'{URL}/{index}', None, _response({'data': 'x' * 100}))
+        time.sleep(0.01)
+        response_cache.get(f'{URL}/0')
+
+    assert response_cache.get(f'{URL}/0') is not None
+    assert response_cache.get(f'{URL}/1') is None
+    assert response_cache.get(f'{URL}/2') is not None
+
+
+@pytest.mark.parametrize('method', ['POST', 'PATCH', 'DELETE'])
+def test_session_invalidates_cache_after_modifications(method, response_cache):
+    session = AppStoreConnectApiSession(dict, response_cache=response_cache)
+    with mock.patch.object(requests.Session, 'request', return_value=_response({'data': [1]})) as mock_request:
+        assert session.get(URL).json() == {'data': [1]}
+        assert session.get(URL).json() == {'data': [1]}
+        assert mock_request.call_count == 1
+
+        mock_request.return_value = _response({'data': {}}, status_code=201, method=method)
+        session.request(method, URL)
+        mock_request.return_value = _response({'data': [1, 2]})
+        assert session.get(URL).json() == {'data': [1, 2]}
+        assert mock_request.call_count == 3
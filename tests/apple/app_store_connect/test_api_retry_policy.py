@@ -0,0 +1,118 @@
+import json
+from unittest import mock
+
+import pytest
+import requests
+
+from codemagic.apple.app_store_connect import AppStoreConnectApiError
+from codemagic.apple.app_store_connect import AppStoreConnectApiSession
+from codemagic.apple.app_store_connect import RateLimit
+from codemagic.apple.app_store_connect import RetryPolicy
+from codemagic.apple.app_store_connect import SharedTokenBucket
+from codemagic.apple.app_store_connect import TokenBucket
+
+URL = 'https://api.appstoreconnect.apple.com/v1/devices'
+
+
+def _response(status_code, headers=None, method='GET'):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    if response.ok:
+        response._content = json.dumps({'data': []}).encode()
+    else:
+        response._content = json.dumps({'errors': [{'status': str(status_code), 'code': 'ERROR', 'title': '', 'detail': ''}]}).encode()
+    response.request = requests.Request(method, URL).prepare()
+    return response
+
+
+@pytest.fixture
+def mock_sleep():
+    with mock.patch('codemagic.apple.app_store_connect.api_session.time.sleep') as mock_sleep:
+        yield mock_sleep
+
+
+@pytest.mark.parametrize('header_value, expected_limit, expected_remaining', [
+    ('user-hour-lim:3600;user-hour-rem:3599;', 3600, 3599),
+    ('user-hour-rem:12;user-hour-lim:3500', 3500, 12),
+])
+def test_rate_limit_from_headers(header_value, expected_limit, expected_remaining):
+    rate_limit = RateLimit.from_headers({'X-Rate-Limit': header_value})
+    assert rate_limit.limit == expected_limit
+    assert rate_limit.remaining == expected_remaining
+
+
+@pytest.mark.parametrize('header_value', [None, '', 'user-hour-lim:3600', 'user-hour-lim:x;user-hour-rem:y'])
+def test_rate_limit_from_invalid_headers(header_value):
+    assert RateLimit.from_headers({'X-Rate-Limit': header_value}) is None
+
+
+def test_retry_after_header(mock_sleep):
+    session = AppStoreConnectApiSession(dict)
+    responses = [_response(429, {'Retry-After': '7'}), _response(200)]
+    with mock.patch.object(requests.Session, 'request', side_effect=responses):
+        assert session.get(URL).ok
+    mock_sleep.assert_called_once_with(7.0)
+    assert session.retry_statistics.retries == 1
+    assert session.retry_statistics.throttled_seconds == 7.0
+
+
+@pytest.mark.parametrize('method, status_code, should_retry', [
+    ('GET', 500, True),
+    ('GET', 503, True),
+    ('POST', 429, True),
+    ('POST', 503, True),
+    ('POST', 500, False),
+    ('PATCH', 502, False),
+    ('DELETE', 504, True),
+    ('GET', 404, False),
+])
+def test_retry_statuses(method, status_code, should_retry, mock_sleep):
+    session = AppStoreConnectApiSession(dict, retry_policy=RetryPolicy(max_retries=2))
+    with mock.patch.object(requests.Session, 'request', return_value=_response(status_code, method=method)) as request:
+        with pytest.raises(AppStoreConnectApiError):
+            session.request(method, URL)
+    assert request.call_count == (3 if should_retry else 1)
+    assert session.retry_statistics.retries == (2 if should_retry else 0)
+
+
+def test_jittered_backoff_is_bounded():
+    retry_policy = RetryPolicy(backoff_base=1, backoff_max=10)
+    for attempt in range(8):
+        assert 0 <= retry_policy.get_delay(attempt, _response(500)) <= min(10, 2 ** attempt)
+
+
+def test_token_bucket_shares_budget():
+    assert TokenBucket.for_key('key-id') is TokenBucket.for_key('key-id')
+    assert TokenBucket.for_key('key-id') is not TokenBucket.for_key('other-key-id')
+
+    token_bucket = TokenBucket(capacity=5, refill_rate=1)
+    token_bucket.update(RateLimit(limit=3600, remaining=1))
+    now = token_bucket._updated_at
+    assert token_bucket._get_wait_time(now) == 0
+    assert token_bucket._get_wait_time(now) == pytest.approx(1)
+    assert token_bucket._get_wait_time(now + 1) == 0
+
+    token_bucket.pause(10)
+    assert token_bucket._get_wait_time(now + 2) > 5
+
+
+def test_shared_token_bucket(temp_dir):
+    assert SharedTokenBucket.for_host('key-id', temp_dir) is SharedTokenBucket.for_host('key-id', temp_dir)
+    # Separate instances that use the same state file behave like buckets of different processes
+    path = temp_dir / 'key-id.json'
+    first_bucket = SharedTokenBucket(path, capacity=2, refill_rate=0.001)
+    second_bucket = SharedTokenBucket(path, capacity=2, refill_rate=0.001)
+
+    assert first_bucket.acquire() == 0
+    assert second_bucket.acquire() == 0
+    with mock.patch('codemagic.apple.app_store_connect.api_rate_limiter.time.sleep') as mock_sleep:
+        mock_sleep.side_effect = StopIteration
+        with pytest.raises(StopIteration):
+            first_bucket.acquire()
+    assert mock_sleep.call_args[0][0] > 900
+
+    second_bucket.update(RateLimit(limit=7200, remaining=100))
+    state = json.loads(path.read_text())
+    assert state['capacity'] == 7200
+    assert state['refill_rate'] == 2
@@ -0,0 +1,65 @@
+import asyncio
+import json
+import pathlib
+from unittest import mock
+
+import pytest
+
+from codemagic.apple.app_store_connect import AsyncAppStoreConnectApiClient
+from codemagic.apple.resources import Device
+from codemagic.apple.resources import ResourceId
+
+
+@pytest.fixture
+def api_device():
+    mock_path = pathlib.Path(__file__).parent.parent / 'resources' / 'mocks' / 'device.json'
+    return json.loads(mock_path.read_text())
+
+
+@pytest.fixture
+def async_api_client(api_client):
+    async_api_client = AsyncAppStoreConnectApiClient(api_client)
+    yield async_api_client
+    async_api_client.close()
+
+
+def _mock_response(payload):
+    return mock.Mock(json=mock.Mock(return_value=payload))
+
+
+def test_read_concurrently(async_api_client, api_device):
+    def mock_get(url, **_kwargs):
+        device_id = url.rsplit('/', 1)[-1]
+        return _mock_response({'data': {**api_device, 'id': device_id}})
+
+    async def read_devices():
+        return await asyncio.gather(*(
+            async_api_client.devices.read(ResourceId(f'device-{i}')) for i in range(5)))
+
+    with mock.patch.object(async_api_client.client.session, 'get', side_effect=mock_get):
+        devices = asyncio.run(read_devices())
+
+    assert [device.id for device in devices] == [f'device-{i}' for i in range(5)]
+    assert all(isinstance(device, Device) for device in devices)
+
+
+def test_iter_list_async_generator(async_api_client, api_device):
+    pages = [
+        {'data': [{**api_device, 'id': 'device-1'}], 'links': {'next': 'https://example.com/v1/devices?page=2'}},
+        {'data': [{**api_device, 'id': 'device-2'}], 'links': {}},
+    ]
+
+    async def list_devices():
+        return [device async for device in async_api_client.devices.iter_list()]
+
+    responses = [_mock_response(page) for page in pages]
+    with mock.patch.object(async_api_client.client.session, 'get', side_effect=responses):
+        devices = asyncio.run(list_devices())
+
+    assert [device.id for device in devices] == ['device-1', 'device-2']
+
+
+def test_resource_manager_attributes(async_api_client):
+    devices_manager = async_api_client.devices
+    assert devices_manager.resource_type is Device
+    assert devices_manager.Filter is devices_manager.resource_manager.Filter
@@ -1,10 +1,18 @@
 import enum
 from dataclasses import dataclass
+from types import SimpleNamespace
 from typing import Optional
+from unittest import mock
 
 import pytest
 
+from codemagic.apple.app_store_connect.provisioning import BundleIds
+from codemagic.apple.app_store_connect.provisioning import Devices
+from codemagic.apple.app_store_connect.provisioning import Profiles
 from codemagic.apple.app_store_connect.resource_manager import ResourceManager
+from codemagic.apple.resources import ProfileState
+from codemagic.apple.resources import ResourceId
+from codemagic.apple.resources import ResourceType
 
 StubEnum = enum.Enum('StubEnum', {'A': 'a', 'B': 'b'})
 
@@ -46,3 +54,111 @@ def test_resource_manager_filter_to_params_conversion(filter_params, expected_qu
 def test_resource_manager_filter_camel_case_converter(snake_case_input, expected_camel_case_output):
     converted_input = ResourceManager.Filter._snake_to_camel(snake_case_input)
     assert converted_input == expected_camel_case_output
+
+
+@pytest.mark.parametrize('fields, expected_query_params', [
+    (None, {}),
+    (('name',), {'fields[profiles]': 'name'}),
+    (['name', 'profileState', 'bundleId'], {'fields[profiles]': 'name,profileState,bundleId'}),
+])
+def test_resource_manager_fields_to_params_conversion(fields, expected_query_params):
+    assert ResourceManager._get_fields_params(ResourceType.PROFILES, fields) == expected_query_params
+
+
+def test_resource_manager_id_batches():
+    resource_ids = [ResourceId(f'{i:010}') for i in range(250)]
+    batches = ResourceManager._get_id_batches(resource_ids)
+    assert [len(batch) for batch in batches] == [100, 100, 50]
+    assert [resource_id for batch in batches for resource_id in batch] == resource_ids
+
+
+def test_resource_manager_id_batches_url_length():
+    resource_ids = [ResourceId('x' * 500) for _ in range(4)]
+    batches = ResourceManager._get_id_batches(resource_ids)
+    assert [len(batch) for batch in batches] == [3, 1]
+
+
+def test_resource_manager_read_many_preserves_order(monkeypatch):
+    monkeypatch.setattr(Devices, 'READ_MANY_BATCH_SIZE', 2)
+    requested_batches = []
+
+    def list_resources(resource_ids: str):
+        requested_batches.append(resource_ids)
+        # Resources are returned in arbitrary order and unknown identifiers are omitted
+        return [SimpleNamespace(id=resource_id) for resource_id in reversed(resource_ids.split(','))
+                if resource_id != 'missing']
+
+    resource_ids = [ResourceId(resource_id) for resource_id in ('b', 'missing', 'a', 'c', 'a')]
+    resources = Devices(mock.Mock())._read_many(resource_ids, list_resources)
+
+    assert [resource.id for resource in resources] == ['b', 'a', 'c']
+    assert requested_batches == ['b,missing', 'a,c']
+
+
+@pytest.mark.parametrize(
+    'filter_params, supported_fields, inexact_fields, expected_query_params, expected_local_filter', [
+    ({}, ('field_one',), (), {}, None),
+    ({'field_one': '1'}, ('field_one',), (), {'filter[fieldOne]': '1'}, None),
+    ({'field_one': '1', 'field_two': StubEnum.A}, ('field_two',), (), {
+        'filter[fieldTwo]': 'a'}, StubFilter(field_one='1')),
+    ({'field_one': '1'}, (), (), {}, StubFilter(field_one='1')),
+    ({'field_one': '1', 'field_two': StubEnum.A}, ('field_one', 'field_two'), ('field_two',), {
+        'filter[fieldOne]': '1', 'filter[fieldTwo]': 'a'}, StubFilter(field_two=StubEnum.A)),
+])
+def test_resource_manager_plan_filter(
+        filter_params, supported_fields, inexact_fields, expected_query_params, expected_local_filter):
+    resource_filter = StubFilter(**filter_params)
+    query_params, local_filter = ResourceManager._plan_filter(resource_filter, supported_fields, inexact_fields)
+    assert query_params == expected_query_params
+    assert local_filter == expected_local_filter
+
+
+def _mock_api_profile(profile_id, name):
+    return {'type': 'profiles', 'id': profile_id, 'attributes': {'name': name, 'profileState': 'ACTIVE'}}
+
+
+def test_bundle_id_profiles_filter_pushdown():
+    api_client = mock.Mock(API_URL='https://api.appstoreconnect.apple.com/v1')
+    api_client.profiles = Profiles(api_client)
+    # Bundle ID has more profiles than fit on the first page
+    api_client.session.get.return_value.json.return_value = {
+        'data': [_mock_api_profile('profile-1', 'name'), _mock_api_profile('profile-2', 'other')],
+        'links': {'next': 'https://api.appstoreconnect.apple.com/v1/bundleIds/bundle-id/profiles?cursor=AQ'},
+    }
+    api_client.paginate.side_effect = [
+        [{'type': 'profiles', 'id': f'profile-{i}'} for i in range(1, 5)],
+        [_mock_api_profile('profile-3', 'name'), _mock_api_profile('profile-4', 'name copy')],
+    ]
+    profiles_filter = Profiles.Filter(name='name', profile_state=ProfileState.ACTIVE)
+
+    profiles = BundleIds(api_client).list_profiles(ResourceId('bundle-id'), resource_filter=profiles_filter)
+
+    # Name filter of the API is not exact, names are matched locally as well
+    assert [profile.id for profile in profiles] == ['profile-1', 'profile-3']
+    api_client.session.get.assert_called_once()
+    list_ids_call, list_profiles_call = api_client.paginate.call_args_list
+    assert list_ids_call[0][0] == 'https://api.appstoreconnect.apple.com/v1/bundleIds/bundle-id/relationships/profiles'
+    assert list_profiles_call[0][0] == 'https://api.appstoreconnect.apple.com/v1/profiles'
+    # Profiles from the first page are not downloaded again
+    assert list_profiles_call[1]['params'] == {
+        'filter[id]': 'profile-3,profile-4',
+        'filter[name]': 'name',
+        'filter[profileState]': 'ACTIVE',
+    }
+    assert list_profiles_call[1]['page_size'] == 2
+
+
+def test_bundle_id_profiles_filter_single_page():
+    api_client = mock.Mock(API_URL='https://api.appstoreconnect.apple.com/v1')
+    api_client.profiles = Profiles(api_client)
+    api_client.session.get.return_value.json.return_value = {
+        'data': [_mock_api_profile('profile-1', 'name'), _mock_api_profile('profile-2', 'name copy')],
+        'links': {},
+    }
+    profiles_filter = Profiles.Filter(name='name', profile_state=ProfileState.ACTIVE)
+
+    profiles = BundleIds(api_client).list_profiles(ResourceId('bundle-id'), resource_filter=profiles_filter)
+
+    assert [profile.id for profile in profiles] == ['profile-1']
+    api_client.session.get.assert_called_once()
+    api_client.paginate.assert_not_called()
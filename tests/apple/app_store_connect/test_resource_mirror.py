@@ -0,0 +1,179 @@
+import json
+import pathlib
+import time
+from typing import Dict
+from typing import List
+
+import pytest
+
+from codemagic.apple.app_store_connect import AppStoreConnectApiClient
+from codemagic.apple.app_store_connect import ResourceMirror
+from codemagic.apple.app_store_connect.provisioning import Profiles
+from codemagic.apple.resources import BundleId
+from codemagic.apple.resources import Device
+from codemagic.apple.resources import Profile
+from codemagic.apple.resources import ProfileState
+from codemagic.apple.resources import ResourceId
+
+_MOCKS_DIR = pathlib.Path(__file__).parent.parent / 'resources' / 'mocks'
+
+
+def _load_api_resource(mock_name) -> Dict:
+    return json.loads((_MOCKS_DIR / f'{mock_name}.json').read_text())
+
+
+class FakeApiClient:
+    API_URL = AppStoreConnectApiClient.API_URL
+    max_concurrent_requests = 4
+
+    def __init__(self, resources: Dict[str, List[Dict]]):
+        self.resources = resources
+        self.requests = []
+
+    def paginate(self, url, params=None, page_size=100):
+        params = params or {}
+        self.requests.append((url, params))
+        resource_type = url[len(self.API_URL) + 1:]
+        resources = self.resources[resource_type]
+        if 'filter[id]' in params:
+            resource_ids = params['filter[id]'].split(',')
+            resources = [resource for resource in resources if resource['id'] in resource_ids]
+        fields = params.get(f'fields[{resource_type}]')
+        if fields is not None:
+            resources = [
+                {
+                    'id': resource['id'],
+                    'type': resource['type'],
+                    'links': resource['links'],
+                    'attributes': {k: v for k, v in resource['attributes'].items() if k in fields.split(',')},
+                }
+                for resource in resources
+            ]
+        return resources
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    return ResourceMirror(tmp_path / 'mirror.db')
+
+
+@pytest.fixture
+def api_profiles() -> List[Dict]:
+    api_profile = _load_api_resource('profile')
+    profiles = []
+    for i in range(3):
+        profile = json.loads(json.dumps(api_profile))
+        profile['id'] = f'profile-{i}'
+        profile['attributes']['name'] = f'Profile {i}'
+        profile['attributes']['uuid'] = f'uuid-{i}'
+        profile['relationships']['bundleId']['data']['id'] = f'bundle-id-{i % 2}'
+        profiles.append(profile)
+    return profiles
+
+
+def test_sync_and_list(mirror, api_profiles):
+    api_client = FakeApiClient({'profiles': api_profiles})
+
+    result = mirror.sync(api_client, Profile)
+
+    assert (result.added, result.updated, result.removed, result.unchanged) == (3, 0, 0, 0)
+    assert mirror.is_fresh(Profile)
+    assert not mirror.is_fresh(Device)
+    profiles = mirror.list(Profile)
+    assert [profile.id for profile in profiles] == ['profile-0', 'profile-1', 'profile-2']
+    assert profiles[0].profile_content
+
+
+def test_list_with_filter(mirror, api_profiles):
+    api_profiles[1]['attributes']['profileState'] = ProfileState.INVALID.value
+    mirror.sync(FakeApiClient({'profiles': api_profiles}), Profile)
+
+    active_profiles = mirror.list(Profile, Profiles.Filter(profile_state=ProfileState.ACTIVE))
+    named_profiles = mirror.list(Profile, Profiles.Filter(name='Profile 2'))
+
+    assert [profile.id for profile in active_profiles] == ['profile-0', 'profile-2']
+    assert [profile.id for profile in named_profiles] == ['profile-2']
+
+
+def test_list_matches_names_like_api(mirror, api_profiles):
+    api_profiles[1]['attributes']['name'] = 'Profile 0 copy'
+    mirror.sync(FakeApiClient({'profiles': api_profiles}), Profile)
+
+    # Name filter of the list endpoint is not exact, related profiles are matched exactly
+    named_profiles = mirror.list(Profile, Profiles.Filter(name='Profile 0'))
+    related_profiles = mirror.list_related(
+        Profile, 'bundleId', ResourceId('bundle-id-1'), Profiles.Filter(name='Profile 0'))
+
+    assert [profile.id for profile in named_profiles] == ['profile-0', 'profile-1']
+    assert related_profiles == []
+
+
+def test_list_related(mirror, api_profiles):
+    mirror.sync(FakeApiClient({'profiles': api_profiles}), Profile)
+
+    bundle_id_profiles = mirror.list_related(Profile, 'bundleId', ResourceId('bundle-id-0'))
+    certificate_ids = mirror.get_related_ids(Profile, ResourceId('profile-0'), 'certificates')
+    device_ids = mirror.get_related_ids(Profile, ResourceId('profile-0'), 'devices')
+
+    assert [profile.id for profile in bundle_id_profiles] == ['profile-0', 'profile-2']
+    assert certificate_ids == ['29NU422CRF']
+    assert device_ids == ['8UCFZA68RK', 'D9PW3SW6K2']
+
+
+def test_sync_downloads_only_changed_resources(mirror, api_profiles):
+    api_client = FakeApiClient({'profiles': api_profiles})
+    mirror.sync(api_client, Profile)
+    api_profiles[0]['attributes']['uuid'] = 'regenerated-uuid'
+    api_profiles.pop(2)
+    api_client.requests.clear()
+
+    result = mirror.sync(api_client, Profile)
+
+    assert (result.added, result.updated, result.removed, result.unchanged) == (0, 1, 1, 1)
+    listing_params, fetch_params = (params for _url, params in api_client.requests)
+    assert listing_params == {'fields[profiles]': 'name,uuid,profileState,expirationDate'}
+    assert fetch_params['filter[id]'] == 'profile-0'
+    profiles = mirror.list(Profile)
+    assert [profile.id for profile in profiles] == ['profile-0', 'profile-1']
+    assert profiles[0].attributes.uuid == 'regenerated-uuid'
+
+
+def test_sync_lists_truncated_relationships(mirror, api_profiles):
+    api_profiles[0]['relationships']['devices']['data'] = [
+        {'type': 'devices', 'id': f'device-{i}'} for i in range(ResourceMirror.RELATIONSHIP_LIMIT)
+    ]
+    devices_url = f'{FakeApiClient.API_URL}/profiles/profile-0/relationships/devices'
+    all_devices = [{'type': 'devices', 'id': f'device-{i}'} for i in range(ResourceMirror.RELATIONSHIP_LIMIT + 10)]
+
+    class ApiClient(FakeApiClient):
+        def paginate(self, url, params=None, page_size=100):
+            if url == devices_url:
+                return all_devices
+            return super().paginate(url, params, page_size)
+
+    mirror.sync(ApiClient({'profiles': api_profiles}), Profile)
+
+    device_ids = mirror.get_related_ids(Profile, ResourceId('profile-0'), 'devices')
+    assert len(device_ids) == len(all_devices)
+
+
+def test_invalidate(mirror):
+    api_bundle_id = _load_api_resource('bundle_id')
+    mirror.sync(FakeApiClient({'bundleIds': [api_bundle_id]}), BundleId)
+    assert mirror.is_fresh(BundleId)
+
+    mirror.invalidate(BundleId)
+
+    assert not mirror.is_fresh(BundleId)
+    assert [bundle_id.id for bundle_id in mirror.list(BundleId)] == [api_bundle_id['id']]
+
+
+def test_mirror_expires(tmp_path, monkeypatch):
+    api_bundle_id = _load_api_resource('bundle_id')
+    mirror = ResourceMirror(tmp_path / 'mirror.db', max_age=60)
+    mirror.sync(FakeApiClient({'bundleIds': [api_bundle_id]}), BundleId)
+    assert mirror.is_fresh(BundleId)
+
+    synced_at = mirror.get_synced_at(BundleId)
+    monkeypatch.setattr(time, 'time', lambda: synced_at + 61)
+    assert not mirror.is_fresh(BundleId)
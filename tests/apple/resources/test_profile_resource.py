@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from base64 import b64decode
+
 from codemagic.apple.resources import Profile
 
 
@@ -7,3 +9,17 @@ def test_profile_initialization(api_profile):
     profile = Profile(api_profile)
     assert profile.dict() == api_profile
     assert profile.relationships.devices.data[0].id == '8UCFZA68RK'
+
+
+def test_profile_initialization_sparse_fieldset(api_profile):
+    profile_content = api_profile['attributes'].pop('profileContent')
+    del api_profile['relationships']['devices']
+    profile = Profile(api_profile)
+    assert profile.attributes.profileContent is None
+    assert profile.relationships.devices is None
+
+    loaded_profiles = []
+    profile.set_content_loader(lambda p: loaded_profiles.append(p) or profile_content)
+    assert profile.profile_content == b64decode(profile_content)
+    assert profile.profile_content == b64decode(profile_content)
+    assert loaded_profiles == [profile]
@@ -5,6 +5,7 @@ from datetime import timezone
 
 import pytest
 
+from codemagic.apple.resources import Device
 from codemagic.apple.resources import Profile
 from codemagic.apple.resources import Resource
 from codemagic.apple.resources.resource import PrettyNameMeta
@@ -84,3 +85,27 @@ def test_pretty_name_plural(class_name, plural_name):
     K.__name__ = class_name
     assert K.plural() == plural_name
     assert K.s == plural_name
+
+
+def test_resource_attributes_are_decoded_lazily(api_profile):
+    profile = Profile(api_profile)
+    assert profile._attributes is None
+    assert profile._relationships is None
+
+    assert profile.attributes.name == 'test profile'
+    assert profile.attributes is profile.attributes
+    assert profile._relationships is None
+    assert profile.relationships.bundleId.data.id == 'F88J43FA9J'
+
+
+def test_resource_uses_slots(api_profile):
+    profile = Profile(api_profile)
+    assert not hasattr(profile, '__dict__')
+    with pytest.raises(AttributeError):
+        profile.unknown_attribute = True
+
+
+def test_resource_without_relationships(api_device):
+    device = Device(api_device)
+    assert not hasattr(device, 'relationships')
+    assert 'relationships' not in device.dict()
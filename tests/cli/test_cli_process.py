@@ -1,8 +1,11 @@
 import fcntl
 import os
 import subprocess
+import sys
 from tempfile import NamedTemporaryFile
 
+import pytest
+
 from codemagic import cli
 
 
@@ -38,3 +41,80 @@ def test_non_blocking_streams_file_fd():
         assert cli_process._process.stderr is None
 
         cli_process._process.kill()
+
+
+def test_execute_captures_streams():
+    # Write a multi-byte character in two parts to have it split between reads
+    script = (
+        'import os, sys, time\n'
+        'data = "é€".encode()\n'
+        'os.write(1, data[:1]); time.sleep(0.05); os.write(1, data[1:])\n'
+        'sys.stderr.write("error"); sys.exit(3)\n'
+    )
+    cli_process = cli.CliProcess([sys.executable, '-c', script], print_streams=False).execute()
+
+    assert cli_process.stdout == 'é€'
+    assert cli_process.stderr == 'error'
+    assert cli_process.returncode == 3
+    assert cli_process._process.stdout.closed
+
+
+def test_execute_does_not_wait_for_background_processes():
+    # Background process inherits the pipes and keeps them open after the shell has exited
+    command = ['sh', '-c', 'sleep 10 & echo done; echo error >&2']
+    cli_process = cli.CliProcess(command, print_streams=False).execute()
+
+    assert cli_process.duration < 5
+    assert cli_process.stdout == 'done\n'
+    assert cli_process.stderr == 'error\n'
+    assert cli_process.returncode == 0
+    assert cli_process._process.stdout.closed
+    assert cli_process._process.stderr.closed
+
+
+@pytest.mark.parametrize('output_size', [10000, 70000, 200000])
+def test_execute_captures_output_larger_than_pipe_buffer(output_size):
+    command = ['sh', '-c', f'yes abc | head -c {output_size}']
+    for _ in range(5):
+        cli_process = cli.CliProcess(command, print_streams=False).execute()
+
+        assert cli_process.returncode == 0
+        assert len(cli_process.stdout) == output_size
+        assert cli_process.stdout.startswith('abc\nabc\n')
+        assert cli_process._process.stdout.closed
+
+
+def test_output_keeps_tail_in_memory():
+    output = cli.CliProcessOutput(max_memory_size=10)
+    for chunk in ('first\n', 'second\n', 'third\n'):
+        output.write(chunk)
+
+    assert output.tail == 'ond\nthird\n'
+    assert output.is_truncated
+    assert output.size == 19
+    assert output.getvalue() == 'first\nsecond\nthird\n'
+    output.close()
+
+
+def test_output_from_output_path(temp_dir):
+    output_path = temp_dir / 'output.log'
+    output_path.write_text('first\nsecond\n')
+    output = cli.CliProcessOutput(max_memory_size=5, output_path=output_path)
+    output.write('first\n')
+    output.write('second\n')
+
+    assert output.tail == 'cond\n'
+    assert output.getvalue() == 'first\nsecond\n'
+    assert output._spill_file is None
+
+
+def test_execute_with_max_output_size():
+    script = 'import sys\nfor i in range(1000): print(i)\nsys.exit(1)'
+    cli_process = cli.CliProcess([sys.executable, '-c', script], print_streams=False, max_output_size=4).execute()
+
+    assert cli_process.stdout == '999\n'
+    with cli_process.stdout_output.open() as stream:
+        assert stream.read().splitlines() == [str(i) for i in range(1000)]
+    with pytest.raises(subprocess.CalledProcessError) as error_info:
+        cli_process.raise_for_returncode()
+    assert error_info.value.output == '999\n'
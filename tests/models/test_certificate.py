@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import pytest
+from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.serialization import pkcs12
 
 from codemagic.models import Certificate
 from codemagic.models import PrivateKey
+from codemagic.models.certificate_p12_exporter import P12Exporter
 
 public_bytes = \
     b'-----BEGIN CERTIFICATE REQUEST-----\n' \
@@ -41,3 +45,62 @@ def test_certificate_does_not_have_key(certificate_asn1, encrypted_pem):
     pk = PrivateKey.from_pem(encrypted_pem.content, encrypted_pem.password)
     certificate = Certificate.from_ans1(certificate_asn1)
     assert certificate.is_signed_with(pk) is False
+
+
+def test_public_key_fingerprint(certificate_asn1, unencrypted_pem):
+    pk = PrivateKey.from_pem(unencrypted_pem.content)
+    certificate = Certificate.from_ans1(certificate_asn1)
+    fingerprint = Certificate.get_public_key_fingerprint_from_asn1(certificate_asn1)
+    assert fingerprint == certificate.public_key_fingerprint == pk.public_key_fingerprint
+
+
+@pytest.mark.parametrize('container_password', ['', 'container password'])
+def test_export_p12(certificate_asn1, unencrypted_pem, tmp_path, container_password):
+    pk = PrivateKey.from_pem(unencrypted_pem.content)
+    certificate = Certificate.from_ans1(certificate_asn1)
+
+    p12_path = certificate.export_p12(pk, container_password, export_path=tmp_path / 'certificate.p12')
+
+    password = container_password.encode() if container_password else None
+    key, p12_certificate, _ = pkcs12.load_key_and_certificates(p12_path.read_bytes(), password, default_backend())
+    assert p12_certificate.serial_number == certificate.serial
+    assert PrivateKey.get_public_key_fingerprint(key.public_key()) == pk.public_key_fingerprint
+
+
+def test_export_p12_with_other_key(certificate_asn1, encrypted_pem, tmp_path):
+    pk = PrivateKey.from_pem(encrypted_pem.content, encrypted_pem.password)
+    certificate = Certificate.from_ans1(certificate_asn1)
+
+    with pytest.raises(IOError) as exception_info:
+        certificate.export_p12(pk, 'password', export_path=tmp_path / 'certificate.p12')
+
+    assert 'Private key does not match' in str(exception_info.value)
+    assert not (tmp_path / 'certificate.p12').exists()
+
+
+def test_export_p12_uses_legacy_encryption(certificate_asn1, unencrypted_pem):
+    pk = PrivateKey.from_pem(unencrypted_pem.content)
+    certificate = Certificate.from_ans1(certificate_asn1)
+
+    container = P12Exporter(certificate, pk, 'container password').create_pkcs12_container()
+
+    # DER encoded object identifiers of pbeWithSHAAnd3-KeyTripleDES-CBC and PBES2
+    pbe_sha1_3des = bytes.fromhex('060a2a864886f70d010c0103')
+    pbes2 = bytes.fromhex('06092a864886f70d01050d')
+    assert pbe_sha1_3des in container
+    assert pbes2 not in container
+
+
+def test_export_p12_without_password_is_protected(certificate_asn1, unencrypted_pem):
+    pk = PrivateKey.from_pem(unencrypted_pem.content)
+    certificate = Certificate.from_ans1(certificate_asn1)
+
+    container = P12Exporter(certificate, pk, '').create_pkcs12_container()
+
+    key, p12_certificate, _ = pkcs12.load_key_and_certificates(container, b'', default_backend())
+    assert p12_certificate.serial_number == certificate.serial
+    assert PrivateKey.get_public_key_fingerprint(key.public_key()) == pk.public_key_fingerprint
+    # Container is encrypted with 3DES and MAC protected, so other passwords are rejected
+    assert bytes.fromhex('060a2a864886f70d010c0103') in container
+    with pytest.raises(ValueError):
+        pkcs12.load_key_and_certificates(container, b'other password', default_backend())